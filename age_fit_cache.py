@@ -0,0 +1,122 @@
+"""
+Caché en disco de los ajustes por k de cluster_age_groups.py.
+
+Cada ajuste se identifica por una clave sha256 de:
+- huella de los datos: sha256 de AgeImputed (float64, en orden de filas)
+- motor (dp/kmeans) y k
+- random_state y n_init (solo kmeans; el motor dp es determinista)
+
+y guarda inercia, silhouette, centros y el clúster de cada valor distinto de edad
+(todas las filas con la misma edad caen en el mismo clúster), así que las
+etiquetas por fila se reconstruyen sin reajustar. Volver a ejecutar con otro --k,
+otro --output u otro --summary reutiliza los ajustes ya calculados.
+
+Estructura en disco:
+    <cache_dir>/<motor>/<clave>.json
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+DEFAULT_CACHE_DIR = ".age_fit_cache"
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class AgeFit:
+    k: int
+    inertia: float  # en escala estandarizada (como KMeans sobre x_scaled)
+    silhouette: float
+    centers: np.ndarray  # en escala de Age, en el orden de las etiquetas del motor
+    values: np.ndarray  # valores distintos de AgeImputed, ordenados
+    value_labels: np.ndarray  # clúster de cada valor distinto
+
+    def labels(self, age_imputed: np.ndarray) -> np.ndarray:
+        """
+        Etiqueta de cada fila a partir de su valor distinto de edad.
+        """
+        return self.value_labels[np.searchsorted(self.values, age_imputed)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "inertia": self.inertia,
+            "silhouette": self.silhouette,
+            "centers": self.centers.tolist(),
+            "values": self.values.tolist(),
+            "value_labels": self.value_labels.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgeFit":
+        return cls(
+            k=int(data["k"]),
+            inertia=float(data["inertia"]),
+            silhouette=float(data["silhouette"]),
+            centers=np.asarray(data["centers"], dtype=float),
+            values=np.asarray(data["values"], dtype=float),
+            value_labels=np.asarray(data["value_labels"], dtype=np.int64),
+        )
+
+
+def fingerprint(age_imputed: np.ndarray) -> str:
+    """
+    sha256 de las edades imputadas (float64, en orden de filas).
+    """
+    return hashlib.sha256(np.ascontiguousarray(age_imputed, dtype=np.float64).tobytes()).hexdigest()
+
+
+def fit_key(
+    data_hash: str, engine: str, k: int, random_state: Optional[int] = None, n_init: Optional[int] = None
+) -> str:
+    """
+    Clave del ajuste; con engine="dp" se ignoran random_state y n_init.
+    """
+    deterministic = engine == "dp"
+    payload = {
+        "version": CACHE_VERSION,
+        "data": data_hash,
+        "engine": engine,
+        "k": int(k),
+        "random_state": None if deterministic else random_state,
+        "n_init": None if deterministic else n_init,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class AgeFitCache:
+    """
+    Almacén de ajustes por clave (un JSON pequeño por ajuste).
+    """
+
+    def __init__(self, cache_dir: Path | str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, engine: str, key: str) -> Path:
+        return self.cache_dir / engine / f"{key}.json"
+
+    def get(self, engine: str, key: str) -> Optional[AgeFit]:
+        path = self._path(engine, key)
+        if not path.exists():
+            return None
+        return AgeFit.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def put(self, engine: str, key: str, fit: AgeFit) -> None:
+        """
+        Escritura atómica (archivo temporal + rename): varios procesos pueden
+        rellenar la misma caché a la vez (p.ej. run_all.py con k automático y k=5).
+        """
+        path = self._path(engine, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(fit.to_dict()), encoding="utf-8")
+        os.replace(tmp, path)
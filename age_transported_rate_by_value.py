@@ -2,7 +2,8 @@
 Tabla y gráfica: porcentaje de Transported por cada valor de Age.
 
 Entrada:
-- train9.csv (por defecto)
+- train9.csv (por defecto) o train9.parquet (solo se leen Age y Transported)
+- o --rates target_rates.csv: tabla de target_rates.py (se usa su fila Age)
 
 Salida:
 - age_transported_rate_by_age.csv: tabla con columnas
@@ -11,6 +12,7 @@ Salida:
 
 Notas:
 - Se excluyen filas con Age nulo (no se puede asignar a un valor exacto de edad).
+- Los conteos salen de target_rates.target_rate_table (un bincount, sin groupby).
 """
 
 from __future__ import annotations
@@ -18,19 +20,27 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+import figures
+from dataset_io import read_dataset
+from plot_cache import PlotJob, render_plots
+from target_rates import feature_rates, target_rate_table
 
 
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Porcentaje de Transported por cada valor de Age.")
-    p.add_argument("--input", default="train9.csv", help="CSV de entrada (por defecto: train9.csv).")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet de entrada (por defecto: train9.csv).")
     p.add_argument(
         "--output",
         default="age_transported_rate_by_age.csv",
         help="CSV de salida con la tabla de tasas por edad.",
     )
+    p.add_argument(
+        "--rates",
+        default=None,
+        help="Opcional: tabla de target_rates.py; si se indica se usa su fila Age en vez de leer --input.",
+    )
     p.add_argument("--plots-dir", default="plots", help="Directorio para guardar la gráfica.")
     p.add_argument(
         "--min-n",
@@ -41,80 +51,50 @@ def _parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
-def _to_transport01(s: pd.Series) -> pd.Series:
-    if s.dtype == bool:
-        return s.astype(int)
-    if s.dtype == object:
-        mapped = s.map({"True": 1, "False": 0, True: 1, False: 0})
-        return mapped.astype("Int64")
-    return pd.to_numeric(s, errors="coerce").astype("Int64")
-
-
 def main() -> None:
     args = _parse_args()
-    input_path = Path(args.input)
-    if not input_path.exists():
-        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
-
-    df = pd.read_csv(input_path)
-    if "Age" not in df.columns:
-        raise ValueError("No existe la columna 'Age' en el dataset.")
-    if "Transported" not in df.columns:
-        raise ValueError("No existe la columna 'Transported' en el dataset (necesaria para el cálculo).")
-
-    # Filtrar edades no nulas y convertir a entero (edades son 0..79 en el dataset)
-    d = df.loc[~pd.isna(df["Age"]), ["Age", "Transported"]].copy()
-    d["Age"] = pd.to_numeric(d["Age"], errors="coerce")
-    d = d.loc[~pd.isna(d["Age"])].copy()
-    d["Age"] = d["Age"].astype(int)
-    d["_Transport01"] = _to_transport01(d["Transported"])
-
-    table = (
-        d.groupby("Age", as_index=False)
-        .agg(
-            Total=("Age", "size"),
-            TransportedTrue=("_Transport01", lambda s: int((s == 1).sum())),
-            TransportedFalse=("_Transport01", lambda s: int((s == 0).sum())),
-            MissingTransported=("_Transport01", lambda s: int(pd.isna(s).sum())),
-        )
-        .sort_values("Age")
-    )
-    table["TransportedRate"] = table["TransportedTrue"] / table["Total"]
+    if args.rates:
+        input_path = Path(args.rates)
+        if not input_path.exists():
+            raise FileNotFoundError(f"No existe la tabla de tasas: {input_path}")
+        table = feature_rates(pd.read_csv(input_path), "Age")
+    else:
+        input_path = Path(args.input)
+        if not input_path.exists():
+            raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+        df = read_dataset(input_path)
+        if "Age" not in df.columns:
+            raise ValueError("No existe la columna 'Age' en el dataset.")
+        if "Transported" not in df.columns:
+            raise ValueError("No existe la columna 'Transported' en el dataset (necesaria para el cálculo).")
+
+        # Filtrar edades no nulas y convertir a entero (edades son 0..79 en el dataset)
+        d = df.loc[~pd.isna(df["Age"]), ["Age", "Transported"]].copy()
+        d["Age"] = pd.to_numeric(d["Age"], errors="coerce")
+        d = d.loc[~pd.isna(d["Age"])].copy()
+        d["Age"] = d["Age"].astype(int)
+        table = feature_rates(target_rate_table(d, ["Age"]), "Age")
 
     # Guardar tabla
     table.to_csv(args.output, index=False)
 
-    # Gráfica
-    plots_dir = Path(args.plots_dir)
-    plots_dir.mkdir(parents=True, exist_ok=True)
-    fig, ax = plt.subplots(figsize=(10, 5))
-    x = table["Age"].to_numpy()
-    y = (table["TransportedRate"] * 100).to_numpy()
-
-    ax.plot(x, y, linewidth=2, color="#4ECDC4")
-    ax.scatter(x, y, s=25, color="#4ECDC4", edgecolor="black", linewidth=0.3, alpha=0.9)
-
-    # Añadir tamaño de muestra como anotación (solo donde hay suficiente n)
-    min_n = int(args.min_n)
-    for age, pct, n in zip(table["Age"], y, table["Total"]):
-        if int(n) >= min_n and age % 5 == 0:  # para no saturar, anotamos cada 5 años
-            ax.text(int(age), float(pct) + 1.2, f"n={int(n)}", ha="center", va="bottom", fontsize=8)
-
-    ax.set_title("Porcentaje de Transported por Edad (valor exacto)")
-    ax.set_xlabel("Edad (Age)")
-    ax.set_ylabel("Transported (%)")
-    ax.set_ylim(0, 100)
-    ax.grid(alpha=0.3)
-    fig.tight_layout()
-    out_plot = plots_dir / "age_transported_rate_by_age.png"
-    fig.savefig(out_plot, dpi=250, bbox_inches="tight")
-    plt.close(fig)
+    # Gráfica (se salta si la tabla y min_n no cambiaron, ver plot_cache.py)
+    out_plot = Path(args.plots_dir) / "age_transported_rate_by_age.png"
+    job = PlotJob(
+        str(out_plot),
+        figures.age_transported_rate,
+        table[["Age", "TransportedRate", "Total"]],
+        {"min_n": int(args.min_n)},
+        dpi=250,
+    )
+    (plot_result,) = render_plots([job])
 
     print("✓ Tabla y gráfica generadas")
     print(f"  - input:  {input_path}")
     print(f"  - output: {args.output}")
-    print(f"  - plot:   {out_plot}")
-    print(f"  - filas usadas (Age no nulo): {len(d)}")
+    print(f"  - plot:   {out_plot}{'' if plot_result.rendered else ' (sin cambios)'}")
+    print(f"  - filas usadas (Age no nulo): {int(table['Total'].sum())}")
 
 
 if __name__ == "__main__":
@@ -3,12 +3,22 @@ Script para analizar si las familias nucleares (mismo apellido + mismo grupo)
 tienen el mismo valor de Transported
 """
 
-import pandas as pd
+import argparse
+from pathlib import Path
+
 import numpy as np
 
-# Cargar datos
-print("Cargando train9.csv...")
-df = pd.read_csv('train9.csv')
+from dataset_io import read_dataset, resolve_stage_file
+from group_index import GroupIndex
+from key_consistency import consistency_by_size, key_consistency
+
+# Cargar datos (--input, o train9.csv / train9.parquet, el más reciente)
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--input', default=None, help="CSV/Parquet de entrada (por defecto: train9.csv/.parquet).")
+args = parser.parse_args()
+input_file = Path(args.input) if args.input else resolve_stage_file('train9')
+print(f"Cargando {input_file.name}...")
+df = read_dataset(input_file)
 
 print(f"\nDimensiones: {df.shape}")
 print(f"Total de pasajeros: {len(df)}")
@@ -25,16 +35,11 @@ families_nuclear = surname_counts[surname_counts > 1]
 print(f"\nPasajeros en familias nucleares (2+ personas): {df[df['Surname'].isin(families_nuclear.index)].shape[0]}")
 print(f"Número de familias nucleares: {len(families_nuclear)}")
 
-# Para cada familia nuclear, contar cuántos valores únicos de Transported hay
-family_analysis = df[df['Surname'].notna()].groupby('Surname').agg({
-    'Transported': lambda x: x.nunique(),  # Cuántos valores únicos
-    'Group': ['first', 'count']  # Grupo y cuántas personas
-}).reset_index()
-
-family_analysis.columns = ['Surname_Group', 'UniqueTransportedValues', 'Group', 'FamilySize']
-
-# Clasificar familias
-family_analysis['AllSame'] = family_analysis['UniqueTransportedValues'] == 1
+# Para cada familia nuclear: valores únicos de Transported, grupo y personas (una pasada)
+surname_index = GroupIndex.from_frame(df, 'Surname')  # filas de cada familia (permutación + offsets)
+family_analysis = key_consistency(df, 'Surname', first=['Group'], index=surname_index).rename(
+    columns={'Surname': 'Surname_Group', 'Size': 'FamilySize'}
+)
 
 print(f"\n{'='*80}")
 print("RESULTADOS GENERALES")
@@ -67,25 +72,17 @@ print(f"\n{'='*80}")
 print("ANÁLISIS POR TAMAÑO DE FAMILIA NUCLEAR")
 print(f"{'='*80}")
 
-for size in sorted(multi_person_families['FamilySize'].unique()):
+for size, total, same, different in consistency_by_size(multi_person_families, 'FamilySize').itertuples(index=False):
     if size > 1:
-        families_of_size = multi_person_families[multi_person_families['FamilySize'] == size]
-        total = len(families_of_size)
-        same = families_of_size['AllSame'].sum()
-        different = total - same
         print(f"\nTamaño {size}:")
         print(f"  Total familias:   {total:4d}")
         print(f"  Todos iguales:    {same:4d} ({same/total*100:5.2f}%)")
         print(f"  Valores mixtos:   {different:4d} ({different/total*100:5.2f}%)")
 
 # Obtener información detallada
-family_details = df[df['Surname'].notna()].groupby('Surname').agg({
-    'Transported': [lambda x: x.nunique(), lambda x: (x == True).sum(), 'count'],
-    'Group': 'first'
-}).reset_index()
-
-family_details.columns = ['Surname_Group', 'UniqueTransported', 'TransportedCount', 'TotalPeople', 'Group']
-family_details['AllSameTransported'] = family_details['UniqueTransported'] == 1
+family_details = family_analysis[['Surname_Group', 'UniqueTransported', 'TransportedTrue', 'Count', 'Group', 'AllSame']].rename(
+    columns={'TransportedTrue': 'TransportedCount', 'Count': 'TotalPeople', 'AllSame': 'AllSameTransported'}
+)
 family_details['NotTransportedCount'] = family_details['TotalPeople'] - family_details['TransportedCount']
 
 # Identificar familias con valores mixtos
@@ -102,7 +99,7 @@ if len(mixed_families) > 0:
 
     for i, (idx, row) in enumerate(mixed_families.head(5).iterrows()):
         surname_group = row['Surname_Group']
-        family_data = df[df['Surname'] == surname_group][['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'CryoSleep', 'Transported']].sort_values('NumInGroup')
+        family_data = surname_index.rows(df, surname_group)[['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'CryoSleep', 'Transported']].sort_values('NumInGroup', kind='stable')
         print(f"\nFamilia: {surname_group} ({row['TotalPeople']} personas)")
         print(family_data.to_string(index=False))
         print(f"  → {row['TransportedCount']} transportados, {row['NotTransportedCount']} NO transportados")
@@ -123,7 +120,7 @@ if len(same_families) > 0:
 
     for i, (idx, row) in enumerate(same_families.head(5).iterrows()):
         surname_group = row['Surname_Group']
-        family_data = df[df['Surname'] == surname_group][['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'Transported']].sort_values('NumInGroup')
+        family_data = surname_index.rows(df, surname_group)[['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'Transported']].sort_values('NumInGroup', kind='stable')
         print(f"\nFamilia: {surname_group} ({row['TotalPeople']} personas)")
         print(family_data.to_string(index=False))
 
@@ -3,12 +3,22 @@ Script para analizar si los miembros del mismo grupo
 tienen el mismo valor de Transported
 """
 
-import pandas as pd
+import argparse
+from pathlib import Path
+
 import numpy as np
 
-# Cargar datos
-print("Cargando train7.csv...")
-df = pd.read_csv('train7.csv')
+from dataset_io import read_dataset, resolve_stage_file
+from group_index import GroupIndex
+from key_consistency import consistency_by_size, key_consistency
+
+# Cargar datos (--input, o train7.csv / train7.parquet, el más reciente)
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--input', default=None, help="CSV/Parquet de entrada (por defecto: train7.csv/.parquet).")
+args = parser.parse_args()
+input_file = Path(args.input) if args.input else resolve_stage_file('train7')
+print(f"Cargando {input_file.name}...")
+df = read_dataset(input_file)
 
 print(f"\nDimensiones: {df.shape}")
 print(f"Total de pasajeros: {len(df)}")
@@ -23,16 +33,11 @@ groups_with_multiple = df[df['GroupSize'] > 1]
 print(f"\nPasajeros en grupos de 2+ personas: {len(groups_with_multiple)}")
 print(f"Número de grupos de 2+ personas: {groups_with_multiple['Group'].nunique()}")
 
-# Para cada grupo, contar cuántos valores únicos de Transported hay
-group_analysis = df.groupby('Group').agg({
-    'Transported': lambda x: x.nunique(),  # Cuántos valores únicos
-    'GroupSize': 'first'
-}).reset_index()
+# Índice de filas por grupo (offsets; las filas ya vienen ordenadas por Group)
+group_index = GroupIndex.from_frame(df, 'Group')
 
-group_analysis.columns = ['Group', 'UniqueTransportedValues', 'GroupSize']
-
-# Clasificar grupos
-group_analysis['AllSame'] = group_analysis['UniqueTransportedValues'] == 1
+# Para cada grupo: valores únicos de Transported, conteos y tamaño (una pasada)
+group_analysis = key_consistency(df, 'Group', first=['GroupSize'], index=group_index)
 
 print(f"\n{'='*80}")
 print("RESULTADOS GENERALES")
@@ -65,11 +70,7 @@ print(f"\n{'='*80}")
 print("ANÁLISIS POR TAMAÑO DE GRUPO")
 print(f"{'='*80}")
 
-for size in sorted(multi_person_groups['GroupSize'].unique()):
-    groups_of_size = multi_person_groups[multi_person_groups['GroupSize'] == size]
-    total = len(groups_of_size)
-    same = groups_of_size['AllSame'].sum()
-    different = total - same
+for size, total, same, different in consistency_by_size(multi_person_groups, 'GroupSize').itertuples(index=False):
     print(f"\nTamaño {size}:")
     print(f"  Total grupos:     {total}")
     print(f"  Todos iguales:    {same:4d} ({same/total*100:5.2f}%)")
@@ -88,7 +89,7 @@ if len(mixed_groups) > 0:
 
     for i, (idx, row) in enumerate(mixed_groups.head(5).iterrows()):
         group_id = row['Group']
-        group_data = df[df['Group'] == group_id][['Group', 'NumInGroup', 'GroupSize', 'Name', 'Age', 'CryoSleep', 'Transported']]
+        group_data = group_index.rows(df, group_id)[['Group', 'NumInGroup', 'GroupSize', 'Name', 'Age', 'CryoSleep', 'Transported']]
         print(f"\nGrupo {group_id} (Tamaño: {row['GroupSize']}):")
         print(group_data.to_string(index=False))
 
@@ -110,7 +111,7 @@ if len(same_groups) > 0:
 
     for i, (idx, row) in enumerate(same_groups.head(5).iterrows()):
         group_id = row['Group']
-        group_data = df[df['Group'] == group_id][['Group', 'NumInGroup', 'GroupSize', 'Name', 'Age', 'Transported']]
+        group_data = group_index.rows(df, group_id)[['Group', 'NumInGroup', 'GroupSize', 'Name', 'Age', 'Transported']]
         print(f"\nGrupo {group_id} (Tamaño: {row['GroupSize']}):")
         print(group_data.to_string(index=False))
 
@@ -140,12 +141,9 @@ print("GUARDANDO RESULTADOS")
 print(f"{'='*80}")
 
 # Crear un resumen por grupo
-group_summary = df.groupby('Group').agg({
-    'GroupSize': 'first',
-    'Transported': lambda x: (x == True).sum(),  # Cuántos True
-}).reset_index()
-
-group_summary.columns = ['Group', 'GroupSize', 'TransportedCount']
+group_summary = group_analysis[['Group', 'GroupSize', 'TransportedTrue']].rename(
+    columns={'TransportedTrue': 'TransportedCount'}  # Cuántos True
+)
 group_summary['NotTransportedCount'] = group_summary['GroupSize'] - group_summary['TransportedCount']
 group_summary['AllSameValue'] = (group_summary['TransportedCount'] == 0) | (group_summary['TransportedCount'] == group_summary['GroupSize'])
 
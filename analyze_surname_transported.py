@@ -3,12 +3,22 @@ Script para analizar si las personas con el mismo apellido
 tienen el mismo valor de Transported
 """
 
-import pandas as pd
+import argparse
+from pathlib import Path
+
 import numpy as np
 
-# Cargar datos
-print("Cargando train8.csv...")
-df = pd.read_csv('train8.csv')
+from dataset_io import read_dataset, resolve_stage_file
+from group_index import GroupIndex
+from key_consistency import consistency_by_size, key_consistency
+
+# Cargar datos (--input, o train8.csv / train8.parquet, el más reciente)
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--input', default=None, help="CSV/Parquet de entrada (por defecto: train8.csv/.parquet).")
+args = parser.parse_args()
+input_file = Path(args.input) if args.input else resolve_stage_file('train8')
+print(f"Cargando {input_file.name}...")
+df = read_dataset(input_file)
 
 print(f"\nDimensiones: {df.shape}")
 print(f"Total de pasajeros: {len(df)}")
@@ -25,16 +35,12 @@ surnames_multi = surnames_with_multiple[surnames_with_multiple > 1]
 print(f"\nPasajeros con apellido compartido: {df[df['Surname'].isin(surnames_multi.index)].shape[0]}")
 print(f"Número de apellidos compartidos: {len(surnames_multi)}")
 
-# Para cada apellido, contar cuántos valores únicos de Transported hay
-surname_analysis = df[df['Surname'].notna()].groupby('Surname').agg({
-    'Transported': lambda x: x.nunique(),  # Cuántos valores únicos
-    'Surname': 'count'  # Cuántas personas
-}).reset_index(drop=True)
-
-surname_analysis.columns = ['UniqueTransportedValues', 'FamilySize']
-
-# Clasificar apellidos
-surname_analysis['AllSame'] = surname_analysis['UniqueTransportedValues'] == 1
+# Para cada apellido: valores únicos de Transported, personas y grupos (una pasada;
+# las filas sin apellido quedan fuera)
+surname_index = GroupIndex.from_frame(df, 'Surname')  # filas de cada apellido (permutación + offsets)
+surname_analysis = key_consistency(df, 'Surname', nunique=['Group'], index=surname_index).rename(
+    columns={'Size': 'FamilySize'}
+)
 
 print(f"\n{'='*80}")
 print("RESULTADOS GENERALES")
@@ -67,26 +73,22 @@ print(f"\n{'='*80}")
 print("ANÁLISIS POR TAMAÑO DE FAMILIA (APELLIDO)")
 print(f"{'='*80}")
 
-for size in sorted(multi_person_surnames['FamilySize'].unique()):
+for size, total, same, different in consistency_by_size(multi_person_surnames, 'FamilySize').itertuples(index=False):
     if size > 1 and size <= 20:  # Limitamos a tamaños razonables
-        families_of_size = multi_person_surnames[multi_person_surnames['FamilySize'] == size]
-        if len(families_of_size) > 0:
-            total = len(families_of_size)
-            same = families_of_size['AllSame'].sum()
-            different = total - same
-            print(f"\nTamaño {size:2d}:")
-            print(f"  Total apellidos:  {total:4d}")
-            print(f"  Todos iguales:    {same:4d} ({same/total*100:5.2f}%)")
-            print(f"  Valores mixtos:   {different:4d} ({different/total*100:5.2f}%)")
+        print(f"\nTamaño {size:2d}:")
+        print(f"  Total apellidos:  {total:4d}")
+        print(f"  Todos iguales:    {same:4d} ({same/total*100:5.2f}%)")
+        print(f"  Valores mixtos:   {different:4d} ({different/total*100:5.2f}%)")
 
 # Obtener información detallada de apellidos
-surname_details = df[df['Surname'].notna()].groupby('Surname').agg({
-    'Transported': [lambda x: x.nunique(), lambda x: (x == True).sum(), 'count'],
-    'Group': lambda x: x.nunique()  # Cuántos grupos diferentes
-}).reset_index()
-
-surname_details.columns = ['Surname', 'UniqueTransported', 'TransportedCount', 'TotalPeople', 'UniqueGroups']
-surname_details['AllSameTransported'] = surname_details['UniqueTransported'] == 1
+surname_details = surname_analysis[['Surname', 'UniqueTransported', 'TransportedTrue', 'Count', 'UniqueGroup', 'AllSame']].rename(
+    columns={
+        'TransportedTrue': 'TransportedCount',
+        'Count': 'TotalPeople',
+        'UniqueGroup': 'UniqueGroups',  # Cuántos grupos diferentes
+        'AllSame': 'AllSameTransported',
+    }
+)
 surname_details['NotTransportedCount'] = surname_details['TotalPeople'] - surname_details['TransportedCount']
 
 # Identificar apellidos con valores mixtos
@@ -103,7 +105,7 @@ if len(mixed_surnames) > 0:
 
     for i, (idx, row) in enumerate(mixed_surnames.head(5).iterrows()):
         surname = row['Surname']
-        family_data = df[df['Surname'] == surname][['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'HomePlanet', 'Transported']].sort_values('Group')
+        family_data = surname_index.rows(df, surname)[['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'HomePlanet', 'Transported']].sort_values('Group', kind='stable')
         print(f"\nApellido: {surname} ({row['TotalPeople']} personas, {row['UniqueGroups']} grupos)")
         print(family_data.to_string(index=False))
         print(f"  → {row['TransportedCount']} transportados, {row['NotTransportedCount']} NO transportados")
@@ -122,7 +124,7 @@ if len(same_surnames) > 0:
 
     for i, (idx, row) in enumerate(same_surnames.head(5).iterrows()):
         surname = row['Surname']
-        family_data = df[df['Surname'] == surname][['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'Transported']].sort_values('Group')
+        family_data = surname_index.rows(df, surname)[['Group', 'NumInGroup', 'GroupSize', 'Surname', 'Age', 'Transported']].sort_values('Group', kind='stable')
         print(f"\nApellido: {surname} ({row['TotalPeople']} personas, {row['UniqueGroups']} grupos)")
         print(family_data.to_string(index=False))
 
@@ -135,8 +137,8 @@ print("COMPARACIÓN: GRUPOS vs APELLIDOS")
 print(f"{'='*80}")
 
 # Analizar cuántos apellidos comparten grupo
-surname_group_relation = df[df['Surname'].notna()].groupby('Surname')['Group'].apply(
-    lambda x: x.nunique() / len(x)  # Ratio: grupos únicos / total personas
+surname_group_relation = (
+    surname_analysis['UniqueGroup'] / surname_analysis['FamilySize']  # Ratio: grupos únicos / total personas
 ).mean()
 
 print(f"\nEn promedio, personas con el mismo apellido pertenecen a:")
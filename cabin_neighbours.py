@@ -0,0 +1,203 @@
+"""
+Vecindario de cabinas y Transported de los vecinos - Spaceship Titanic
+
+split_cabin_column.py separa Cabin en Deck/Num/Side, pero nada usaba la cercanía
+entre cabinas. CabinIndex ordena las cabinas ocupadas por (Deck, Side, Num) con
+dos niveles de offsets (group_index.GroupIndex):
+- cabina (Deck, Side, Num) → sus pasajeros (rango contiguo de filas)
+- lado del pasillo (Deck, Side) → sus cabinas, ordenadas por Num
+
+Consultas con searchsorted sobre los Num del lado:
+- range(deck, side, lo, hi): pasajeros con lo <= Num <= hi (vista sin copia)
+- nearest(deck, side, num, k): los k Num de cabina ocupada más cercanos
+
+Features (una pasada vectorizada, sin bucles por fila): para cada ventana ±w
+cabinas del mismo Deck/Side,
+- CabinNeighbours{w}: pasajeros en la ventana sin contar al propio pasajero
+- CabinNeighbourRate{w}: tasa de Transported de esos vecinos (dejando fuera al
+  propio pasajero y a los vecinos sin Transported; NaN si no queda ninguno)
+Las sumas por ventana salen de sumas acumuladas por cabina: O(n + cabinas·log).
+Filas sin cabina completa → nulo. Con train y test concatenados, los pasajeros
+de test (Transported nulo) reciben la tasa de sus vecinos de train.
+
+Entradas:
+- train9.csv (o cualquier etapa desde train2, con Deck/Num/Side)
+
+Salidas:
+- train9_with_cabin_neighbours.csv
+
+Uso:
+    python cabin_neighbours.py --input train9.csv --windows 0 1 5 25
+    python cabin_neighbours.py --query F/1/S --k 5
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+from group_index import GroupIndex
+from target_rates import target_codes
+
+
+CABIN_KEY = ["Deck", "Side", "Num"]
+DEFAULT_WINDOWS = [1, 5, 25]
+
+
+class CabinIndex:
+    """
+    cabins: índice por cabina (orden Deck, Side, Num); sides: índice por lado
+    sobre las cabinas (ya ordenadas, sin permutación); num: Num de cada cabina.
+    """
+
+    def __init__(self, cabins: GroupIndex) -> None:
+        self.cabins = cabins
+        self.sides = GroupIndex.from_frame(cabins.keys, ["Deck", "Side"])
+        self.num = cabins.keys["Num"].to_numpy(dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CabinIndex":
+        return cls(GroupIndex.from_frame(df, CABIN_KEY))
+
+    def _side(self, deck: object, side: object) -> tuple[int, int]:
+        i = self.sides.locate((deck, side))
+        return int(self.sides.offsets[i]), int(self.sides.offsets[i + 1])
+
+    def range(self, deck: object, side: object, lo: int, hi: int) -> np.ndarray:
+        """
+        Filas (posicionales) con lo <= Num <= hi en ese Deck/Side, ordenadas por Num.
+        """
+        s, e = self._side(deck, side)
+        i = s + int(np.searchsorted(self.num[s:e], lo, side="left"))
+        j = s + int(np.searchsorted(self.num[s:e], hi, side="right"))
+        return self.cabins.positions[self.cabins.offsets[i] : self.cabins.offsets[j]]
+
+    def nearest(self, deck: object, side: object, num: int, k: int) -> np.ndarray:
+        """
+        Num de las k cabinas ocupadas más cercanas a num (empates: la de Num menor).
+        """
+        s, e = self._side(deck, side)
+        nums = self.num[s:e]
+        pos = int(np.searchsorted(nums, num))
+        candidates = nums[max(pos - k, 0) : pos + k]
+        return candidates[np.argsort(np.abs(candidates - num), kind="stable")[:k]]
+
+    def window_sums(self, values: np.ndarray, w: int) -> np.ndarray:
+        """
+        Suma por cabina de values (por fila) sobre las cabinas del mismo lado con
+        |ΔNum| <= w.
+        """
+        per_cabin = np.r_[0, np.cumsum(self.cabins.reduceat(values))]
+        # Clave (lado, Num) con hueco entre lados: una ventana nunca cruza de lado
+        span = int(self.num.max()) + w + 1 if len(self.num) else 1
+        key = self.sides.segment_ids() * span + self.num
+        lo = np.searchsorted(key, key - w, side="left")
+        hi = np.searchsorted(key, key + w, side="right")
+        return per_cabin[hi] - per_cabin[lo]
+
+    def cabin_of_rows(self, n: int) -> np.ndarray:
+        """
+        Cabina (0..c-1) de cada fila; -1 si le falta Deck, Side o Num.
+        """
+        cabin = np.full(n, -1, dtype=np.int64)
+        cabin[self.cabins.positions] = self.cabins.segment_ids()
+        return cabin
+
+
+def neighbour_features(
+    df: pd.DataFrame,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    target: str = "Transported",
+    index: Optional[CabinIndex] = None,
+) -> pd.DataFrame:
+    """
+    CabinNeighbours{w} y CabinNeighbourRate{w} por fila (índice de df).
+    """
+    index = CabinIndex.from_frame(df) if index is None else index
+    n = len(df)
+    cabin = index.cabin_of_rows(n)
+    has_cabin = cabin >= 0
+    c = np.where(has_cabin, cabin, 0)
+
+    t = target_codes(df[target]) if target in df.columns else np.full(n, 2, dtype=np.int64)
+    known = (t <= 1).astype(np.int64)
+    true = (t == 1).astype(np.int64)
+    ones = np.ones(n, dtype=np.int64)
+
+    out: Dict[str, object] = {}
+    for w in windows:
+        neighbours = index.window_sums(ones, w)[c] - 1
+        known_n = index.window_sums(known, w)[c] - known
+        true_n = index.window_sums(true, w)[c] - true
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(has_cabin & (known_n > 0), true_n / known_n, np.nan)
+        out[f"CabinNeighbours{w}"] = pd.arrays.IntegerArray(neighbours, ~has_cabin)
+        out[f"CabinNeighbourRate{w}"] = rate
+    return pd.DataFrame(out, index=df.index)
+
+
+def transform(df: pd.DataFrame, windows: Sequence[int] = DEFAULT_WINDOWS) -> pd.DataFrame:
+    """
+    Añade las features de vecindario de cabina para cada ventana de windows.
+    """
+    return pd.concat([df, neighbour_features(df, windows)], axis=1)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Features de vecindario de cabina (Transported de los vecinos).")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet con Deck/Num/Side (por defecto: train9.csv).")
+    p.add_argument("--output", default="train9_with_cabin_neighbours.csv", help="CSV de salida.")
+    p.add_argument("--windows", type=int, nargs="+", default=DEFAULT_WINDOWS, help="Ventanas ±w cabinas.")
+    p.add_argument("--query", default=None, help="Solo consultar una cabina Deck/Num/Side (p.ej. F/1/S).")
+    p.add_argument("--k", type=int, default=5, help="Con --query: cabinas más cercanas a mostrar.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+    df = read_dataset(input_path)
+    missing = sorted(set(CABIN_KEY) - set(df.columns))
+    if missing:
+        raise ValueError(f"Columnas inexistentes en el dataset: {', '.join(missing)}")
+    if any(w < 0 for w in args.windows):
+        raise ValueError("Las ventanas deben ser >= 0.")
+
+    index = CabinIndex.from_frame(df)
+
+    if args.query:
+        deck, num, side = args.query.split("/")
+        nearest = index.nearest(deck, side, int(num), args.k)
+        print(f"Cabinas más cercanas a {args.query}: {', '.join(f'{deck}/{n}/{side}' for n in nearest)}")
+        rows = index.range(deck, side, int(num), int(num))
+        print(df.iloc[rows].to_string(index=False) if len(rows) else "  (cabina sin pasajeros)")
+        return
+
+    features = neighbour_features(df, args.windows, index=index)
+    pd.concat([df, features], axis=1).to_csv(args.output, index=False)
+
+    print("✓ Features de vecindario de cabina")
+    print(f"  - input:   {input_path} ({len(df)} filas, {len(index.cabins)} cabinas, {len(index.sides)} lados)")
+    print(f"  - output:  {args.output}")
+    if "Transported" in df.columns:
+        transported = df["Transported"].astype("boolean")
+        for w in args.windows:
+            rate = features[f"CabinNeighbourRate{w}"]
+            valid = rate.notna() & transported.notna()
+            corr = np.corrcoef(rate[valid], transported[valid].astype(float))[0, 1] if valid.sum() > 1 else np.nan
+            print(
+                f"  - ±{w}: {features[f'CabinNeighbours{w}'].mean():.1f} vecinos de media, "
+                f"corr(tasa vecinos, Transported) = {corr:.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,22 @@ Clustering de grupos de edad (Age) - Spaceship Titanic
 Objetivo:
 - Segmentar a los pasajeros en "grupos de edad" usando técnicas de clustering (no bins manuales).
 - Evaluar varios k (2..max_k) con:
-  - Silhouette score (mayor es mejor)
+  - Silhouette score (mayor es mejor; age_clustering.silhouette_1d, O(n) en vez
+    de la matriz de distancias O(n²) de sklearn)
   - Inercia (elbow; menor es mejor, útil para inspección)
+- Motor (--engine):
+  - dp (por defecto): k-means 1D exacto y determinista sobre el histograma de
+    edades (age_clustering.py); todos los k en una pasada.
+  - kmeans: sklearn KMeans con reinicios aleatorios (comportamiento anterior);
+    cada k se ajusta en un proceso del pool (--workers).
+- Caché de ajustes (age_fit_cache.py, --cache-dir; --no-cache la desactiva):
+  inercia, silhouette y centros por (huella de los datos, motor, k, random_state).
+  Otra ejecución con distinto --k o distintas rutas de salida reutiliza los
+  ajustes ya calculados en vez de repetir el barrido.
+- Gráficas con plot_cache.py: en paralelo (--workers) y solo las que cambiaron.
 
 Entradas:
-- train9.csv (por defecto)
+- train9.csv (por defecto) o train9.parquet
 
 Salidas:
 - train9_with_age_clusters.csv: dataset original + columnas:
@@ -16,6 +27,8 @@ Salidas:
     - AgeCluster: id de clúster ordenado por centro (0 = más joven)
     - AgeClusterLabel: etiqueta legible (p.ej. "C0_0-12")
 - age_cluster_summary.csv: resumen por clúster (tamaño, rango, media, etc.)
+- age_cluster_model.npz: modelo ajustado (age_clustering.AgeClusterModel) para
+  asignar AgeCluster a pasajeros nuevos con searchsorted y sin sklearn
 - age_cluster_transported_rate.csv: tasa de Transported por clúster (si existe la columna)
 - plots/age_clustering_elbow.png
 - plots/age_clustering_silhouette.png
@@ -26,16 +39,25 @@ Salidas:
 from __future__ import annotations
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.preprocessing import StandardScaler
+import figures
+from age_clustering import AgeClusterModel, clustering_silhouette, histogram, optimal_1d_clusterings, silhouette_1d
+from age_fit_cache import DEFAULT_CACHE_DIR, AgeFit, AgeFitCache, fingerprint, fit_key
+from dataset_io import read_dataset
+from plot_cache import PlotJob, render_plots
+from target_rates import feature_rates, target_rate_table
+
+
+ENGINES = ("dp", "kmeans")
+EVAL_N_INIT = 20  # reinicios de KMeans al evaluar cada k
+FIT_N_INIT = 50  # reinicios de KMeans en el ajuste final del k elegido
 
 
 def _parse_args() -> argparse.Namespace:
@@ -43,7 +65,7 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument(
         "--input",
         default="train9.csv",
-        help="Ruta del CSV de entrada (por defecto: train9.csv).",
+        help="Ruta del CSV/Parquet de entrada (por defecto: train9.csv).",
     )
     p.add_argument(
         "--k",
@@ -61,6 +83,11 @@ def _parse_args() -> argparse.Namespace:
         default="age_cluster_summary.csv",
         help="Ruta del CSV de resumen por clúster.",
     )
+    p.add_argument(
+        "--model",
+        default="age_cluster_model.npz",
+        help="Ruta del modelo exportado (.npz: centros, fronteras, mediana, etiquetas).",
+    )
     p.add_argument(
         "--plots-dir",
         default="plots",
@@ -76,8 +103,27 @@ def _parse_args() -> argparse.Namespace:
         "--random-state",
         type=int,
         default=42,
-        help="Semilla aleatoria para reproducibilidad.",
+        help="Semilla aleatoria para reproducibilidad (solo motor kmeans).",
+    )
+    p.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="dp",
+        help="dp: óptimo global exacto sobre el histograma de edades; kmeans: sklearn KMeans.",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos para ajustar los k en paralelo (motor kmeans; dp resuelve todos los k en una pasada) "
+        "y para dibujar las gráficas.",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directorio de la caché de ajustes por k (ver age_fit_cache.py).",
+    )
+    p.add_argument("--no-cache", action="store_true", help="No leer ni escribir la caché de ajustes.")
     return p.parse_args()
 
 
@@ -97,26 +143,115 @@ def _prepare_age(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
     return age_raw, age_imputed
 
 
-def _evaluate_kmeans(age_imputed: np.ndarray, max_k: int, random_state: int) -> pd.DataFrame:
+def _dp_fits(age_imputed: np.ndarray, ks: Sequence[int]) -> Dict[int, AgeFit]:
     """
-    Evalúa KMeans en 1D sobre Age (estandarizado) para k en [2..max_k].
+    Particiones óptimas para todos los k pedidos en una sola programación dinámica
+    sobre el histograma de edades (etiquetas ya ordenadas por centro).
     """
-    x = age_imputed.reshape(-1, 1)
-    x_scaled = StandardScaler().fit_transform(x)
-
-    rows = []
-    for k in range(2, max_k + 1):
-        km = KMeans(n_clusters=k, n_init=20, random_state=random_state)
-        labels = km.fit_predict(x_scaled)
-        sil = silhouette_score(x_scaled, labels)
-        rows.append(
-            {
-                "k": k,
-                "inertia": float(km.inertia_),
-                "silhouette": float(sil),
-            }
+    uniques, counts, _ = histogram(age_imputed)
+    fits = optimal_1d_clusterings(uniques, counts, max_k=max(ks))
+    # Inercia en la escala estandarizada (como KMeans sobre x_scaled)
+    var = float(np.var(age_imputed)) or 1.0
+    return {
+        k: AgeFit(
+            k=k,
+            inertia=fits[k].inertia / var,
+            silhouette=clustering_silhouette(uniques, counts, fits[k]) if k >= 2 else float("nan"),
+            centers=fits[k].centers,
+            values=uniques,
+            value_labels=fits[k].value_labels,
         )
-    return pd.DataFrame(rows).sort_values("k")
+        for k in ks
+    }
+
+
+def _kmeans_fit(age_imputed: np.ndarray, k: int, random_state: int, n_init: int) -> AgeFit:
+    """
+    Un ajuste de sklearn KMeans sobre Age estandarizado (se ejecuta en los workers).
+    """
+    # sklearn solo se importa con el motor kmeans
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    x_scaled = scaler.fit_transform(age_imputed.reshape(-1, 1))
+    km = KMeans(n_clusters=k, n_init=n_init, random_state=random_state)
+    labels = km.fit_predict(x_scaled)
+
+    # KMeans asigna por distancia: misma edad → mismo clúster
+    uniques, _, inverse = histogram(age_imputed)
+    value_labels = np.zeros(len(uniques), dtype=np.int64)
+    value_labels[inverse] = labels
+    return AgeFit(
+        k=k,
+        inertia=float(km.inertia_),
+        silhouette=silhouette_1d(age_imputed, labels),
+        centers=scaler.inverse_transform(km.cluster_centers_).reshape(-1),
+        values=uniques,
+        value_labels=value_labels,
+    )
+
+
+def _sweep(
+    age_imputed: np.ndarray,
+    ks: Sequence[int],
+    engine: str,
+    random_state: int,
+    n_init: int,
+    cache: Optional[AgeFitCache] = None,
+    workers: int = 1,
+) -> Tuple[Dict[int, AgeFit], int]:
+    """
+    Ajustes para cada k: primero la caché; los que faltan se calculan (dp: una sola
+    pasada; kmeans: un k por worker) y se guardan. Devuelve (ajustes, reutilizados).
+    """
+    data_hash = fingerprint(age_imputed)
+    keys = {k: fit_key(data_hash, engine, k, random_state, n_init) for k in ks}
+    fits: Dict[int, AgeFit] = {}
+    if cache is not None:
+        for k, key in keys.items():
+            fit = cache.get(engine, key)
+            if fit is not None:
+                fits[k] = fit
+    hits = len(fits)
+
+    missing = [k for k in ks if k not in fits]
+    if missing:
+        if engine == "dp":
+            computed = _dp_fits(age_imputed, missing)
+        elif workers > 1 and len(missing) > 1:
+            n = len(missing)
+            with ProcessPoolExecutor(max_workers=min(workers, n)) as pool:
+                results = pool.map(_kmeans_fit, [age_imputed] * n, missing, [random_state] * n, [n_init] * n)
+                computed = dict(zip(missing, results))
+        else:
+            computed = {k: _kmeans_fit(age_imputed, k, random_state, n_init) for k in missing}
+        for k, fit in computed.items():
+            fits[k] = fit
+            if cache is not None:
+                cache.put(engine, keys[k], fit)
+    return fits, hits
+
+
+def _evaluate_kmeans(
+    age_imputed: np.ndarray,
+    max_k: int,
+    random_state: int,
+    engine: str = "dp",
+    cache: Optional[AgeFitCache] = None,
+    workers: int = 1,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Evalúa el clustering 1D sobre Age (estandarizado) para k en [2..max_k], con
+    max_k limitado al número de edades distintas (no hay más particiones posibles).
+    Devuelve las métricas y cuántos k salieron de la caché.
+    """
+    max_k = min(max_k, len(np.unique(age_imputed)))
+    fits, hits = _sweep(
+        age_imputed, range(2, max_k + 1), engine, random_state, EVAL_N_INIT, cache=cache, workers=workers
+    )
+    rows = [{"k": k, "inertia": fit.inertia, "silhouette": fit.silhouette} for k, fit in sorted(fits.items())]
+    return pd.DataFrame(rows).sort_values("k"), hits
 
 
 def _select_best_k(metrics: pd.DataFrame) -> int:
@@ -129,21 +264,21 @@ def _select_best_k(metrics: pd.DataFrame) -> int:
     return int(best["k"])
 
 
-def _fit_kmeans(age_imputed: np.ndarray, k: int, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+def _fit_kmeans(
+    age_imputed: np.ndarray,
+    k: int,
+    random_state: int,
+    engine: str = "dp",
+    cache: Optional[AgeFitCache] = None,
+) -> Tuple[np.ndarray, np.ndarray, bool]:
     """
-    Ajusta KMeans en 1D (Age estandarizado) y devuelve:
-    - labels: etiquetas originales de KMeans
+    Ajusta el clustering 1D (Age estandarizado) y devuelve:
+    - labels: etiquetas del motor (con dp ya ordenadas por centro)
     - centers_age: centros en escala de Age (no estandarizada)
+    - cached: si el ajuste salió de la caché
     """
-    x = age_imputed.reshape(-1, 1)
-    scaler = StandardScaler()
-    x_scaled = scaler.fit_transform(x)
-
-    km = KMeans(n_clusters=k, n_init=50, random_state=random_state)
-    labels = km.fit_predict(x_scaled)
-    centers_scaled = km.cluster_centers_
-    centers_age = scaler.inverse_transform(centers_scaled).reshape(-1)
-    return labels, centers_age
+    fits, hits = _sweep(age_imputed, [k], engine, random_state, FIT_N_INIT, cache=cache)
+    return fits[k].labels(age_imputed), fits[k].centers, hits > 0
 
 
 def _relabel_by_center(labels: np.ndarray, centers_age: np.ndarray) -> Tuple[np.ndarray, dict]:
@@ -151,70 +286,67 @@ def _relabel_by_center(labels: np.ndarray, centers_age: np.ndarray) -> Tuple[np.
     Re-etiqueta clústeres para que 0 sea el centro más joven, 1 el siguiente, etc.
     """
     order = np.argsort(centers_age)
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(len(order))
     mapping = {int(old): int(new) for new, old in enumerate(order)}
-    new_labels = np.vectorize(lambda x: mapping[int(x)])(labels)
-    return new_labels.astype(int), mapping
+    return rank[np.asarray(labels, dtype=int)], mapping
+
+
+def fit_age_model(
+    age_raw: np.ndarray,
+    age_imputed: np.ndarray,
+    k: Optional[int] = None,
+    max_k: int = 10,
+    random_state: int = 42,
+    engine: str = "dp",
+    cache: Optional[AgeFitCache] = None,
+    workers: int = 1,
+) -> Tuple[AgeClusterModel, np.ndarray, pd.DataFrame, int]:
+    """
+    Barrido de k (o k forzado) + ajuste final. Devuelve el modelo exportable, el
+    AgeCluster de cada fila (0 = más joven), las métricas por k y cuántos ajustes
+    salieron de la caché.
+    """
+    eval_max_k = max_k if k is None else max(max_k, int(k))
+    metrics, eval_hits = _evaluate_kmeans(
+        age_imputed, max_k=eval_max_k, random_state=random_state, engine=engine, cache=cache, workers=workers
+    )
+    best_k = int(k) if k is not None else _select_best_k(metrics)
 
+    labels, centers_age, fit_cached = _fit_kmeans(
+        age_imputed, k=best_k, random_state=random_state, engine=engine, cache=cache
+    )
+    age_cluster, _ = _relabel_by_center(labels, centers_age)
+    model = AgeClusterModel.from_assignment(age_raw, age_imputed, age_cluster, centers_age)
+    return model, age_cluster, metrics, eval_hits + int(fit_cached)
 
-def _make_cluster_labels(age_imputed: np.ndarray, age_cluster: np.ndarray) -> pd.Series:
+
+def _plot_jobs(metrics: pd.DataFrame, df_out: pd.DataFrame, plots_dir: Path) -> List[PlotJob]:
     """
-    Etiqueta legible por clúster, usando rango observado en el dataset imputado.
-    Formato: C{cluster}_{min}-{max}
+    Elbow (inercia), silhouette y distribución de edades por clúster.
     """
-    s = pd.Series(age_imputed)
-    out = []
-    for c in age_cluster:
-        out.append(c)
-    out = pd.Series(out, index=s.index, dtype=int)
-
-    labels = {}
-    for c in sorted(out.unique()):
-        ages = s[out == c]
-        a_min = int(np.floor(ages.min()))
-        a_max = int(np.ceil(ages.max()))
-        labels[int(c)] = f"C{int(c)}_{a_min}-{a_max}"
-    return out.map(labels)
-
-
-def _write_plots(metrics: pd.DataFrame, df_out: pd.DataFrame, plots_dir: Path) -> None:
-    plots_dir.mkdir(parents=True, exist_ok=True)
-
-    # Elbow (inercia)
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(metrics["k"], metrics["inertia"], marker="o")
-    ax.set_title("KMeans 1D sobre Age - Elbow (Inercia)")
-    ax.set_xlabel("k (número de clústeres)")
-    ax.set_ylabel("Inercia")
-    ax.grid(alpha=0.3)
-    fig.tight_layout()
-    fig.savefig(plots_dir / "age_clustering_elbow.png", dpi=250, bbox_inches="tight")
-    plt.close(fig)
-
-    # Silhouette
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(metrics["k"], metrics["silhouette"], marker="o")
-    ax.set_title("KMeans 1D sobre Age - Silhouette")
-    ax.set_xlabel("k (número de clústeres)")
-    ax.set_ylabel("Silhouette score")
-    ax.grid(alpha=0.3)
-    fig.tight_layout()
-    fig.savefig(plots_dir / "age_clustering_silhouette.png", dpi=250, bbox_inches="tight")
-    plt.close(fig)
-
-    # Distribución de edades por clúster
-    fig, ax = plt.subplots(figsize=(10, 5))
-    df_plot = df_out.copy()
-    df_plot = df_plot.sort_values("AgeCluster")
-    for c in sorted(df_plot["AgeCluster"].unique()):
-        ages = df_plot.loc[df_plot["AgeCluster"] == c, "AgeImputed"].to_numpy()
-        ax.hist(ages, bins=20, alpha=0.55, label=f"C{c}")
-    ax.set_title("Distribución de Age (imputada) por clúster")
-    ax.set_xlabel("Edad")
-    ax.set_ylabel("Frecuencia")
-    ax.legend(title="Clúster", ncols=4, fontsize=9)
-    fig.tight_layout()
-    fig.savefig(plots_dir / "age_clusters_distribution.png", dpi=250, bbox_inches="tight")
-    plt.close(fig)
+    return [
+        PlotJob(
+            str(plots_dir / "age_clustering_elbow.png"),
+            figures.age_cluster_metric,
+            metrics[["k", "inertia"]],
+            {"metric": "inertia", "title": "KMeans 1D sobre Age - Elbow (Inercia)", "ylabel": "Inercia"},
+            dpi=250,
+        ),
+        PlotJob(
+            str(plots_dir / "age_clustering_silhouette.png"),
+            figures.age_cluster_metric,
+            metrics[["k", "silhouette"]],
+            {"metric": "silhouette", "title": "KMeans 1D sobre Age - Silhouette", "ylabel": "Silhouette score"},
+            dpi=250,
+        ),
+        PlotJob(
+            str(plots_dir / "age_clusters_distribution.png"),
+            figures.age_clusters_distribution,
+            df_out[["AgeCluster", "AgeImputed"]],
+            dpi=250,
+        ),
+    ]
 
 
 def _transported_rate_by_cluster(df_out: pd.DataFrame) -> pd.DataFrame | None:
@@ -226,51 +358,19 @@ def _transported_rate_by_cluster(df_out: pd.DataFrame) -> pd.DataFrame | None:
     if "Transported" not in df_out.columns:
         return None
 
-    t = df_out["Transported"]
-    if t.dtype == bool:
-        transported_01 = t.astype(int)
-    else:
-        # soportar 0/1 o strings "True"/"False" de forma defensiva
-        if t.dtype == object:
-            transported_01 = t.map({"True": 1, "False": 0, True: 1, False: 0}).astype("Int64")
-        else:
-            transported_01 = pd.to_numeric(t, errors="coerce").astype("Int64")
-
-    tmp = df_out.copy()
-    tmp["_Transported01"] = transported_01
-
-    rate = (
-        tmp.groupby(["AgeCluster", "AgeClusterLabel"], as_index=False)
-        .agg(
-            Total=("AgeCluster", "size"),
-            TransportedTrue=("_Transported01", lambda s: int((s == 1).sum())),
-            TransportedFalse=("_Transported01", lambda s: int((s == 0).sum())),
-            MissingTransported=("_Transported01", lambda s: int(pd.isna(s).sum())),
-        )
-        .sort_values("AgeCluster")
-    )
-    rate["TransportedRate"] = rate["TransportedTrue"] / rate["Total"]
+    rate = feature_rates(target_rate_table(df_out, ["AgeCluster"]), "AgeCluster")
+    labels = df_out.drop_duplicates("AgeCluster").set_index("AgeCluster")["AgeClusterLabel"]
+    rate.insert(1, "AgeClusterLabel", labels.reindex(rate["AgeCluster"]).to_numpy())
     return rate
 
 
-def _write_transported_rate_plot(rate_df: pd.DataFrame, plots_dir: Path, best_k: int) -> Path:
-    plots_dir.mkdir(parents=True, exist_ok=True)
-    fig, ax = plt.subplots(figsize=(8, 5))
-    x = rate_df["AgeClusterLabel"].astype(str).to_list()
-    y = (rate_df["TransportedRate"] * 100).to_numpy()
-    ax.bar(x, y, color=["#4ECDC4" for _ in x])
-    ax.set_title("Tasa de Transported por AgeCluster")
-    ax.set_xlabel("AgeCluster")
-    ax.set_ylabel("Transported (%)")
-    ax.set_ylim(0, 100)
-    ax.grid(axis="y", alpha=0.3)
-    for i, val in enumerate(y):
-        ax.text(i, val + 1.0, f"{val:.1f}%", ha="center", va="bottom", fontsize=10)
-    fig.tight_layout()
-    out_path = plots_dir / f"age_clusters_transported_rate_k{best_k}.png"
-    fig.savefig(out_path, dpi=250, bbox_inches="tight")
-    plt.close(fig)
-    return out_path
+def _transported_rate_plot_job(rate_df: pd.DataFrame, plots_dir: Path, best_k: int) -> PlotJob:
+    return PlotJob(
+        str(plots_dir / f"age_clusters_transported_rate_k{best_k}.png"),
+        figures.age_clusters_transported_rate,
+        rate_df[["AgeClusterLabel", "TransportedRate"]],
+        dpi=250,
+    )
 
 
 def main() -> None:
@@ -280,7 +380,7 @@ def main() -> None:
     if not input_path.exists():
         raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
 
-    df = pd.read_csv(input_path)
+    df = read_dataset(input_path)
     age_raw, age_imputed = _prepare_age(df)
 
     forced_k = args.k
@@ -291,17 +391,24 @@ def main() -> None:
     if max_k < 2:
         raise ValueError("--max-k debe ser >= 2")
 
-    eval_max_k = max_k if forced_k is None else max(max_k, int(forced_k))
-    metrics = _evaluate_kmeans(age_imputed, max_k=eval_max_k, random_state=int(args.random_state))
-    best_k = int(forced_k) if forced_k is not None else _select_best_k(metrics)
-
-    labels, centers_age = _fit_kmeans(age_imputed, k=best_k, random_state=int(args.random_state))
-    age_cluster, mapping = _relabel_by_center(labels, centers_age)
+    cache = None if args.no_cache else AgeFitCache(args.cache_dir)
+    model, age_cluster, metrics, reused = fit_age_model(
+        age_raw,
+        age_imputed,
+        k=forced_k,
+        max_k=max_k,
+        random_state=int(args.random_state),
+        engine=args.engine,
+        cache=cache,
+        workers=int(args.workers),
+    )
+    best_k = model.k
+    evaluated_k = int(metrics["k"].max())
 
     df_out = df.copy()
     df_out["AgeImputed"] = age_imputed
     df_out["AgeCluster"] = age_cluster
-    df_out["AgeClusterLabel"] = _make_cluster_labels(age_imputed, age_cluster)
+    df_out["AgeClusterLabel"] = model.labels[age_cluster]
 
     # Resumen por clúster
     summary = (
@@ -322,9 +429,11 @@ def main() -> None:
     # Guardar archivos
     df_out.to_csv(args.output, index=False)
     summary.to_csv(args.summary, index=False)
+    model.save(args.model)
 
-    # Gráficas
-    _write_plots(metrics, df_out, Path(args.plots_dir))
+    # Gráficas: en paralelo y solo las que cambiaron (plot_cache.py)
+    plots_dir = Path(args.plots_dir)
+    plot_jobs = _plot_jobs(metrics, df_out, plots_dir)
 
     # Tasa de Transported por clúster (si aplica)
     rate_df = _transported_rate_by_cluster(df_out)
@@ -337,18 +446,28 @@ def main() -> None:
             rate_stem = f"{stem}_transported_rate"
         transported_rate_path = summary_path.with_name(rate_stem + summary_path.suffix)
         rate_df.to_csv(transported_rate_path, index=False)
-        transported_plot_path = _write_transported_rate_plot(rate_df, Path(args.plots_dir), best_k=best_k)
+        plot_jobs.append(_transported_rate_plot_job(rate_df, plots_dir, best_k=best_k))
+    plot_results = render_plots(plot_jobs, workers=int(args.workers))
+    rendered = sum(r.rendered for r in plot_results)
 
     # Log final (simple)
     print("✓ Clustering de edad completado")
     print(f"  - input:   {input_path}")
+    print(f"  - engine:  {args.engine}")
+    clamped = f" (--max-k {max_k} limitado a {evaluated_k} edades distintas)" if evaluated_k < max_k else ""
+    print(f"  - k:       2..{evaluated_k}{clamped}")
     print(f"  - best_k:  {best_k}")
+    if cache is not None:
+        print(f"  - caché:   {reused}/{len(metrics) + 1} ajustes reutilizados ({args.cache_dir})")
     print(f"  - output:  {args.output}")
     print(f"  - summary: {args.summary}")
+    print(f"  - model:   {args.model} (asignar nuevos: python age_clustering.py --model {args.model})")
     print(f"  - plots:   {args.plots_dir}/age_clustering_*.png y {args.plots_dir}/age_clusters_distribution.png")
+    if rendered < len(plot_results):
+        print(f"  - gráficas sin cambios: {len(plot_results) - rendered}/{len(plot_results)} (plot_cache.py)")
     if rate_df is not None:
         print(f"  - transported_rate: {transported_rate_path}")
-        print(f"  - transported_plot: {transported_plot_path}")
+        print(f"  - transported_plot: {plot_jobs[-1].output}")
     print("\nMétricas (k, silhouette):")
     print(metrics[["k", "silhouette"]].to_string(index=False))
 
@@ -0,0 +1,216 @@
+"""
+Lectura/escritura de los datasets del pipeline (trainN) en CSV o Parquet.
+
+- CSV: formato histórico; los tipos se pierden en cada lectura (Int64 vuelve a
+  float, CryoSleep/VIP vuelven como object).
+- Parquet (columnar, requiere pyarrow): conserva el esquema (Int64, bool, etc.),
+  permite leer solo las columnas necesarias y ocupa menos.
+
+El formato se decide por la extensión del archivo (.csv / .parquet).
+
+Al cargar se aplica un esquema compacto de tipos (COMPACT_DTYPES): categóricas
+para los textos de baja cardinalidad, enteros pequeños, booleanos nullable y
+uint32 para TotalExpenses. Cada conversión solo se aplica si es exacta
+(valores enteros dentro de rango, booleanos puros...); si no, la columna se deja
+como está. Los gastos por servicio (RoomService...VRDeck) siguen en float64:
+medias, desviaciones y sumas calculadas sobre float32 no coinciden con las de
+float64 aunque cada valor se convierta sin pérdida. Los valores escritos no
+cambian; solo los enteros con nulos (Age, Num) se escriben como 39 en vez de 39.0.
+
+Con enteros pequeños (Group uint16) el quicksort de sort_values puede devolver
+los empates en otro orden que con int64: los scripts que muestran filas
+ordenadas por Group/NumInGroup usan kind='stable'.
+
+Informe de memoria antes/después:
+    python dataset_io.py train.csv train9.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+# Esquema compartido por todas las etapas (las columnas ausentes se ignoran)
+COMPACT_DTYPES: Dict[str, str] = {
+    "HomePlanet": "category",
+    "Destination": "category",
+    "Deck": "category",
+    "Side": "category",
+    "Surname": "category",
+    "CryoSleep": "boolean",
+    "VIP": "boolean",
+    "Transported": "boolean",
+    "Group": "uint16",
+    "NumInGroup": "int8",
+    "GroupSize": "int8",
+    "Num": "uint16",
+    "Age": "uint8",
+    "TotalExpenses": "uint32",
+    "HasExpenses": "int8",
+    "HouseholdId": "uint32",
+    "HouseholdSize": "uint16",
+}
+
+# Por encima de esta proporción de valores únicos una categórica no ahorra memoria
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(
+            "El formato Parquet requiere pyarrow (pip install pyarrow). Use CSV o instale la dependencia."
+        ) from exc
+
+
+def _compact_column(s: pd.Series, dtype: str) -> pd.Series:
+    """
+    Convierte s a dtype solo si la conversión no pierde información.
+    """
+    if dtype == "category":
+        if isinstance(s.dtype, pd.CategoricalDtype) or s.nunique() > MAX_CATEGORY_RATIO * len(s):
+            return s
+        return s.astype("category")
+
+    if dtype == "boolean":
+        if pd.api.types.is_bool_dtype(s.dtype):
+            return s.astype("boolean")
+        if s.dropna().map(lambda v: isinstance(v, (bool, np.bool_))).all():
+            return s.astype("boolean")
+        return s
+
+    if not pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+        return s
+    # Enteros: valores enteros dentro del rango; con NaN se usa la variante nullable (UInt8, Int16...)
+    values = s.to_numpy(dtype="float64", na_value=np.nan)
+    present = values[~np.isnan(values)]
+    info = np.iinfo(dtype)
+    if len(present) and (
+        (present % 1 != 0).any() or present.min() < info.min or present.max() > info.max
+    ):
+        return s
+    if len(present) < len(values):
+        return s.astype("UInt" + dtype[4:] if dtype.startswith("uint") else "Int" + dtype[3:])
+    return s.astype(dtype)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica COMPACT_DTYPES a las columnas presentes de df (sin copiar las demás).
+    """
+    out = df.copy(deep=False)
+    for column, dtype in COMPACT_DTYPES.items():
+        if column in out.columns:
+            out[column] = _compact_column(out[column], dtype)
+    return out
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """
+    Memoria real del DataFrame (incluye el contenido de los strings) en MB.
+    """
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def read_dataset(
+    path: Path | str, columns: Optional[Sequence[str]] = None, compact: bool = True
+) -> pd.DataFrame:
+    """
+    Lee un dataset CSV o Parquet. Si se indica columns, solo se cargan esas columnas
+    (en Parquet la proyección evita leer el resto del archivo). Con compact=True
+    (por defecto) se aplica COMPACT_DTYPES.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        df = pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+    else:
+        df = pd.read_csv(path, usecols=list(columns) if columns is not None else None)
+        if columns is not None:
+            df = df[list(columns)]
+    return compact_dtypes(df) if compact else df
+
+
+def write_dataset(df: pd.DataFrame, path: Path | str) -> Path:
+    """
+    Escribe el dataset en el formato indicado por la extensión de path.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def with_format(filename: str, fmt: str) -> str:
+    """
+    Cambia la extensión de filename según el formato ("csv" o "parquet").
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt} (válidos: {', '.join(FORMATS)})")
+    return str(Path(filename).with_suffix(FORMATS[fmt]))
+
+
+def resolve_stage_file(stem: str, directory: Path | str = ".") -> Path:
+    """
+    Devuelve la ruta del dataset de una etapa (p.ej. "train7") en directory.
+    Si existen trainN.parquet y trainN.csv se usa el más reciente.
+    """
+    directory = Path(directory)
+    candidates = [directory / f"{stem}{ext}" for ext in FORMATS.values()]
+    existing = [p for p in candidates if p.exists()]
+    if not existing:
+        raise FileNotFoundError(f"No existe {stem}.csv ni {stem}.parquet en {directory}")
+    return max(existing, key=lambda p: p.stat().st_mtime)
+
+
+def load_stage(stem: str, columns: Optional[Sequence[str]] = None, directory: Path | str = ".") -> pd.DataFrame:
+    """
+    Carga la salida de una etapa (CSV o Parquet, ver resolve_stage_file).
+    """
+    return read_dataset(resolve_stage_file(stem, directory), columns=columns)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Memoria de los datasets con tipos por defecto vs esquema compacto.")
+    p.add_argument("files", nargs="*", default=["train.csv"], help="Datasets a medir (por defecto: train.csv).")
+    return p.parse_args()
+
+
+def _groupby_seconds(df: pd.DataFrame, repeat: int = 20) -> Optional[float]:
+    key = next((c for c in ("Group", "HomePlanet", "Surname") if c in df.columns), None)
+    if key is None:
+        return None
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        df.groupby(key, observed=True).size()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main() -> None:
+    args = _parse_args()
+    print(f"{'archivo':<28} {'antes (MB)':>11} {'después (MB)':>13} {'ratio':>7} {'groupby antes/después':>24}")
+    for f in args.files:
+        before = read_dataset(f, compact=False)
+        after = compact_dtypes(before)
+        mb_before, mb_after = memory_mb(before), memory_mb(after)
+        t_before, t_after = _groupby_seconds(before), _groupby_seconds(after)
+        timing = f"{t_before * 1e3:.2f} / {t_after * 1e3:.2f} ms" if t_before is not None else "-"
+        print(f"{f:<28} {mb_before:>11.2f} {mb_after:>13.2f} {mb_before / mb_after:>6.1f}x {timing:>24}")
+        changed = {c: str(after[c].dtype) for c in after.columns if after[c].dtype != before[c].dtype}
+        print("  " + ", ".join(f"{c}: {before[c].dtype} → {d}" for c, d in changed.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Agregación previa al dibujo: histogramas 1D/2D y estadísticas de boxplot.
+
+Un scatter de millones de pasajeros (ax.scatter) tarda minutos y genera trazos
+vectoriales enormes; hexbin, hist y boxplot (con sus outliers) también recorren
+o dibujan cada fila. Aquí se agrega primero con NumPy, por bloques de
+chunk_rows filas (memoria temporal acotada), y las figuras de figures.py
+(variantes *_binned) dibujan solo la tabla agregada:
+- Histogram2D: conteos en una rejilla fija (np.bincount sobre el índice de
+  celda) más los momentos centrados de la recta de tendencia (mínimos
+  cuadrados, igual que np.polyfit grado 1). update() acumula un bloque y merge()
+  junta dos rejillas, así que también sirve para manifiestos leídos por bloques.
+  Se dibuja como imagen (imshow), sin un punto por fila.
+- histogram_frame: histograma 1D con los mismos bordes que np.histogram(bins).
+- box_stats_frame: cuartiles y bigotes (1.5·IQR, como matplotlib) por grupo,
+  sin outliers; se dibuja con ax.bxp.
+
+El coste de dibujo depende del número de celdas/bins, no del de filas. Los
+scripts pasan a este modo a partir de BINNED_MIN_ROWS filas (por debajo se
+dibujan las filas, sin cambios).
+
+Uso (imagen de densidad de dos columnas leyendo el CSV por bloques, dos pasadas:
+rango y conteos):
+    python density_grid.py --input train9.csv --x Age --y TotalExpenses --bins 80 100
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+BINNED_MIN_ROWS = 200_000
+
+
+def use_binned(n_rows: int) -> bool:
+    """
+    ¿Dibujar desde tablas agregadas? (a partir de BINNED_MIN_ROWS filas).
+    """
+    return n_rows >= BINNED_MIN_ROWS
+
+
+def as_float(values: pd.Series | np.ndarray) -> np.ndarray:
+    """
+    float64 con NaN para los nulos (acepta UInt8/Int64/boolean de pandas).
+    """
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def iter_chunks(*arrays: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[np.ndarray, ...]]:
+    """
+    Bloques alineados (vistas, sin copia) de chunk_rows filas de cada array.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows debe ser >= 1")
+    n = len(arrays[0])
+    for start in range(0, n, chunk_rows):
+        yield tuple(a[start : start + chunk_rows] for a in arrays)
+
+
+def bin_edges(lo: float, hi: float, bins: int) -> np.ndarray:
+    """
+    bins intervalos iguales en [lo, hi] (lo == hi → [lo - 0.5, hi + 0.5], como np.histogram).
+    """
+    if not np.isfinite(lo) or not np.isfinite(hi):
+        lo, hi = 0.0, 1.0
+    return np.histogram_bin_edges(np.array([lo, hi]), bins=bins)
+
+
+def _min_max(values: np.ndarray) -> Tuple[float, float]:
+    if not len(values):
+        return np.nan, np.nan
+    return float(values.min()), float(values.max())
+
+
+def _moments(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    [n, media x, media y, Σ(x - x̄)², Σ(x - x̄)(y - ȳ)] de un bloque.
+    """
+    if not len(x):
+        return np.zeros(5)
+    mx, my = x.mean(), y.mean()
+    dx = x - mx
+    return np.array([len(x), mx, my, (dx * dx).sum(), (dx * (y - my)).sum()])
+
+
+def _merge_moments(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Momentos de la unión de dos bloques (fórmula de Chan et al., estable en float64).
+    """
+    na, nb = a[0], b[0]
+    if nb == 0:
+        return a
+    if na == 0:
+        return b
+    n = na + nb
+    dx, dy = b[1] - a[1], b[2] - a[2]
+    w = na * nb / n
+    return np.array([n, a[1] + dx * nb / n, a[2] + dy * nb / n, a[3] + b[3] + dx * dx * w, a[4] + b[4] + dx * dy * w])
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Bin de cada valor (-1 fuera de rango o NaN); el borde derecho cierra el último bin.
+    """
+    idx = np.searchsorted(edges, values, side="right") - 1
+    idx[values == edges[-1]] = len(edges) - 2
+    idx[(idx < 0) | (idx >= len(edges) - 1) | np.isnan(values)] = -1
+    return idx
+
+
+class Histogram2D:
+    """
+    Conteos por celda (len(x_edges)-1, len(y_edges)-1) y momentos de la tendencia.
+    """
+
+    def __init__(self, x_edges: np.ndarray, y_edges: np.ndarray) -> None:
+        self.x_edges = np.asarray(x_edges, dtype=np.float64)
+        self.y_edges = np.asarray(y_edges, dtype=np.float64)
+        self.counts = np.zeros((len(self.x_edges) - 1, len(self.y_edges) - 1), dtype=np.int64)
+        # Momentos (ver _moments) de los pares sin nulos, dentro o fuera de la rejilla
+        self.moments = np.zeros(5, dtype=np.float64)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        x: np.ndarray,
+        y: np.ndarray,
+        bins: int | Tuple[int, int] = 100,
+        x_edges: Optional[np.ndarray] = None,
+        y_edges: Optional[np.ndarray] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> "Histogram2D":
+        """
+        Rejilla sobre el rango de los pares sin nulos (o los bordes indicados).
+        """
+        x, y = as_float(x), as_float(y)
+        bx, by = (bins, bins) if isinstance(bins, int) else bins
+        valid = ~(np.isnan(x) | np.isnan(y))
+        if x_edges is None:
+            x_edges = bin_edges(*_min_max(x[valid]), bx)
+        if y_edges is None:
+            y_edges = bin_edges(*_min_max(y[valid]), by)
+        grid = cls(x_edges, y_edges)
+        for xc, yc in iter_chunks(x, y, chunk_rows=chunk_rows):
+            grid.update(xc, yc)
+        return grid
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> "Histogram2D":
+        """
+        Acumula un bloque de pares (los pares con algún nulo se ignoran).
+        """
+        x, y = as_float(x), as_float(y)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        self.moments = _merge_moments(self.moments, _moments(x, y))
+        ix, iy = _bin_index(x, self.x_edges), _bin_index(y, self.y_edges)
+        inside = (ix >= 0) & (iy >= 0)
+        ny = self.counts.shape[1]
+        self.counts += np.bincount(ix[inside] * ny + iy[inside], minlength=self.counts.size).reshape(self.counts.shape)
+        return self
+
+    def merge(self, other: "Histogram2D") -> "Histogram2D":
+        if not (np.array_equal(self.x_edges, other.x_edges) and np.array_equal(self.y_edges, other.y_edges)):
+            raise ValueError("Solo se pueden fusionar rejillas con los mismos bordes.")
+        self.counts += other.counts
+        self.moments = _merge_moments(self.moments, other.moments)
+        return self
+
+    def trend(self) -> Optional[Tuple[float, float]]:
+        """
+        (pendiente, ordenada) de mínimos cuadrados; None si no hay varianza en x.
+        """
+        n, mx, my, m2x, cxy = self.moments
+        if n < 2 or m2x <= 0:
+            return None
+        slope = cxy / m2x
+        return float(slope), float(my - slope * mx)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Una fila por celda (orden x, y): x_lo, x_hi, y_lo, y_hi, count.
+        """
+        nx, ny = self.counts.shape
+        return pd.DataFrame(
+            {
+                "x_lo": np.repeat(self.x_edges[:-1], ny),
+                "x_hi": np.repeat(self.x_edges[1:], ny),
+                "y_lo": np.tile(self.y_edges[:-1], nx),
+                "y_hi": np.tile(self.y_edges[1:], nx),
+                "count": self.counts.ravel(),
+            }
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "Histogram2D":
+        """
+        Inversa de to_frame (sin los momentos de la tendencia).
+        """
+        x_lo = frame["x_lo"].to_numpy()
+        nx = int(np.count_nonzero(np.r_[True, x_lo[1:] != x_lo[:-1]]))
+        ny = len(frame) // nx
+        x_edges = np.r_[x_lo[::ny], frame["x_hi"].to_numpy()[-1]]
+        y_edges = np.r_[frame["y_lo"].to_numpy()[:ny], frame["y_hi"].to_numpy()[ny - 1]]
+        grid = cls(x_edges, y_edges)
+        grid.counts = frame["count"].to_numpy(dtype=np.int64).reshape(nx, ny)
+        return grid
+
+
+def histogram_frame(
+    values: pd.Series | np.ndarray, bins: int = 30, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """
+    Histograma 1D (lo, hi, count) con los bordes de np.histogram(values, bins).
+    """
+    x = as_float(values)
+    x = x[~np.isnan(x)]
+    edges = bin_edges(*_min_max(x), bins)
+    counts = np.zeros(bins, dtype=np.int64)
+    for (chunk,) in iter_chunks(x, chunk_rows=chunk_rows):
+        idx = _bin_index(chunk, edges)
+        counts += np.bincount(idx[idx >= 0], minlength=bins)
+    return pd.DataFrame({"lo": edges[:-1], "hi": edges[1:], "count": counts})
+
+
+def box_stats_frame(
+    values: pd.Series, by: Optional[pd.Series] = None, whis: float = 1.5
+) -> pd.DataFrame:
+    """
+    Una fila por grupo (orden de groupby; una sola fila sin by) con label, n,
+    q1, med, q3, whislo, whishi. Bigotes: valor más extremo dentro de
+    [q1 - whis·IQR, q3 + whis·IQR], como matplotlib.cbook.boxplot_stats.
+    """
+    s = pd.Series(as_float(values), index=values.index)
+    groups = [(values.name, s)] if by is None else [(k, g) for k, g in s.groupby(by, observed=True, sort=True)]
+    rows = []
+    for label, group in groups:
+        x = group.to_numpy()
+        x = x[~np.isnan(x)]
+        if not len(x):
+            continue
+        q1, med, q3 = np.percentile(x, [25, 50, 75])
+        iqr = q3 - q1
+        lo = x[x >= q1 - whis * iqr]
+        hi = x[x <= q3 + whis * iqr]
+        rows.append(
+            {
+                "label": str(label),
+                "n": len(x),
+                "q1": q1,
+                "med": med,
+                "q3": q3,
+                "whislo": lo.min() if len(lo) else q1,
+                "whishi": hi.max() if len(hi) else q3,
+            }
+        )
+    return pd.DataFrame(rows, columns=["label", "n", "q1", "med", "q3", "whislo", "whishi"])
+
+
+def iter_csv_columns(
+    path: Path | str, columns: Sequence[str], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterable[pd.DataFrame]:
+    """
+    Bloques de chunk_rows filas con solo columns (CSV por bloques; Parquet con proyección).
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        from dataset_io import read_dataset
+
+        df = read_dataset(path, columns=columns, compact=False)
+        return (df.iloc[i : i + chunk_rows] for i in range(0, len(df), chunk_rows))
+    return pd.read_csv(path, usecols=list(columns), chunksize=chunk_rows)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Imagen de densidad 2D de dos columnas, leyendo por bloques.")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet de entrada (por defecto: train9.csv).")
+    p.add_argument("--x", default="Age", help="Columna del eje x.")
+    p.add_argument("--y", default="TotalExpenses", help="Columna del eje y.")
+    p.add_argument("--bins", type=int, nargs=2, default=[100, 100], metavar=("BX", "BY"), help="Celdas en x e y.")
+    p.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Filas por bloque.")
+    p.add_argument("--output", default=None, help="PNG de salida (por defecto: plots/density_<x>_vs_<y>.png).")
+    return p.parse_args()
+
+
+def main() -> None:
+    from figures import density_image
+    from plot_cache import PlotJob, render_plots
+
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+    columns = [args.x, args.y]
+
+    # Primera pasada: rango de los pares sin nulos
+    lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+    for chunk in iter_csv_columns(input_path, columns, args.chunk_rows):
+        pairs = np.column_stack([as_float(chunk[c]) for c in columns])
+        pairs = pairs[~np.isnan(pairs).any(axis=1)]
+        if len(pairs):
+            lo, hi = np.minimum(lo, pairs.min(axis=0)), np.maximum(hi, pairs.max(axis=0))
+
+    # Segunda pasada: conteos
+    grid = Histogram2D(bin_edges(lo[0], hi[0], args.bins[0]), bin_edges(lo[1], hi[1], args.bins[1]))
+    for chunk in iter_csv_columns(input_path, columns, args.chunk_rows):
+        grid.update(chunk[args.x], chunk[args.y])
+
+    output = args.output or f"plots/density_{args.x}_vs_{args.y}.png"
+    params = {"xlabel": args.x, "ylabel": args.y, "trend": grid.trend()}
+    job = PlotJob(output, density_image, grid.to_frame(), params, dpi=250)
+    (result,) = render_plots([job])
+
+    print("✓ Imagen de densidad")
+    print(f"  - input:  {input_path} ({int(grid.moments[0])} pares sin nulos, {grid.counts.size} celdas)")
+    print(f"  - output: {output}{'' if result.rendered else ' (sin cambios)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,37 @@
 """
 Análisis Exploratorio de Datos - Spaceship Titanic
 Este script realiza un análisis exploratorio completo del dataset train.csv
+(u otro CSV/Parquet crudo con --input)
 """
 
+import argparse
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
-# Configuración de visualización
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+import figures
+from dataset_io import read_dataset
+from density_grid import box_stats_frame, histogram_frame, use_binned
+from plot_cache import PlotJob, render_plots
+from target_rates import target_rate_table, transported_crosstab
+
+# Configuración de visualización (se aplica en cada figura, ver plot_cache.py)
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+PLOT_PALETTE = "husl"
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', None)
 
 # Cargar datos
+parser = argparse.ArgumentParser(description="Análisis exploratorio de datos - Spaceship Titanic")
+parser.add_argument('--input', default='train.csv', help="CSV/Parquet crudo (por defecto: train.csv).")
+args = parser.parse_args()
+
 print("="*80)
 print("ANÁLISIS EXPLORATORIO DE DATOS - SPACESHIP TITANIC")
 print("="*80)
 
-df = pd.read_csv('train.csv')
+df = read_dataset(args.input)
 
 # ============================================================================
 # 1. INFORMACIÓN BÁSICA DEL DATASET
@@ -46,7 +57,7 @@ print("\nVariables numéricas:")
 print(df.describe())
 
 print("\n\nVariables categóricas:")
-categorical_cols = df.select_dtypes(include=['object', 'bool']).columns
+categorical_cols = df.select_dtypes(include=['object', 'str', 'bool', 'boolean', 'category']).columns
 print(df[categorical_cols].describe())
 
 # ============================================================================
@@ -112,160 +123,89 @@ for col in numeric_features:
 print("\n\n7. GENERANDO VISUALIZACIONES...")
 print("-"*80)
 
-# Crear carpeta para guardar gráficos
+# Cada figura recibe solo las columnas que dibuja: las que no cambiaron desde el
+# último render se saltan y el resto se dibujan en paralelo (plot_cache.py).
+# Con muchas filas, histogramas y boxplots se dibujan desde tablas agregadas
+# (density_grid.py) en lugar de las filas.
+binned = use_binned(len(df))
 Path('plots').mkdir(exist_ok=True)
+expense_cols = ['RoomService', 'FoodCourt', 'ShoppingMall', 'Spa', 'VRDeck']
+df['TotalExpenses'] = df[expense_cols].sum(axis=1)
+numeric_df = df[numeric_features].dropna()
+correlation_matrix = numeric_df.corr()
+
+# Tasas de Transported por HomePlanet, CryoSleep y grupo de edad en una pasada (target_rates.py)
+age_group = pd.cut(df['Age'], bins=[0, 12, 18, 30, 50, 100],
+                   labels=['Niño', 'Adolescente', 'Joven', 'Adulto', 'Mayor'])
+rate_table = target_rate_table(df.assign(AgeGroup=age_group), ['HomePlanet', 'CryoSleep', 'AgeGroup'])
+
+
+def _job(name, render, data, **params):
+    return PlotJob(f'plots/{name}.png', render, data, params, dpi=300, style=PLOT_STYLE, palette=PLOT_PALETTE)
+
+
+plot_jobs = []
 
 # 7.1 Distribución de la variable objetivo
-fig, ax = plt.subplots(figsize=(8, 6))
-df['Transported'].value_counts().plot(kind='bar', ax=ax, color=['#FF6B6B', '#4ECDC4'])
-ax.set_title('Distribución de Pasajeros Transportados', fontsize=14, fontweight='bold')
-ax.set_xlabel('Transportado', fontsize=12)
-ax.set_ylabel('Cantidad', fontsize=12)
-ax.set_xticklabels(['No', 'Sí'], rotation=0)
-plt.tight_layout()
-plt.savefig('plots/01_transported_distribution.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/01_transported_distribution.png")
-plt.close()
+plot_jobs.append(_job('01_transported_distribution', figures.eda_transported_distribution, df[['Transported']]))
 
 # 7.2 Valores nulos por columna
 if not null_df.empty:
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(null_df['Columna'], null_df['Porcentaje (%)'], color='coral')
-    ax.set_xlabel('Porcentaje de Valores Nulos (%)', fontsize=12)
-    ax.set_title('Valores Nulos por Columna', fontsize=14, fontweight='bold')
-    ax.grid(axis='x', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('plots/02_missing_values.png', dpi=300, bbox_inches='tight')
-    print("✓ Guardado: plots/02_missing_values.png")
-    plt.close()
+    plot_jobs.append(_job('02_missing_values', figures.eda_missing_values, null_df))
 
 # 7.3 Distribución de variables categóricas
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-axes = axes.ravel()
-
-for idx, col in enumerate(categorical_features):
-    if col in df.columns:
-        df[col].value_counts().plot(kind='bar', ax=axes[idx], color='steelblue')
-        axes[idx].set_title(f'Distribución de {col}', fontsize=12, fontweight='bold')
-        axes[idx].set_xlabel(col, fontsize=10)
-        axes[idx].set_ylabel('Cantidad', fontsize=10)
-        axes[idx].tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('plots/03_categorical_distributions.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/03_categorical_distributions.png")
-plt.close()
+plot_jobs.append(_job('03_categorical_distributions', figures.eda_categorical_distributions,
+                      df[[c for c in categorical_features if c in df.columns]], columns=categorical_features))
 
 # 7.4 Distribución de edad
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-df['Age'].hist(bins=30, ax=axes[0], color='mediumpurple', edgecolor='black')
-axes[0].set_title('Histograma de Edad', fontsize=12, fontweight='bold')
-axes[0].set_xlabel('Edad', fontsize=10)
-axes[0].set_ylabel('Frecuencia', fontsize=10)
-
-df.boxplot(column='Age', ax=axes[1], patch_artist=True)
-axes[1].set_title('Boxplot de Edad', fontsize=12, fontweight='bold')
-axes[1].set_ylabel('Edad', fontsize=10)
-
-plt.tight_layout()
-plt.savefig('plots/04_age_distribution.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/04_age_distribution.png")
-plt.close()
+if binned:
+    plot_jobs.append(_job('04_age_distribution', figures.eda_age_distribution_binned,
+                          {'hist': histogram_frame(df['Age'], bins=30), 'box': box_stats_frame(df['Age'])}))
+else:
+    plot_jobs.append(_job('04_age_distribution', figures.eda_age_distribution, df[['Age']]))
 
 # 7.5 Distribución de gastos
-expense_cols = ['RoomService', 'FoodCourt', 'ShoppingMall', 'Spa', 'VRDeck']
-fig, axes = plt.subplots(2, 3, figsize=(16, 10))
-axes = axes.ravel()
-
-for idx, col in enumerate(expense_cols):
-    df[col].hist(bins=30, ax=axes[idx], color='teal', edgecolor='black', alpha=0.7)
-    axes[idx].set_title(f'Distribución de {col}', fontsize=11, fontweight='bold')
-    axes[idx].set_xlabel(col, fontsize=9)
-    axes[idx].set_ylabel('Frecuencia', fontsize=9)
-
-# Ocultar el subplot extra
-axes[-1].axis('off')
-
-plt.tight_layout()
-plt.savefig('plots/05_expenses_distribution.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/05_expenses_distribution.png")
-plt.close()
+if binned:
+    plot_jobs.append(_job('05_expenses_distribution', figures.eda_expenses_distribution_binned,
+                          {col: histogram_frame(df[col], bins=30) for col in expense_cols}, columns=expense_cols))
+else:
+    plot_jobs.append(_job('05_expenses_distribution', figures.eda_expenses_distribution, df[expense_cols],
+                          columns=expense_cols))
 
 # 7.6 Matriz de correlación de variables numéricas
-numeric_df = df[numeric_features].dropna()
-correlation_matrix = numeric_df.corr()
-
-fig, ax = plt.subplots(figsize=(10, 8))
-sns.heatmap(correlation_matrix, annot=True, fmt='.2f', cmap='coolwarm',
-            center=0, square=True, linewidths=1, ax=ax, cbar_kws={"shrink": 0.8})
-ax.set_title('Matriz de Correlación - Variables Numéricas', fontsize=14, fontweight='bold')
-plt.tight_layout()
-plt.savefig('plots/06_correlation_matrix.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/06_correlation_matrix.png")
-plt.close()
+plot_jobs.append(_job('06_correlation_matrix', figures.eda_correlation_matrix, correlation_matrix))
 
 # 7.7 Transported vs HomePlanet
 if 'HomePlanet' in df.columns and 'Transported' in df.columns:
-    ct = pd.crosstab(df['HomePlanet'], df['Transported'], normalize='index') * 100
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ct.plot(kind='bar', ax=ax, color=['#FF6B6B', '#4ECDC4'])
-    ax.set_title('Tasa de Transporte por Planeta de Origen', fontsize=14, fontweight='bold')
-    ax.set_xlabel('Planeta de Origen', fontsize=12)
-    ax.set_ylabel('Porcentaje (%)', fontsize=12)
-    ax.legend(['No Transportado', 'Transportado'], loc='best')
-    ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
-    plt.tight_layout()
-    plt.savefig('plots/07_transported_by_homeplanet.png', dpi=300, bbox_inches='tight')
-    print("✓ Guardado: plots/07_transported_by_homeplanet.png")
-    plt.close()
+    plot_jobs.append(_job('07_transported_by_homeplanet', figures.eda_transported_rate,
+                          transported_crosstab(rate_table, 'HomePlanet'),
+                          title='Tasa de Transporte por Planeta de Origen', xlabel='Planeta de Origen',
+                          figsize=(10, 6)))
 
 # 7.8 Transported vs CryoSleep
 if 'CryoSleep' in df.columns and 'Transported' in df.columns:
-    ct = pd.crosstab(df['CryoSleep'], df['Transported'], normalize='index') * 100
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ct.plot(kind='bar', ax=ax, color=['#FF6B6B', '#4ECDC4'])
-    ax.set_title('Tasa de Transporte por Estado de CryoSleep', fontsize=14, fontweight='bold')
-    ax.set_xlabel('CryoSleep', fontsize=12)
-    ax.set_ylabel('Porcentaje (%)', fontsize=12)
-    ax.legend(['No Transportado', 'Transportado'], loc='best')
-    ax.set_xticklabels(['No', 'Sí'], rotation=0)
-    plt.tight_layout()
-    plt.savefig('plots/08_transported_by_cryosleep.png', dpi=300, bbox_inches='tight')
-    print("✓ Guardado: plots/08_transported_by_cryosleep.png")
-    plt.close()
+    plot_jobs.append(_job('08_transported_by_cryosleep', figures.eda_transported_rate,
+                          transported_crosstab(rate_table, 'CryoSleep'),
+                          title='Tasa de Transporte por Estado de CryoSleep', xlabel='CryoSleep',
+                          figsize=(8, 6), xticklabels=['No', 'Sí'], rotation=0))
 
 # 7.9 Edad por estado de transporte
-fig, ax = plt.subplots(figsize=(10, 6))
-df.boxplot(column='Age', by='Transported', ax=ax, patch_artist=True)
-ax.set_title('Distribución de Edad por Estado de Transporte', fontsize=14, fontweight='bold')
-ax.set_xlabel('Transportado', fontsize=12)
-ax.set_ylabel('Edad', fontsize=12)
-plt.suptitle('')
-plt.tight_layout()
-plt.savefig('plots/09_age_by_transported.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/09_age_by_transported.png")
-plt.close()
+if binned:
+    plot_jobs.append(_job('09_age_by_transported', figures.eda_age_by_transported_binned,
+                          box_stats_frame(df['Age'], by=df['Transported'])))
+else:
+    plot_jobs.append(_job('09_age_by_transported', figures.eda_age_by_transported, df[['Age', 'Transported']]))
 
 # 7.10 Gastos totales
-df['TotalExpenses'] = df[expense_cols].sum(axis=1)
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-df['TotalExpenses'].hist(bins=50, ax=axes[0], color='darkgreen', edgecolor='black', alpha=0.7)
-axes[0].set_title('Distribución de Gastos Totales', fontsize=12, fontweight='bold')
-axes[0].set_xlabel('Gastos Totales', fontsize=10)
-axes[0].set_ylabel('Frecuencia', fontsize=10)
-
-df.boxplot(column='TotalExpenses', by='Transported', ax=axes[1], patch_artist=True)
-axes[1].set_title('Gastos Totales por Estado de Transporte', fontsize=12, fontweight='bold')
-axes[1].set_xlabel('Transportado', fontsize=10)
-axes[1].set_ylabel('Gastos Totales', fontsize=10)
-plt.suptitle('')
+if binned:
+    plot_jobs.append(_job('10_total_expenses', figures.eda_total_expenses_binned,
+                          {'hist': histogram_frame(df['TotalExpenses'], bins=50),
+                           'box': box_stats_frame(df['TotalExpenses'], by=df['Transported'])}))
+else:
+    plot_jobs.append(_job('10_total_expenses', figures.eda_total_expenses, df[['TotalExpenses', 'Transported']]))
 
-plt.tight_layout()
-plt.savefig('plots/10_total_expenses.png', dpi=300, bbox_inches='tight')
-print("✓ Guardado: plots/10_total_expenses.png")
-plt.close()
+for result in render_plots(plot_jobs):
+    print(f"✓ {'Guardado' if result.rendered else 'Sin cambios'}: {result.output}")
 
 # ============================================================================
 # 8. INSIGHTS ADICIONALES
@@ -284,9 +224,8 @@ print("\nGasto promedio por planeta de origen:")
 print(df.groupby('HomePlanet')['TotalExpenses'].mean().sort_values(ascending=False))
 
 print("\nTasa de transporte por edad (grupos):")
-df['AgeGroup'] = pd.cut(df['Age'], bins=[0, 12, 18, 30, 50, 100],
-                        labels=['Niño', 'Adolescente', 'Joven', 'Adulto', 'Mayor'])
-age_transport = df.groupby('AgeGroup')['Transported'].value_counts(normalize=True).unstack() * 100
+df['AgeGroup'] = age_group
+age_transport = transported_crosstab(rate_table, 'AgeGroup')
 print(age_transport)
 
 print("\n" + "="*80)
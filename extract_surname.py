@@ -6,23 +6,19 @@ Genera train8.csv a partir de train7.csv
 
 import pandas as pd
 
-# Cargar datos
-print("Cargando train7.csv...")
-df = pd.read_csv('train7.csv')
+from dataset_io import read_dataset
 
-print(f"\nDimensiones: {df.shape}")
-print(f"\nColumnas actuales: {list(df.columns)}")
 
-# Mostrar ejemplos de Name antes de la transformación
-print(f"\n{'='*60}")
-print("EJEMPLOS DE NOMBRES ANTES DE LA TRANSFORMACIÓN")
-print(f"{'='*60}")
-print(df['Name'].head(20))
+# Espacios que corta str.split() (str.isspace): \s de RE2/pyarrow solo cubre ASCII
+_WS = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+_SURNAME_RE = f"(?s)^[{_WS}]*(?:[^{_WS}]+[{_WS}]+)?([^{_WS}]+).*$"
+_BLANK_RE = f"(?s)[{_WS}]*"
 
-# Extraer apellido (segunda palabra)
-print("\nExtrayendo apellidos...")
+# Casos límite que extract_surnames debe resolver igual que extract_surname
+_EDGE_NAMES = ["Ana Lopez", "Ana", " Ana  Maria Lopez ", "", "   ", "\xa0Ana\xa0Lopez", "Ana\u3000Lopez", "Ana\tLopez\n", None]
 
-# Función para extraer el apellido
+
+# Función para extraer el apellido (un registro; ver extract_surnames para columnas)
 def extract_surname(name):
     if pd.isna(name):
         return None
@@ -34,112 +30,184 @@ def extract_surname(name):
     else:
         return None
 
-df['Surname'] = df['Name'].apply(extract_surname)
-
-# Eliminar columna Name original
-df_new = df.drop(columns=['Name'])
-
-# Reordenar columnas para poner Surname donde estaba Name
-cols = df_new.columns.tolist()
-
-# Remover Surname del final
-cols.remove('Surname')
-
-# Insertar en posición 11 (donde estaba Name)
-# Posiciones: 0-Group, 1-NumInGroup, 2-GroupSize, 3-HomePlanet, 4-CryoSleep,
-#            5-Deck, 6-Num, 7-Side, 8-Destination, 9-Age, 10-VIP, 11-Surname
-cols.insert(11, 'Surname')
-
-df_new = df_new[cols]
-
-print(f"\nDimensiones nuevas: {df_new.shape}")
-
-# Estadísticas de la columna Surname
-print(f"\n{'='*60}")
-print("ESTADÍSTICAS DE LA COLUMNA SURNAME")
-print(f"{'='*60}")
-
-print(f"\nTipo: {df_new['Surname'].dtype}")
-print(f"Valores únicos: {df_new['Surname'].nunique()}")
-print(f"Valores nulos: {df_new['Surname'].isnull().sum()}")
-
-# Apellidos más frecuentes
-print(f"\nApellidos más frecuentes:")
-surname_counts = df_new['Surname'].value_counts().head(20)
-for surname, count in surname_counts.items():
-    print(f"  {surname:20s}: {count:3d} pasajeros")
-
-# Mostrar ejemplos de transformación
-print(f"\n{'='*60}")
-print("EJEMPLOS DE TRANSFORMACIÓN")
-print(f"{'='*60}")
-
-# Crear tabla comparativa
-comparison = pd.DataFrame({
-    'Name_Original': df['Name'].head(20),
-    'Surname_Nuevo': df_new['Surname'].head(20)
-})
-print(comparison.to_string(index=False))
-
-# Verificar casos especiales
-print(f"\n{'='*60}")
-print("VERIFICACIÓN DE CASOS ESPECIALES")
-print(f"{'='*60}")
-
-# Nombres con una sola palabra
-single_word_names = df[df['Name'].notna() & (df['Name'].str.split().str.len() == 1)]
-if len(single_word_names) > 0:
-    print(f"\nNombres con una sola palabra: {len(single_word_names)}")
-    print(single_word_names[['Name']].head())
-else:
-    print("\nNo hay nombres con una sola palabra")
-
-# Nombres con más de dos palabras
-multi_word_names = df[df['Name'].notna() & (df['Name'].str.split().str.len() > 2)]
-if len(multi_word_names) > 0:
-    print(f"\nNombres con más de dos palabras: {len(multi_word_names)}")
-    print("Primeros 5:")
-    for idx, row in multi_word_names.head().iterrows():
-        original = row['Name']
-        surname = df_new.loc[idx, 'Surname']
-        print(f"  '{original}' → '{surname}'")
-else:
-    print("\nNo hay nombres con más de dos palabras")
-
-# Mostrar primeras filas completas
-print(f"\n{'='*60}")
-print("PRIMERAS 10 FILAS DEL NUEVO DATASET")
-print(f"{'='*60}")
-print(df_new[['Group', 'NumInGroup', 'GroupSize', 'HomePlanet', 'Age', 'Surname']].head(10))
-
-# Analizar familias (mismo apellido)
-print(f"\n{'='*60}")
-print("ANÁLISIS DE FAMILIAS (MISMO APELLIDO)")
-print(f"{'='*60}")
-
-surname_groups = df_new.groupby('Surname').size().sort_values(ascending=False)
-families = surname_groups[surname_groups > 1]
-print(f"\nApellidos compartidos por múltiples pasajeros: {len(families)}")
-print(f"\nFamilias más grandes (top 10):")
-for surname, count in families.head(10).items():
-    print(f"  {surname:20s}: {count:3d} pasajeros")
-
-# Mostrar tipos de datos
-print(f"\n{'='*60}")
-print("TIPOS DE DATOS DE TODAS LAS COLUMNAS")
-print(f"{'='*60}")
-for i, col in enumerate(df_new.columns, 1):
-    dtype = df_new[col].dtype
-    marker = " ← MODIFICADA" if col == 'Surname' else ""
-    print(f"  {i:2d}. {col:15s} → {dtype}{marker}")
-
-# Guardar nuevo CSV
-output_file = 'train8.csv'
-df_new.to_csv(output_file, index=False)
-
-print(f"\n{'='*60}")
-print(f"✓ Archivo guardado exitosamente: {output_file}")
-print(f"{'='*60}")
-print(f"\nColumna 'Name' transformada en 'Surname'")
-print(f"Se extrajo la segunda palabra de cada nombre")
-print(f"Dimensiones: {df_new.shape[0]} filas × {df_new.shape[1]} columnas")
+
+def extract_surnames(names: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de extract_surname: segunda palabra, o la única palabra si
+    el nombre tiene una sola; nulo si el nombre es nulo, vacío o solo espacios.
+    """
+    if names.isna().all():
+        return pd.Series(None, index=names.index, dtype=object)
+    if names.dtype == object:
+        # Con pyarrow las expresiones regulares se evalúan en bloque (sin bucle Python)
+        try:
+            names = names.astype("string[pyarrow]")
+        except ImportError:
+            pass
+    # Mismo corte que str.split(): cualquier espacio; se queda con la 2ª palabra o la única
+    surnames = names.str.replace(_SURNAME_RE, r"\1", regex=True)
+    # Sin ninguna palabra la expresión no coincide y el valor queda como estaba
+    return surnames.mask(surnames.str.fullmatch(_BLANK_RE) == True)  # noqa: E712
+
+
+def check_extract_surnames(names: pd.Series) -> pd.DataFrame:
+    """
+    Compara extract_surnames con extract_surname fila a fila sobre names más los
+    casos límite (_EDGE_NAMES). Devuelve los nombres en los que difieren.
+    """
+    names = pd.concat([names.astype(object), pd.Series(_EDGE_NAMES, dtype=object)], ignore_index=True)
+    expected = [extract_surname(name) for name in names]
+    got = [None if pd.isna(s) else s for s in extract_surnames(names)]
+    differ = [i for i, (a, b) in enumerate(zip(got, expected)) if a != b]
+    return pd.DataFrame({
+        'Name': names.take(differ),
+        'extract_surnames': [got[i] for i in differ],
+        'extract_surname': [expected[i] for i in differ],
+    })
+
+
+def transform(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reemplaza Name por Surname (segunda palabra) en la posición donde estaba Name.
+    """
+    df = df.copy()
+    df['Surname'] = extract_surnames(df['Name'])
+
+    # Eliminar columna Name original
+    df_new = df.drop(columns=['Name'])
+
+    # Reordenar columnas para poner Surname donde estaba Name
+    cols = df_new.columns.tolist()
+
+    # Remover Surname del final
+    cols.remove('Surname')
+
+    # Insertar en posición 11 (donde estaba Name)
+    # Posiciones: 0-Group, 1-NumInGroup, 2-GroupSize, 3-HomePlanet, 4-CryoSleep,
+    #            5-Deck, 6-Num, 7-Side, 8-Destination, 9-Age, 10-VIP, 11-Surname
+    cols.insert(11, 'Surname')
+
+    return df_new[cols]
+
+
+def main() -> None:
+    # Cargar datos
+    print("Cargando train7.csv...")
+    df = read_dataset('train7.csv')
+
+    print(f"\nDimensiones: {df.shape}")
+    print(f"\nColumnas actuales: {list(df.columns)}")
+
+    # Mostrar ejemplos de Name antes de la transformación
+    print(f"\n{'='*60}")
+    print("EJEMPLOS DE NOMBRES ANTES DE LA TRANSFORMACIÓN")
+    print(f"{'='*60}")
+    print(df['Name'].head(20))
+
+    # Extraer apellido (segunda palabra)
+    print("\nExtrayendo apellidos...")
+    df_new = transform(df)
+
+    print(f"\nDimensiones nuevas: {df_new.shape}")
+
+    # Estadísticas de la columna Surname
+    print(f"\n{'='*60}")
+    print("ESTADÍSTICAS DE LA COLUMNA SURNAME")
+    print(f"{'='*60}")
+
+    print(f"\nTipo: {df_new['Surname'].dtype}")
+    print(f"Valores únicos: {df_new['Surname'].nunique()}")
+    print(f"Valores nulos: {df_new['Surname'].isnull().sum()}")
+
+    # Apellidos más frecuentes
+    print(f"\nApellidos más frecuentes:")
+    surname_counts = df_new['Surname'].value_counts().head(20)
+    for surname, count in surname_counts.items():
+        print(f"  {surname:20s}: {count:3d} pasajeros")
+
+    # Mostrar ejemplos de transformación
+    print(f"\n{'='*60}")
+    print("EJEMPLOS DE TRANSFORMACIÓN")
+    print(f"{'='*60}")
+
+    # Crear tabla comparativa
+    comparison = pd.DataFrame({
+        'Name_Original': df['Name'].head(20),
+        'Surname_Nuevo': df_new['Surname'].head(20)
+    })
+    print(comparison.to_string(index=False))
+
+    # Verificar casos especiales
+    print(f"\n{'='*60}")
+    print("VERIFICACIÓN DE CASOS ESPECIALES")
+    print(f"{'='*60}")
+
+    # Nombres con una sola palabra
+    single_word_names = df[df['Name'].notna() & (df['Name'].str.split().str.len() == 1)]
+    if len(single_word_names) > 0:
+        print(f"\nNombres con una sola palabra: {len(single_word_names)}")
+        print(single_word_names[['Name']].head())
+    else:
+        print("\nNo hay nombres con una sola palabra")
+
+    # Nombres con más de dos palabras
+    multi_word_names = df[df['Name'].notna() & (df['Name'].str.split().str.len() > 2)]
+    if len(multi_word_names) > 0:
+        print(f"\nNombres con más de dos palabras: {len(multi_word_names)}")
+        print("Primeros 5:")
+        for idx, row in multi_word_names.head().iterrows():
+            original = row['Name']
+            surname = df_new.loc[idx, 'Surname']
+            print(f"  '{original}' → '{surname}'")
+    else:
+        print("\nNo hay nombres con más de dos palabras")
+
+    # Equivalencia de la versión vectorizada con la de un registro (incluye espacios Unicode)
+    mismatches = check_extract_surnames(df['Name'])
+    if len(mismatches) > 0:
+        print(f"\n✗ extract_surnames difiere de extract_surname en {len(mismatches)} nombres:")
+        print(mismatches.head().to_string(index=False))
+    else:
+        print(f"\n✓ extract_surnames coincide con extract_surname ({len(df)} nombres + {len(_EDGE_NAMES)} casos límite)")
+
+    # Mostrar primeras filas completas
+    print(f"\n{'='*60}")
+    print("PRIMERAS 10 FILAS DEL NUEVO DATASET")
+    print(f"{'='*60}")
+    print(df_new[['Group', 'NumInGroup', 'GroupSize', 'HomePlanet', 'Age', 'Surname']].head(10))
+
+    # Analizar familias (mismo apellido)
+    print(f"\n{'='*60}")
+    print("ANÁLISIS DE FAMILIAS (MISMO APELLIDO)")
+    print(f"{'='*60}")
+
+    surname_groups = df_new.groupby('Surname').size().sort_values(ascending=False)
+    families = surname_groups[surname_groups > 1]
+    print(f"\nApellidos compartidos por múltiples pasajeros: {len(families)}")
+    print(f"\nFamilias más grandes (top 10):")
+    for surname, count in families.head(10).items():
+        print(f"  {surname:20s}: {count:3d} pasajeros")
+
+    # Mostrar tipos de datos
+    print(f"\n{'='*60}")
+    print("TIPOS DE DATOS DE TODAS LAS COLUMNAS")
+    print(f"{'='*60}")
+    for i, col in enumerate(df_new.columns, 1):
+        dtype = df_new[col].dtype
+        marker = " ← MODIFICADA" if col == 'Surname' else ""
+        print(f"  {i:2d}. {col:15s} → {dtype}{marker}")
+
+    # Guardar nuevo CSV
+    output_file = 'train8.csv'
+    df_new.to_csv(output_file, index=False)
+
+    print(f"\n{'='*60}")
+    print(f"✓ Archivo guardado exitosamente: {output_file}")
+    print(f"{'='*60}")
+    print(f"\nColumna 'Name' transformada en 'Surname'")
+    print(f"Se extrajo la segunda palabra de cada nombre")
+    print(f"Dimensiones: {df_new.shape[0]} filas × {df_new.shape[1]} columnas")
+
+
+if __name__ == "__main__":
+    main()
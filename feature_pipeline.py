@@ -0,0 +1,234 @@
+"""
+Pipeline de features fit/transform - Spaceship Titanic
+
+Objetivo:
+- Aplicar las mismas features de train10 (+ AgeCluster) a test.csv y a nuevos
+  pasajeros sin recalcular sobre todo el conjunto de entrenamiento.
+- Las etapas sin estado (create_expenses_features ... add_group_to_surname) se
+  aplican tal cual sobre el lote nuevo.
+- Las features que dependen del entrenamiento se ajustan una vez (fit) y se
+  guardan como estado serializable:
+    - SpendingPercentil: array ordenado de TotalExpenses (HasExpenses = 1) de
+      entrenamiento; cada valor nuevo se ubica con searchsorted.
+    - AgeCluster / AgeClusterLabel: centros del clustering de cluster_age_groups.py
+      ordenados, fronteras en los puntos medios, mediana de imputación y
+      etiquetas; cada edad se asigna con searchsorted sobre las fronteras.
+
+El modelo se guarda en un .npz (solo arrays, sin pickle) que carga en milisegundos.
+Sobre los datos de entrenamiento, transform reproduce SpendingPercentil de
+create_spending_percentil.py.
+
+Uso:
+    python feature_pipeline.py fit --input train.csv --model feature_model.npz --output train_features.csv
+    python feature_pipeline.py transform --input test.csv --model feature_model.npz --output test_features.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from age_clustering import AgeClusterModel
+from create_spending_percentil import spending_percentil
+from dataset_io import read_dataset, write_dataset
+from run_pipeline import STAGES, stage_transform
+
+
+class SpendingPercentilTransformer:
+    """
+    SpendingPercentil ajustado sobre la distribución de gasto de entrenamiento.
+    """
+
+    def __init__(self, reference: Optional[np.ndarray] = None) -> None:
+        self.reference_ = reference
+
+    def fit(self, df: pd.DataFrame) -> "SpendingPercentilTransformer":
+        mask = df["HasExpenses"] == 1
+        self.reference_ = np.sort(df.loc[mask, "TotalExpenses"].to_numpy(dtype=float))
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.reference_ is None:
+            raise RuntimeError("SpendingPercentilTransformer no está ajustado (llame a fit o load).")
+        df = df.copy()
+        df["SpendingPercentil"] = 0.0
+        mask = (df["HasExpenses"] == 1).to_numpy()
+        if mask.any() and len(self.reference_) > 0:
+            values = df.loc[mask, "TotalExpenses"].to_numpy(dtype=float)
+            df.loc[mask, "SpendingPercentil"] = spending_percentil(values, self.reference_)
+        return df
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {"reference": self.reference_}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "SpendingPercentilTransformer":
+        return cls(reference=np.asarray(state["reference"], dtype=float))
+
+
+class AgeClusterTransformer:
+    """
+    AgeCluster/AgeClusterLabel ajustados con la lógica de cluster_age_groups.py
+    (el modelo es age_clustering.AgeClusterModel).
+    """
+
+    def __init__(self, k: Optional[int] = None, max_k: int = 10, random_state: int = 42) -> None:
+        self.k = k
+        self.max_k = max_k
+        self.random_state = random_state
+        self.model_: Optional[AgeClusterModel] = None
+
+    def fit(self, df: pd.DataFrame) -> "AgeClusterTransformer":
+        from cluster_age_groups import _prepare_age, fit_age_model
+
+        age_raw, age_imputed = _prepare_age(df)
+        self.model_, _, _, _ = fit_age_model(
+            age_raw, age_imputed, k=self.k, max_k=self.max_k, random_state=self.random_state
+        )
+        self.k = self.model_.k
+        return self
+
+    @property
+    def median_(self) -> Optional[float]:
+        return None if self.model_ is None else self.model_.median
+
+    @property
+    def centers_(self) -> Optional[np.ndarray]:
+        return None if self.model_ is None else self.model_.centers
+
+    @property
+    def boundaries_(self) -> Optional[np.ndarray]:
+        return None if self.model_ is None else self.model_.boundaries
+
+    @property
+    def labels_(self) -> Optional[np.ndarray]:
+        return None if self.model_ is None else self.model_.labels
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.model_ is None:
+            raise RuntimeError("AgeClusterTransformer no está ajustado (llame a fit o load).")
+        return self.model_.transform(df)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return self.model_.get_state()
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "AgeClusterTransformer":
+        obj = cls(k=int(state["k"]))
+        obj.model_ = AgeClusterModel.from_state(state)
+        return obj
+
+
+class FeaturePipeline:
+    """
+    Etapas sin estado (STAGES de run_pipeline salvo la última) + transformadores ajustados.
+    """
+
+    def __init__(self, age_k: Optional[int] = None, max_k: int = 10, random_state: int = 42) -> None:
+        self.spending = SpendingPercentilTransformer()
+        self.age = AgeClusterTransformer(k=age_k, max_k=max_k, random_state=random_state)
+
+    @staticmethod
+    def stateless(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica las etapas que no dependen del entrenamiento (train.csv → train9).
+        """
+        for stage, _ in STAGES[:-1]:
+            df = stage_transform(stage)(df)
+        return df
+
+    def fit(self, df_raw: pd.DataFrame) -> "FeaturePipeline":
+        df = self.stateless(df_raw)
+        self.spending.fit(df)
+        self.age.fit(df)
+        return self
+
+    def transform(self, df_raw: pd.DataFrame) -> pd.DataFrame:
+        df = self.stateless(df_raw)
+        df = self.spending.transform(df)
+        return self.age.transform(df)
+
+    def save(self, path: Path | str) -> None:
+        arrays = {}
+        for prefix, transformer in (("spending", self.spending), ("age", self.age)):
+            for name, value in transformer.get_state().items():
+                arrays[f"{prefix}__{name}"] = value
+        arrays["meta"] = np.array(json.dumps({"stages": [s for s, _ in STAGES[:-1]]}))
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "FeaturePipeline":
+        with np.load(path, allow_pickle=False) as data:
+            state = {key: data[key] for key in data.files}
+        meta = json.loads(str(state.pop("meta")))
+        expected = [s for s, _ in STAGES[:-1]]
+        if meta.get("stages") != expected:
+            raise ValueError(f"El modelo {path} se ajustó con otras etapas: {meta.get('stages')}")
+
+        def _prefixed(prefix: str) -> Dict[str, np.ndarray]:
+            return {k.split("__", 1)[1]: v for k, v in state.items() if k.startswith(prefix + "__")}
+
+        obj = cls()
+        obj.spending = SpendingPercentilTransformer.from_state(_prefixed("spending"))
+        obj.age = AgeClusterTransformer.from_state(_prefixed("age"))
+        return obj
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Pipeline de features fit/transform (train → test).")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    fit = sub.add_parser("fit", help="Ajusta el pipeline sobre el CSV de entrenamiento y guarda el modelo.")
+    fit.add_argument("--input", default="train.csv", help="CSV/Parquet crudo de entrenamiento (por defecto: train.csv).")
+    fit.add_argument("--model", default="feature_model.npz", help="Ruta del modelo ajustado (.npz).")
+    fit.add_argument("--output", default=None, help="Opcional: escribe también las features de entrenamiento.")
+    fit.add_argument("--k", type=int, default=None, help="Fuerza k de AgeCluster (si se omite, por silhouette).")
+    fit.add_argument("--max-k", type=int, default=10, help="Máximo k evaluado para AgeCluster.")
+    fit.add_argument("--random-state", type=int, default=42, help="Semilla de KMeans.")
+
+    tr = sub.add_parser("transform", help="Aplica un modelo ajustado a un CSV nuevo (p.ej. test.csv).")
+    tr.add_argument("--input", default="test.csv", help="CSV/Parquet crudo a transformar (por defecto: test.csv).")
+    tr.add_argument("--model", default="feature_model.npz", help="Ruta del modelo ajustado (.npz).")
+    tr.add_argument("--output", default="test_features.csv", help="Salida con las features (CSV o Parquet).")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+    df_raw = read_dataset(input_path)
+
+    if args.command == "fit":
+        if args.k is not None and args.k < 2:
+            raise ValueError("--k debe ser >= 2")
+        pipeline = FeaturePipeline(age_k=args.k, max_k=args.max_k, random_state=args.random_state).fit(df_raw)
+        pipeline.save(args.model)
+        print("✓ Pipeline ajustado")
+        print(f"  - input:  {input_path} ({len(df_raw)} filas)")
+        print(f"  - model:  {args.model}")
+        print(f"  - AgeCluster k: {pipeline.age.k} ({', '.join(pipeline.age.labels_)})")
+        if args.output:
+            write_dataset(pipeline.transform(df_raw), args.output)
+            print(f"  - output: {args.output}")
+        return
+
+    pipeline = FeaturePipeline.load(args.model)
+    df_out = pipeline.transform(df_raw)
+    write_dataset(df_out, args.output)
+    print("✓ Features generadas")
+    print(f"  - input:  {input_path} ({len(df_raw)} filas)")
+    print(f"  - model:  {args.model}")
+    print(f"  - output: {args.output} ({df_out.shape[0]} filas × {df_out.shape[1]} columnas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Servicio de features de baja latencia para un pasajero (o un micro-lote).
+
+Índices precalculados (una vez, al arrancar):
+- conteo de pasajeros por Group y claves (Group, NumInGroup) conocidas
+- conteo por Surname_Group (índice de apellidos)
+- array ordenado de TotalExpenses de entrenamiento (SpendingPercentil)
+- fronteras y etiquetas de AgeCluster, mediana de imputación
+Los dos últimos salen del modelo de feature_pipeline.py (.npz); los conteos de
+las salidas de etapa (train9/train10, test_features, ...).
+
+Por registro devuelve: Group, NumInGroup, GroupSize, Surname_Group,
+SurnameGroupSize, Deck, Num, Side, TotalExpenses, HasExpenses,
+SpendingPercentil, AgeImputed, AgeCluster, AgeClusterLabel.
+El camino de un registro es Python puro (dict + bisect) salvo el percentil; el de
+un micro-lote usa searchsorted de NumPy. Ambos calculan SpendingPercentil con
+create_spending_percentil.spending_percentil, como el pipeline.
+GroupSize/SurnameGroupSize cuentan al propio pasajero si no estaba ya en los
+datos indexados.
+
+Front end HTTP (asyncio, solo local):
+    POST /features   cuerpo JSON: un objeto (un pasajero) o una lista (micro-lote)
+    GET  /health
+
+Uso:
+    python feature_service.py serve --model feature_model.npz --data train10.csv test_features.csv
+    python feature_service.py benchmark --model feature_model.npz --data train10.csv --input test.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from create_expenses_features import expense_cols
+from create_spending_percentil import spending_percentil
+from dataset_io import read_dataset
+from extract_surname import extract_surname
+from feature_pipeline import FeaturePipeline
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    return float(value)
+
+
+def _parse_passenger_id(passenger_id: Any) -> Tuple[int, int]:
+    group, _, num_in_group = str(passenger_id).partition("_")
+    return int(group), int(num_in_group)
+
+
+def _split_cabin(cabin: Any) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    if not isinstance(cabin, str) or not cabin:
+        return None, None, None
+    parts = cabin.split("/")
+    deck = parts[0]
+    num = int(float(parts[1])) if len(parts) > 1 and parts[1] != "" else None
+    side = parts[2] if len(parts) > 2 else None
+    return deck, num, side
+
+
+class FeatureIndex:
+    """
+    Índices en memoria para featurizar pasajeros sin ejecutar la cadena de scripts.
+    """
+
+    def __init__(
+        self,
+        spend_reference: Sequence[float],
+        age_boundaries: Sequence[float],
+        age_labels: Sequence[str],
+        age_median: float,
+        group_counts: Dict[int, int],
+        known_members: set,  # pares (Group, NumInGroup)
+        surname_group_counts: Dict[str, int],
+    ) -> None:
+        self.spend_reference = np.asarray(spend_reference, dtype=float)
+        self.age_boundaries = np.asarray(age_boundaries, dtype=float)
+        self.age_labels = np.asarray(age_labels).astype(str)
+        self.age_median = float(age_median)
+        self.group_counts = group_counts
+        self.known_members = known_members
+        self.surname_group_counts = surname_group_counts
+        # Copias como listas: bisect sobre list es más rápido que NumPy para un escalar
+        self._boundaries_list = self.age_boundaries.tolist()
+        self._labels_list = self.age_labels.tolist()
+
+    @classmethod
+    def build(cls, model_path: Path | str, data_paths: Iterable[Path | str]) -> "FeatureIndex":
+        """
+        Construye los índices a partir del modelo ajustado y de salidas de etapa
+        con Group/NumInGroup/Surname (Surname en formato Surname_Group).
+        """
+        pipeline = FeaturePipeline.load(model_path)
+        group_counts: Counter = Counter()
+        surname_group_counts: Counter = Counter()
+        known_members: set = set()
+        for path in data_paths:
+            df = read_dataset(path, columns=["Group", "NumInGroup", "Surname"])
+            groups = df["Group"].to_numpy(dtype=np.int64)
+            # Clave (Group, NumInGroup): sin empaquetar en un entero, no colisiona con ningún NumInGroup
+            members = list(zip(groups.tolist(), df["NumInGroup"].to_numpy(dtype=np.int64).tolist()))
+            # Un pasajero presente en varios archivos se cuenta una sola vez
+            new = np.array([m not in known_members for m in members], dtype=bool)
+            group_counts.update(groups[new].tolist())
+            surnames = df["Surname"].to_numpy(dtype=object)[new]
+            surname_group_counts.update(s for s in surnames.tolist() if isinstance(s, str))
+            known_members.update(members)
+        return cls(
+            spend_reference=pipeline.spending.reference_,
+            age_boundaries=pipeline.age.boundaries_,
+            age_labels=pipeline.age.labels_,
+            age_median=pipeline.age.median_,
+            group_counts=dict(group_counts),
+            known_members=known_members,
+            surname_group_counts=dict(surname_group_counts),
+        )
+
+    def _lookup(self, record: Dict[str, Any], group: int, num_in_group: int) -> Dict[str, Any]:
+        """
+        Campos que salen de los índices de grupo/apellido y del texto del registro.
+        """
+        is_new = int((group, num_in_group) not in self.known_members)
+        surname = extract_surname(record.get("Name"))
+        surname_group = None if surname is None else f"{surname}_{group}"
+        deck, num, side = _split_cabin(record.get("Cabin"))
+        return {
+            "Group": group,
+            "NumInGroup": num_in_group,
+            "GroupSize": self.group_counts.get(group, 0) + is_new,
+            "Surname_Group": surname_group,
+            "SurnameGroupSize": (self.surname_group_counts.get(surname_group, 0) + is_new) if surname_group else 0,
+            "Deck": deck,
+            "Num": num,
+            "Side": side,
+        }
+
+    def featurize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Features de un pasajero (registro crudo con las columnas de train.csv/test.csv).
+        """
+        group, num_in_group = _parse_passenger_id(record["PassengerId"])
+        out = self._lookup(record, group, num_in_group)
+
+        spends = [_to_float(record.get(c)) for c in expense_cols]
+        total = int(sum(v for v in spends if not math.isnan(v)))
+        has_expenses = 1 if total > 0 else 0
+        percentil = 0.0
+        if has_expenses and len(self.spend_reference):
+            percentil = float(spending_percentil(total, self.spend_reference))
+
+        age = _to_float(record.get("Age"))
+        age_imputed = self.age_median if math.isnan(age) else float(int(age))
+        age_cluster = bisect_left(self._boundaries_list, age_imputed)
+
+        out.update(
+            TotalExpenses=total,
+            HasExpenses=has_expenses,
+            SpendingPercentil=percentil,
+            AgeImputed=age_imputed,
+            AgeCluster=age_cluster,
+            AgeClusterLabel=self._labels_list[age_cluster],
+        )
+        return out
+
+    def featurize_batch(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Micro-lote: gasto, percentil y clúster de edad se calculan vectorizados.
+        """
+        if not records:
+            return []
+
+        # Una columna por gasto: np.array(..., dtype=float) convierte None en NaN
+        spends = np.column_stack([np.array([r.get(c) for r in records], dtype=float) for c in expense_cols])
+        totals = np.nansum(spends, axis=1).astype(np.int64)
+        has_expenses = (totals > 0).astype(np.int64)
+        percentils = np.zeros(len(records))
+        if len(self.spend_reference) > 0:
+            percentils = np.where(has_expenses == 1, spending_percentil(totals, self.spend_reference), 0.0)
+
+        ages = np.array([r.get("Age") for r in records], dtype=float)
+        ages_imputed = np.where(np.isnan(ages), self.age_median, np.trunc(ages))
+        clusters = np.searchsorted(self.age_boundaries, ages_imputed, side="left")
+
+        out = []
+        labels = self._labels_list
+        for record, total, has, pct, age, cluster in zip(
+            records,
+            totals.tolist(),
+            has_expenses.tolist(),
+            percentils.tolist(),
+            ages_imputed.tolist(),
+            clusters.tolist(),
+        ):
+            feats = self._lookup(record, *_parse_passenger_id(record["PassengerId"]))
+            feats.update(
+                TotalExpenses=total,
+                HasExpenses=has,
+                SpendingPercentil=pct,
+                AgeImputed=age,
+                AgeCluster=cluster,
+                AgeClusterLabel=labels[cluster],
+            )
+            out.append(feats)
+        return out
+
+
+class FeatureServer:
+    """
+    Front end HTTP/1.1 mínimo (asyncio, keep-alive) sobre un FeatureIndex.
+    """
+
+    def __init__(self, index: FeatureIndex) -> None:
+        self.index = index
+
+    def handle_request(self, method: str, path: str, body: bytes) -> Tuple[str, Any]:
+        if method == "GET" and path == "/health":
+            return "200 OK", {"status": "ok", "groups": len(self.index.group_counts)}
+        if method == "POST" and path == "/features":
+            try:
+                payload = json.loads(body or b"null")
+                if isinstance(payload, list):
+                    return "200 OK", self.index.featurize_batch(payload)
+                if isinstance(payload, dict):
+                    return "200 OK", self.index.featurize(payload)
+                return "400 Bad Request", {"error": "se esperaba un objeto JSON o una lista de objetos"}
+            except (KeyError, ValueError, TypeError) as exc:
+                return "400 Bad Request", {"error": f"{type(exc).__name__}: {exc}"}
+        return "404 Not Found", {"error": f"ruta desconocida: {method} {path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = self.handle_request(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle, host, port)
+
+
+async def _http_roundtrips(host: str, port: int, bodies: List[bytes]) -> List[float]:
+    """
+    Envía cada cuerpo por una conexión keep-alive y devuelve las latencias (s).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+    for body in bodies:
+        t0 = time.perf_counter()
+        writer.write(
+            f"POST /features HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - t0)
+    writer.close()
+    await writer.wait_closed()
+    return latencies
+
+
+def _percentiles_us(latencies: Sequence[float]) -> str:
+    arr = np.asarray(latencies) * 1e6
+    return f"p50 = {np.percentile(arr, 50):8.1f} µs | p99 = {np.percentile(arr, 99):8.1f} µs | max = {arr.max():8.1f} µs"
+
+
+def benchmark(index: FeatureIndex, records: List[Dict[str, Any]], n: int, batch_size: int, http: bool) -> None:
+    """
+    Latencia por registro (en proceso y, opcionalmente, por HTTP local) y por micro-lote.
+    """
+    sample = [records[i % len(records)] for i in range(n)]
+    for r in sample[:100]:  # calentamiento
+        index.featurize(r)
+
+    latencies = []
+    for r in sample:
+        t0 = time.perf_counter()
+        index.featurize(r)
+        latencies.append(time.perf_counter() - t0)
+    print(f"  - registro (en proceso), n={n}:      {_percentiles_us(latencies)}")
+
+    batches = [sample[i:i + batch_size] for i in range(0, n, batch_size)]
+    batch_latencies = []
+    for b in batches:
+        t0 = time.perf_counter()
+        index.featurize_batch(b)
+        batch_latencies.append(time.perf_counter() - t0)
+    per_record = sum(batch_latencies) / n * 1e6
+    print(f"  - micro-lote de {batch_size} (en proceso):   {_percentiles_us(batch_latencies)} ({per_record:.1f} µs/registro)")
+
+    if http:
+        async def _run() -> List[float]:
+            server = await FeatureServer(index).start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            bodies = [json.dumps(r).encode() for r in sample]
+            async with server:
+                return await _http_roundtrips("127.0.0.1", port, bodies)
+
+        print(f"  - registro (HTTP local), n={n}:      {_percentiles_us(asyncio.run(_run()))}")
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Servicio de features de baja latencia por pasajero.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("serve", "Arranca el servidor HTTP local."), ("benchmark", "Mide latencias p50/p99.")):
+        sp = sub.add_parser(name, help=help_text)
+        sp.add_argument("--model", default="feature_model.npz", help="Modelo ajustado de feature_pipeline.py.")
+        sp.add_argument(
+            "--data",
+            nargs="+",
+            default=["train10.csv"],
+            help="Salidas de etapa con Group/NumInGroup/Surname para los índices (por defecto: train10.csv).",
+        )
+
+    serve = sub.choices["serve"]
+    serve.add_argument("--host", default="127.0.0.1", help="Host de escucha (por defecto: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8080, help="Puerto de escucha (por defecto: 8080).")
+
+    bench = sub.choices["benchmark"]
+    bench.add_argument("--input", default="test.csv", help="CSV crudo con registros de ejemplo (por defecto: test.csv).")
+    bench.add_argument("--n", type=int, default=20000, help="Número de peticiones por registro.")
+    bench.add_argument("--batch-size", type=int, default=64, help="Tamaño del micro-lote.")
+    bench.add_argument("--no-http", action="store_true", help="No medir el camino HTTP.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    t0 = time.perf_counter()
+    index = FeatureIndex.build(args.model, args.data)
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"✓ Índices construidos en {build_ms:.1f} ms ({len(index.group_counts)} grupos, {len(index.known_members)} pasajeros)")
+
+    if args.command == "benchmark":
+        # Registros crudos, como los enviaría un cliente JSON (sin esquema compacto)
+        df = read_dataset(args.input, compact=False)
+        records = [{k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in r.items()} for r in df.to_dict("records")]
+        print(f"\nBenchmark ({args.input}, {len(records)} registros distintos):")
+        benchmark(index, records, n=args.n, batch_size=args.batch_size, http=not args.no_http)
+        return
+
+    async def _serve() -> None:
+        server = await FeatureServer(index).start(args.host, args.port)
+        print(f"  - escuchando en http://{args.host}:{args.port} (POST /features, GET /health)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        print("\n✓ Servidor detenido")
+
+
+if __name__ == "__main__":
+    main()
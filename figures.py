@@ -0,0 +1,472 @@
+"""
+Funciones de figura de los scripts de gráficas (ver plot_cache.py).
+
+Cada función recibe solo los datos que dibuja (data) y sus parámetros, y
+devuelve la Figure sin guardarla: plot_cache.render_plots la guarda, la cierra y
+decide si hace falta volver a dibujarla.
+
+Las variantes *_binned reciben tablas ya agregadas (density_grid.py: rejillas
+2D, histogramas y estadísticas de boxplot) y no dibujan nada por fila: su
+coste no depende del número de pasajeros.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+
+from density_grid import Histogram2D
+
+
+# ============================================================================
+# Dibujo desde tablas agregadas (density_grid.py)
+# ============================================================================
+def draw_hist(ax: Axes, hist: pd.DataFrame, **kwargs) -> None:
+    """
+    Barras de un histogram_frame, con el mismo aspecto que Series.hist sobre las filas.
+    """
+    edges = np.r_[hist["lo"].to_numpy(), hist["hi"].to_numpy()[-1:]]
+    ax.hist(hist["lo"].to_numpy(), bins=edges, weights=hist["count"].to_numpy(), **kwargs)
+    ax.grid(True)
+
+
+def draw_boxes(ax: Axes, boxes: pd.DataFrame, **kwargs) -> None:
+    """
+    Cajas de un box_stats_frame (sin outliers).
+    """
+    stats = [
+        {"label": r.label, "q1": r.q1, "med": r.med, "q3": r.q3, "whislo": r.whislo, "whishi": r.whishi, "fliers": []}
+        for r in boxes.itertuples(index=False)
+    ]
+    ax.bxp(stats, showfliers=False, **kwargs)
+
+
+def draw_density(ax: Axes, grid: pd.DataFrame, cmap: str, log: bool = False) -> AxesImage:
+    """
+    Imagen de una rejilla Histogram2D.to_frame(); las celdas vacías quedan en blanco.
+    """
+    h = Histogram2D.from_frame(grid)
+    counts = np.ma.masked_less(h.counts.T, 1)
+    vmax = max(int(h.counts.max()), 1)
+    return ax.imshow(
+        counts,
+        origin="lower",
+        aspect="auto",
+        interpolation="nearest",
+        extent=(h.x_edges[0], h.x_edges[-1], h.y_edges[0], h.y_edges[-1]),
+        cmap=cmap,
+        norm=LogNorm(vmin=1, vmax=vmax) if log else None,
+    )
+
+
+def draw_trend(ax: Axes, trend: Optional[Tuple[float, float]], lo: float, hi: float) -> None:
+    """
+    Recta de tendencia (pendiente, ordenada) en [lo, hi] con su leyenda.
+    """
+    if trend is None:
+        return
+    slope, intercept = trend
+    x_line = np.linspace(lo, hi, 100)
+    ax.plot(x_line, slope * x_line + intercept, "r--", alpha=0.8, linewidth=2,
+            label=f'Tendencia: y={slope:.2f}x+{intercept:.2f}')
+    ax.legend()
+
+
+def density_image(
+    data: pd.DataFrame, xlabel: str, ylabel: str, trend: Optional[Tuple[float, float]] = None
+) -> Figure:
+    """
+    Densidad 2D (escala log) de una rejilla, con la tendencia si se indica.
+    """
+    fig, ax = plt.subplots(figsize=(10, 7))
+    image = draw_density(ax, data, cmap="viridis", log=True)
+    fig.colorbar(image, ax=ax, label="Pasajeros (escala log)")
+    draw_trend(ax, trend, data["x_lo"].min(), data["x_hi"].max())
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(f"Densidad: {xlabel} vs {ylabel}")
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================================
+# eda_analysis.py
+# ============================================================================
+def eda_transported_distribution(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(8, 6))
+    data['Transported'].value_counts().plot(kind='bar', ax=ax, color=['#FF6B6B', '#4ECDC4'])
+    ax.set_title('Distribución de Pasajeros Transportados', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Transportado', fontsize=12)
+    ax.set_ylabel('Cantidad', fontsize=12)
+    ax.set_xticklabels(['No', 'Sí'], rotation=0)
+    fig.tight_layout()
+    return fig
+
+
+def eda_missing_values(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(data['Columna'], data['Porcentaje (%)'], color='coral')
+    ax.set_xlabel('Porcentaje de Valores Nulos (%)', fontsize=12)
+    ax.set_title('Valores Nulos por Columna', fontsize=14, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def eda_categorical_distributions(data: pd.DataFrame, columns: Sequence[str]) -> Figure:
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    axes = axes.ravel()
+    for idx, col in enumerate(columns):
+        if col in data.columns:
+            data[col].value_counts().plot(kind='bar', ax=axes[idx], color='steelblue')
+            axes[idx].set_title(f'Distribución de {col}', fontsize=12, fontweight='bold')
+            axes[idx].set_xlabel(col, fontsize=10)
+            axes[idx].set_ylabel('Cantidad', fontsize=10)
+            axes[idx].tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def eda_age_distribution(data: pd.DataFrame) -> Figure:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    data['Age'].hist(bins=30, ax=axes[0], color='mediumpurple', edgecolor='black')
+    axes[0].set_title('Histograma de Edad', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Edad', fontsize=10)
+    axes[0].set_ylabel('Frecuencia', fontsize=10)
+
+    data.boxplot(column='Age', ax=axes[1], patch_artist=True)
+    axes[1].set_title('Boxplot de Edad', fontsize=12, fontweight='bold')
+    axes[1].set_ylabel('Edad', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+def eda_expenses_distribution(data: pd.DataFrame, columns: Sequence[str]) -> Figure:
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.ravel()
+    for idx, col in enumerate(columns):
+        data[col].hist(bins=30, ax=axes[idx], color='teal', edgecolor='black', alpha=0.7)
+        axes[idx].set_title(f'Distribución de {col}', fontsize=11, fontweight='bold')
+        axes[idx].set_xlabel(col, fontsize=9)
+        axes[idx].set_ylabel('Frecuencia', fontsize=9)
+
+    # Ocultar el subplot extra
+    axes[-1].axis('off')
+    fig.tight_layout()
+    return fig
+
+
+def eda_correlation_matrix(data: pd.DataFrame) -> Figure:
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(data, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1, ax=ax, cbar_kws={"shrink": 0.8})
+    ax.set_title('Matriz de Correlación - Variables Numéricas', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def eda_transported_rate(
+    data: pd.DataFrame,
+    title: str,
+    xlabel: str,
+    figsize: Sequence[float],
+    xticklabels: Sequence[str] | None = None,
+    rotation: int = 45,
+) -> Figure:
+    """
+    Barras de % No Transportado / Transportado (tabla de transported_crosstab).
+    """
+    fig, ax = plt.subplots(figsize=tuple(figsize))
+    data.plot(kind='bar', ax=ax, color=['#FF6B6B', '#4ECDC4'])
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(xlabel, fontsize=12)
+    ax.set_ylabel('Porcentaje (%)', fontsize=12)
+    ax.legend(['No Transportado', 'Transportado'], loc='best')
+    ax.set_xticklabels(ax.get_xticklabels() if xticklabels is None else list(xticklabels), rotation=rotation)
+    fig.tight_layout()
+    return fig
+
+
+def eda_age_by_transported(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(10, 6))
+    data.boxplot(column='Age', by='Transported', ax=ax, patch_artist=True)
+    ax.set_title('Distribución de Edad por Estado de Transporte', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Transportado', fontsize=12)
+    ax.set_ylabel('Edad', fontsize=12)
+    fig.suptitle('')
+    fig.tight_layout()
+    return fig
+
+
+def eda_total_expenses(data: pd.DataFrame) -> Figure:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    data['TotalExpenses'].hist(bins=50, ax=axes[0], color='darkgreen', edgecolor='black', alpha=0.7)
+    axes[0].set_title('Distribución de Gastos Totales', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Gastos Totales', fontsize=10)
+    axes[0].set_ylabel('Frecuencia', fontsize=10)
+
+    data.boxplot(column='TotalExpenses', by='Transported', ax=axes[1], patch_artist=True)
+    axes[1].set_title('Gastos Totales por Estado de Transporte', fontsize=12, fontweight='bold')
+    axes[1].set_xlabel('Transportado', fontsize=10)
+    axes[1].set_ylabel('Gastos Totales', fontsize=10)
+    fig.suptitle('')
+
+    fig.tight_layout()
+    return fig
+
+
+def eda_age_distribution_binned(data: Dict[str, pd.DataFrame]) -> Figure:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    draw_hist(axes[0], data['hist'], color='mediumpurple', edgecolor='black')
+    axes[0].set_title('Histograma de Edad', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Edad', fontsize=10)
+    axes[0].set_ylabel('Frecuencia', fontsize=10)
+
+    draw_boxes(axes[1], data['box'], patch_artist=True)
+    axes[1].set_title('Boxplot de Edad', fontsize=12, fontweight='bold')
+    axes[1].set_ylabel('Edad', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+def eda_expenses_distribution_binned(data: Dict[str, pd.DataFrame], columns: Sequence[str]) -> Figure:
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.ravel()
+    for idx, col in enumerate(columns):
+        draw_hist(axes[idx], data[col], color='teal', edgecolor='black', alpha=0.7)
+        axes[idx].set_title(f'Distribución de {col}', fontsize=11, fontweight='bold')
+        axes[idx].set_xlabel(col, fontsize=9)
+        axes[idx].set_ylabel('Frecuencia', fontsize=9)
+
+    # Ocultar el subplot extra
+    axes[-1].axis('off')
+    fig.tight_layout()
+    return fig
+
+
+def eda_age_by_transported_binned(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(10, 6))
+    draw_boxes(ax, data, patch_artist=True)
+    ax.set_title('Distribución de Edad por Estado de Transporte', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Transportado', fontsize=12)
+    ax.set_ylabel('Edad', fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def eda_total_expenses_binned(data: Dict[str, pd.DataFrame]) -> Figure:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    draw_hist(axes[0], data['hist'], color='darkgreen', edgecolor='black', alpha=0.7)
+    axes[0].set_title('Distribución de Gastos Totales', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Gastos Totales', fontsize=10)
+    axes[0].set_ylabel('Frecuencia', fontsize=10)
+
+    draw_boxes(axes[1], data['box'], patch_artist=True)
+    axes[1].set_title('Gastos Totales por Estado de Transporte', fontsize=12, fontweight='bold')
+    axes[1].set_xlabel('Transportado', fontsize=10)
+    axes[1].set_ylabel('Gastos Totales', fontsize=10)
+
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================================
+# plot_age_vs_expenses.py
+# ============================================================================
+def age_expense_stats(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Media y mediana de TotalExpenses por edad (solo edades con 5+ observaciones).
+    """
+    age_stats = data.groupby('Age')['TotalExpenses'].agg(['mean', 'median', 'count']).reset_index()
+    return age_stats[age_stats['count'] >= 5]
+
+
+def _plot_age_expense_stats(ax: Axes, age_stats: pd.DataFrame) -> None:
+    ax.plot(age_stats['Age'], age_stats['mean'], marker='o', linewidth=2,
+            markersize=4, label='Media', color='steelblue')
+    ax.plot(age_stats['Age'], age_stats['median'], marker='s', linewidth=2,
+            markersize=4, label='Mediana', color='coral')
+    ax.set_xlabel('Edad (años)', fontsize=11)
+    ax.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax.set_title('Gastos Promedio por Edad (≥5 observaciones)', fontsize=12)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def age_vs_expenses(data: pd.DataFrame) -> Figure:
+    """
+    2x2: scatter con tendencia, boxplot por AgeGroup, hexbin y media/mediana por edad.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('Relación entre Edad y Gastos Totales', fontsize=16, fontweight='bold')
+
+    # 1. Scatter plot básico
+    ax1 = axes[0, 0]
+    ax1.scatter(data['Age'], data['TotalExpenses'], alpha=0.3, s=20, c='steelblue')
+    ax1.set_xlabel('Edad (años)', fontsize=11)
+    ax1.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax1.set_title('Scatter Plot: Edad vs Gastos Totales', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+
+    # Agregar línea de tendencia
+    mask = data['Age'].notna() & data['TotalExpenses'].notna()
+    if mask.sum() > 0:
+        z = np.polyfit(data[mask]['Age'], data[mask]['TotalExpenses'], 1)
+        p = np.poly1d(z)
+        x_line = np.linspace(data['Age'].min(), data['Age'].max(), 100)
+        ax1.plot(x_line, p(x_line), "r--", alpha=0.8, linewidth=2, label=f'Tendencia: y={z[0]:.2f}x+{z[1]:.2f}')
+        ax1.legend()
+
+    # 2. Boxplot por grupos de edad
+    ax2 = axes[0, 1]
+    data.boxplot(column='TotalExpenses', by='AgeGroup', ax=ax2)
+    ax2.set_xlabel('Grupo de Edad', fontsize=11)
+    ax2.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax2.set_title('Distribución de Gastos por Grupo de Edad', fontsize=12)
+    ax2.tick_params(axis='x', labelrotation=0)
+
+    # 3. Heatmap de densidad (hexbin), solo filas con ambas columnas
+    ax3 = axes[1, 0]
+    df_valid = data[mask]
+    hexbin = ax3.hexbin(df_valid['Age'], df_valid['TotalExpenses'],
+                        gridsize=30, cmap='YlOrRd', mincnt=1)
+    ax3.set_xlabel('Edad (años)', fontsize=11)
+    ax3.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax3.set_title('Densidad: Edad vs Gastos (Hexbin)', fontsize=12)
+    fig.colorbar(hexbin, ax=ax3, label='Frecuencia')
+
+    # 4. Gastos promedio por edad
+    _plot_age_expense_stats(axes[1, 1], age_expense_stats(data))
+
+    fig.tight_layout()
+    return fig
+
+
+def age_vs_expenses_binned(data: Dict[str, pd.DataFrame], trend: Optional[Tuple[float, float]]) -> Figure:
+    """
+    age_vs_expenses desde tablas agregadas: density (rejilla fina, en lugar del
+    scatter), boxes (por AgeGroup), hexbin (rejilla de 30x30) y age_stats.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('Relación entre Edad y Gastos Totales', fontsize=16, fontweight='bold')
+
+    # 1. Densidad (escala log) con línea de tendencia
+    ax1 = axes[0, 0]
+    image = draw_density(ax1, data['density'], cmap='Blues', log=True)
+    fig.colorbar(image, ax=ax1, label='Pasajeros (escala log)')
+    draw_trend(ax1, trend, data['density']['x_lo'].min(), data['density']['x_hi'].max())
+    ax1.set_xlabel('Edad (años)', fontsize=11)
+    ax1.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax1.set_title('Densidad: Edad vs Gastos Totales', fontsize=12)
+
+    # 2. Boxplot por grupos de edad (sin outliers)
+    ax2 = axes[0, 1]
+    draw_boxes(ax2, data['boxes'])
+    ax2.set_xlabel('Grupo de Edad', fontsize=11)
+    ax2.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax2.set_title('Distribución de Gastos por Grupo de Edad', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Densidad en rejilla gruesa (equivalente al hexbin)
+    ax3 = axes[1, 0]
+    image = draw_density(ax3, data['hexbin'], cmap='YlOrRd')
+    ax3.set_xlabel('Edad (años)', fontsize=11)
+    ax3.set_ylabel('Gastos Totales ($)', fontsize=11)
+    ax3.set_title('Densidad: Edad vs Gastos (Histograma 2D)', fontsize=12)
+    fig.colorbar(image, ax=ax3, label='Frecuencia')
+
+    # 4. Gastos promedio por edad
+    _plot_age_expense_stats(axes[1, 1], data['age_stats'])
+
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================================
+# age_transported_rate_by_value.py
+# ============================================================================
+def age_transported_rate(data: pd.DataFrame, min_n: int) -> Figure:
+    """
+    % Transported por edad exacta; anota n cada 5 años donde n >= min_n.
+    """
+    fig, ax = plt.subplots(figsize=(10, 5))
+    x = data["Age"].to_numpy()
+    y = (data["TransportedRate"] * 100).to_numpy()
+
+    ax.plot(x, y, linewidth=2, color="#4ECDC4")
+    ax.scatter(x, y, s=25, color="#4ECDC4", edgecolor="black", linewidth=0.3, alpha=0.9)
+
+    # Añadir tamaño de muestra como anotación (solo donde hay suficiente n)
+    for age, pct, n in zip(data["Age"], y, data["Total"]):
+        if int(n) >= min_n and age % 5 == 0:  # para no saturar, anotamos cada 5 años
+            ax.text(int(age), float(pct) + 1.2, f"n={int(n)}", ha="center", va="bottom", fontsize=8)
+
+    ax.set_title("Porcentaje de Transported por Edad (valor exacto)")
+    ax.set_xlabel("Edad (Age)")
+    ax.set_ylabel("Transported (%)")
+    ax.set_ylim(0, 100)
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================================
+# cluster_age_groups.py
+# ============================================================================
+def age_cluster_metric(data: pd.DataFrame, metric: str, title: str, ylabel: str) -> Figure:
+    """
+    Una métrica del barrido de k (inertia → elbow, silhouette).
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(data["k"], data[metric], marker="o")
+    ax.set_title(title)
+    ax.set_xlabel("k (número de clústeres)")
+    ax.set_ylabel(ylabel)
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def age_clusters_distribution(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(10, 5))
+    df_plot = data.sort_values("AgeCluster")
+    for c in sorted(df_plot["AgeCluster"].unique()):
+        ages = df_plot.loc[df_plot["AgeCluster"] == c, "AgeImputed"].to_numpy()
+        ax.hist(ages, bins=20, alpha=0.55, label=f"C{c}")
+    ax.set_title("Distribución de Age (imputada) por clúster")
+    ax.set_xlabel("Edad")
+    ax.set_ylabel("Frecuencia")
+    ax.legend(title="Clúster", ncols=4, fontsize=9)
+    fig.tight_layout()
+    return fig
+
+
+def age_clusters_transported_rate(data: pd.DataFrame) -> Figure:
+    fig, ax = plt.subplots(figsize=(8, 5))
+    x = data["AgeClusterLabel"].astype(str).to_list()
+    y = (data["TransportedRate"] * 100).to_numpy()
+    ax.bar(x, y, color=["#4ECDC4" for _ in x])
+    ax.set_title("Tasa de Transported por AgeCluster")
+    ax.set_xlabel("AgeCluster")
+    ax.set_ylabel("Transported (%)")
+    ax.set_ylim(0, 100)
+    ax.grid(axis="y", alpha=0.3)
+    for i, val in enumerate(y):
+        ax.text(i, val + 1.0, f"{val:.1f}%", ha="center", va="bottom", fontsize=10)
+    fig.tight_layout()
+    return fig
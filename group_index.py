@@ -0,0 +1,136 @@
+"""
+Índice de grupos estilo CSR (offsets por clave) - Spaceship Titanic
+
+Los miembros de cada valor de una clave (Group, Surname, Deck+Num+Side, ...)
+ocupan un rango contiguo [offsets[i], offsets[i+1]) de un orden de filas:
+- Si el dataset ya está ordenado por la clave (Group en todas las etapas, que
+  siguen el orden de PassengerId) no hay permutación: los miembros de un grupo
+  son un slice de las filas (vista, sin copia).
+- Si no (Surname, cabina, ...), un argsort estable da la permutación `order` y
+  los miembros son order[inicio:fin] (también una vista), en el orden original.
+
+Con el índice, buscar un grupo es O(1) (diccionario clave → posición, creado la
+primera vez) y las reducciones por grupo son np.<ufunc>.reduceat sobre los
+valores reordenados una sola vez: O(n) en total en lugar de un df[df[key] == v]
+(recorrido completo) por grupo.
+
+Consumidores: key_consistency.py y los scripts analyze_*_transported.py.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class GroupIndex:
+    """
+    keys: valores de la clave por grupo (orden de groupby); offsets: g+1 límites;
+    order: permutación de filas (None = filas ya ordenadas por la clave).
+    """
+
+    def __init__(self, keys: pd.DataFrame, offsets: np.ndarray, order: Optional[np.ndarray] = None) -> None:
+        self.keys = keys
+        self.offsets = offsets
+        self.order = order
+        self._lookup: Optional[Dict[object, int]] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, key: str | Sequence[str]) -> "GroupIndex":
+        """
+        Índice de una o varias columnas ("Deck+Num+Side" o lista). Las filas con
+        alguna parte de la clave nula quedan fuera (como groupby con dropna=True).
+        """
+        columns = key.split("+") if isinstance(key, str) else list(key)
+        codes: List[np.ndarray] = []
+        uniques: List[pd.Index] = []
+        for column in columns:
+            c, u = pd.factorize(df[column], sort=True)
+            codes.append(c)
+            uniques.append(u)
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        dims = tuple(max(len(u), 1) for u in uniques)
+        combined = np.ravel_multi_index([c[valid] for c in codes], dims)
+
+        if valid.all() and np.all(combined[1:] >= combined[:-1]):
+            order = None
+        else:
+            perm = np.argsort(combined, kind="stable")
+            order = np.flatnonzero(valid)[perm]
+            combined = combined[perm]
+
+        starts = np.flatnonzero(np.r_[True, combined[1:] != combined[:-1]]) if len(combined) else np.array([], dtype=np.int64)
+        offsets = np.r_[starts, len(combined)].astype(np.int64)
+        parts = np.unravel_index(combined[starts], dims)
+        keys = pd.DataFrame({column: u.take(p) for column, u, p in zip(columns, uniques, parts)})
+        return cls(keys, offsets, order)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.offsets[:-1]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Filas en el orden del índice (posicionales, como df.iloc).
+        """
+        return np.arange(self.offsets[-1]) if self.order is None else self.order
+
+    def segment_ids(self) -> np.ndarray:
+        """
+        Número de grupo de cada posición del índice (0..g-1).
+        """
+        return np.repeat(np.arange(len(self)), self.sizes)
+
+    def locate(self, value: object) -> int:
+        """
+        Posición del grupo con ese valor de clave (tupla si la clave es compuesta).
+        """
+        if self._lookup is None:
+            if self.keys.shape[1] == 1:
+                labels = self.keys.iloc[:, 0].tolist()
+            else:
+                labels = list(self.keys.itertuples(index=False, name=None))
+            self._lookup = {label: i for i, label in enumerate(labels)}
+        try:
+            return self._lookup[value]
+        except KeyError:
+            raise KeyError(f"Clave inexistente en el índice: {value!r}") from None
+
+    def members(self, value: object) -> slice | np.ndarray:
+        """
+        Filas del grupo (posicionales): slice si no hay permutación, si no una vista de order.
+        """
+        i = self.locate(value)
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return slice(start, end) if self.order is None else self.order[start:end]
+
+    def rows(self, df: pd.DataFrame, value: object) -> pd.DataFrame:
+        """
+        Filas del grupo en su orden original (equivale a df[df[key] == value]).
+        """
+        return df.iloc[self.members(value)]
+
+    def gather(self, values: np.ndarray | pd.Series) -> np.ndarray | pd.Series:
+        """
+        Valores por fila reordenados al orden del índice (sin copia si ya lo están).
+        """
+        return values if self.order is None else values.take(self.order)
+
+    def reduceat(self, values: np.ndarray, ufunc: np.ufunc = np.add) -> np.ndarray:
+        """
+        Reducción por grupo de valores por fila (ufunc.reduceat sobre los segmentos).
+        """
+        values = np.asarray(values)
+        if not len(self):
+            return np.zeros(0, dtype=values.dtype)
+        return ufunc.reduceat(self.gather(values), self.starts)
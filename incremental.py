@@ -0,0 +1,302 @@
+"""
+Modo incremental: añadir pasajeros nuevos sin recalcular todo el dataset - Spaceship Titanic
+
+Estado persistente (directorio --state-dir):
+- features.pkl: filas ya procesadas en formato train10 (pickle, conserva tipos;
+  Surname es categórica: códigos + vocabulario de Surname_Group).
+- state.npz: conteo por Group y array ordenado de TotalExpenses de quienes gastan.
+
+Al añadir un lote:
+1. Las etapas por fila (STAGES de run_pipeline salvo add_group_size y el
+   percentil) se aplican solo al lote nuevo.
+2. GroupSize: se actualiza el conteo de los grupos tocados y se reescribe solo en
+   los miembros existentes de esos grupos.
+3. Surname_Group: los pares (apellido, grupo) nuevos se añaden al vocabulario; los
+   códigos de las filas existentes no cambian.
+4. SpendingPercentil: los gastos nuevos se insertan en el array ordenado y el
+   percentil de cada fila nueva sale de una búsqueda binaria (O(log n)). Como el
+   percentil es un rango relativo a n, también se recalcula (searchsorted
+   vectorizado) para los que ya gastaban y solo se escriben los que cambian.
+
+Los lotes pueden llegar sin Transported (pasajeros nuevos aún sin etiquetar): sus
+filas quedan con Transported nulo.
+
+Cada append informa qué filas existentes cambiaron y en qué columna. El resultado
+es idéntico a ejecutar run_pipeline.py sobre la concatenación de todos los lotes.
+
+Uso:
+    python incremental.py init --input train.csv --state-dir feature_state
+    python incremental.py append --input nuevos.csv --state-dir feature_state --changes cambios.csv
+    python incremental.py check --input train.csv --batch test.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from create_spending_percentil import spending_percentil
+from dataset_io import read_dataset, write_dataset
+from run_pipeline import STAGES, run_pipeline, stage_transform
+
+
+DEFAULT_STATE_DIR = "feature_state"
+FRAME_FILE = "features.pkl"
+STATE_FILE = "state.npz"
+
+
+@dataclass
+class AppendResult:
+    new_rows: pd.Index
+    changes: pd.DataFrame  # Row, Column, Old, New (solo filas existentes)
+
+    def changed_rows(self, column: Optional[str] = None) -> pd.Index:
+        """
+        Filas existentes que cambiaron de valor (en column, o en cualquier columna).
+        """
+        changes = self.changes if column is None else self.changes[self.changes["Column"] == column]
+        return pd.Index(changes["Row"].unique())
+
+
+def _as_category(s: pd.Series) -> pd.Series:
+    return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+
+
+def _align_categories(frame: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Amplía el vocabulario de las categóricas de frame con los valores nuevos y
+    recodifica new sobre ese vocabulario (los códigos existentes no cambian).
+    """
+    new = new.copy()
+    for column in frame.columns:
+        if not isinstance(frame[column].dtype, pd.CategoricalDtype) or column not in new.columns:
+            continue
+        categories = frame[column].cat.categories
+        values = pd.Index(new[column].dropna().unique())
+        extra = values[~values.isin(categories)]
+        if len(extra):
+            frame[column] = frame[column].cat.add_categories(list(extra))
+        new[column] = new[column].astype(frame[column].dtype)
+    return new
+
+
+def _reindex_like(frame: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    new con las columnas de frame y en su orden. Las que faltan en el lote (p.ej.
+    Transported en pasajeros aún sin etiquetar) quedan nulas con el tipo de frame.
+    """
+    missing = frame.columns.difference(new.columns)
+    new = new.reindex(columns=frame.columns)
+    for column in missing:
+        if isinstance(frame[column].dtype, pd.api.extensions.ExtensionDtype):
+            new[column] = new[column].astype(frame[column].dtype)
+    return new
+
+
+def _change_log(rows: pd.Index, column: str, old: pd.Series, new: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Row": rows, "Column": column, "Old": old.to_numpy(dtype=object), "New": new.to_numpy(dtype=object)}
+    )
+
+
+class IncrementalFeatureStore:
+    """
+    Filas en formato train10 + estado mínimo para añadir lotes sin recalcular todo.
+    """
+
+    def __init__(self, frame: pd.DataFrame, group_counts: Dict[int, int], reference: np.ndarray) -> None:
+        self.frame = frame
+        self.group_counts = group_counts
+        self.reference = reference
+
+    @classmethod
+    def from_raw(cls, df_raw: pd.DataFrame) -> "IncrementalFeatureStore":
+        return cls.from_features(run_pipeline(df_raw))
+
+    @classmethod
+    def from_features(cls, frame: pd.DataFrame) -> "IncrementalFeatureStore":
+        frame = frame.reset_index(drop=True)
+        frame["Surname"] = _as_category(frame["Surname"])
+        counts = frame["Group"].value_counts()
+        spenders = frame["HasExpenses"] == 1
+        reference = np.sort(frame.loc[spenders, "TotalExpenses"].to_numpy(dtype=float))
+        return cls(frame, {int(g): int(c) for g, c in counts.items()}, reference)
+
+    def save(self, state_dir: Path | str) -> None:
+        state_dir = Path(state_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self.frame.to_pickle(state_dir / FRAME_FILE)
+        groups = np.fromiter(self.group_counts.keys(), dtype=np.int64, count=len(self.group_counts))
+        counts = np.fromiter(self.group_counts.values(), dtype=np.int64, count=len(self.group_counts))
+        with open(state_dir / STATE_FILE, "wb") as f:
+            np.savez(f, groups=groups, counts=counts, reference=self.reference)
+
+    @classmethod
+    def load(cls, state_dir: Path | str) -> "IncrementalFeatureStore":
+        state_dir = Path(state_dir)
+        if not (state_dir / FRAME_FILE).exists():
+            raise FileNotFoundError(f"No hay estado incremental en {state_dir} (ejecute primero 'init').")
+        frame = pd.read_pickle(state_dir / FRAME_FILE)
+        with np.load(state_dir / STATE_FILE, allow_pickle=False) as data:
+            group_counts = dict(zip(data["groups"].tolist(), data["counts"].tolist()))
+            reference = data["reference"]
+        if len(reference) != int((frame["HasExpenses"] == 1).sum()):
+            raise ValueError(f"Estado inconsistente en {state_dir}: {STATE_FILE} no corresponde a {FRAME_FILE}")
+        return cls(frame, group_counts, reference)
+
+    def append(self, df_raw: pd.DataFrame) -> AppendResult:
+        """
+        Añade un lote crudo (formato train.csv) y actualiza solo las filas afectadas.
+        """
+        frame = self.frame
+
+        # 1. Etapas por fila sobre el lote (add_group_size da conteos locales; se corrigen abajo)
+        new = df_raw
+        for stage, _ in STAGES[:-1]:
+            new = stage_transform(stage)(new)
+        new = new.reset_index(drop=True)
+
+        batch_counts = new["Group"].value_counts()
+        touched = batch_counts.index.to_numpy()
+        existing = frame["Group"].isin(touched).to_numpy()
+
+        keys = ["Group", "NumInGroup"]
+        members = pd.concat([frame.loc[existing, keys], new[keys]])
+        duplicated = members.duplicated()
+        if duplicated.any():
+            ids = members.loc[duplicated.to_numpy()].head(5).apply(lambda r: f"{r.Group:04d}_{r.NumInGroup:02d}", axis=1)
+            raise ValueError(f"Pasajeros ya presentes o repetidos en el lote: {', '.join(ids)}")
+
+        log: List[pd.DataFrame] = []
+
+        # 2. GroupSize: conteo global de los grupos tocados
+        for group, count in batch_counts.items():
+            self.group_counts[int(group)] = self.group_counts.get(int(group), 0) + int(count)
+        sizes = pd.Series({g: self.group_counts[int(g)] for g in touched})
+        new["GroupSize"] = sizes.reindex(new["Group"].to_numpy()).to_numpy()
+        if existing.any():
+            rows = frame.index[existing]
+            old = frame.loc[rows, "GroupSize"]
+            updated = sizes.reindex(frame.loc[rows, "Group"].to_numpy()).to_numpy()
+            frame.loc[rows, "GroupSize"] = updated
+            log.append(_change_log(rows, "GroupSize", old, frame.loc[rows, "GroupSize"]))
+
+        # 3. SpendingPercentil: inserción en el array ordenado + búsqueda binaria
+        spenders_new = (new["HasExpenses"] == 1).to_numpy()
+        spend_new = np.sort(new.loc[spenders_new, "TotalExpenses"].to_numpy(dtype=float))
+        self.reference = np.insert(self.reference, np.searchsorted(self.reference, spend_new), spend_new)
+        new["SpendingPercentil"] = 0.0
+        if spenders_new.any():
+            new.loc[spenders_new, "SpendingPercentil"] = spending_percentil(
+                new.loc[spenders_new, "TotalExpenses"].to_numpy(dtype=float), self.reference
+            )
+        if len(spend_new):
+            spenders = (frame["HasExpenses"] == 1).to_numpy()
+            old = frame.loc[spenders, "SpendingPercentil"]
+            updated = spending_percentil(frame.loc[spenders, "TotalExpenses"].to_numpy(dtype=float), self.reference)
+            changed = old.to_numpy() != updated
+            rows = old.index[changed]
+            frame.loc[rows, "SpendingPercentil"] = updated[changed]
+            log.append(_change_log(rows, "SpendingPercentil", old[changed], frame.loc[rows, "SpendingPercentil"]))
+
+        # 4. Surname_Group y demás categóricas: vocabulario ampliado, códigos existentes intactos
+        new = _align_categories(frame, _reindex_like(frame, new))
+        start = len(frame)
+        new.index = pd.RangeIndex(start, start + len(new))
+        self.frame = pd.concat([frame, new])
+
+        changes = pd.concat(log, ignore_index=True) if log else _change_log(pd.Index([]), "", pd.Series([]), pd.Series([]))
+        return AppendResult(new_rows=new.index, changes=changes)
+
+
+def verify_append(df_raw: pd.DataFrame, batch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Crea el estado con df_raw, añade batch y compara con run_pipeline sobre la
+    concatenación de ambos. Devuelve las filas que difieren (vacío si coinciden).
+    """
+    store = IncrementalFeatureStore.from_raw(df_raw)
+    store.append(batch)
+    full = run_pipeline(pd.concat([df_raw, batch], ignore_index=True))
+    header, *incremental = store.frame.to_csv(index=False).splitlines()
+    expected_header, *expected = full.to_csv(index=False).splitlines()
+    if header != expected_header or len(incremental) != len(expected):
+        raise ValueError(
+            f"Columnas o filas distintas: {header} ({len(incremental)}) vs {expected_header} ({len(expected)})"
+        )
+    rows = [i for i, (a, b) in enumerate(zip(incremental, expected)) if a != b]
+    return pd.DataFrame(
+        {"Row": rows, "Incremental": [incremental[i] for i in rows], "Completo": [expected[i] for i in rows]}
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Actualización incremental de features (Group, Surname, percentil).")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    init = sub.add_parser("init", help="Crea el estado a partir de un CSV crudo completo.")
+    init.add_argument("--input", default="train.csv", help="CSV/Parquet crudo inicial (por defecto: train.csv).")
+
+    app = sub.add_parser("append", help="Añade un lote de pasajeros nuevos (formato train.csv).")
+    app.add_argument("--input", required=True, help="CSV/Parquet crudo con los pasajeros nuevos.")
+    app.add_argument("--changes", default=None, help="Opcional: CSV con las filas existentes que cambiaron.")
+
+    check = sub.add_parser(
+        "check", help="Comprueba que init + append coincide con run_pipeline sobre la concatenación (sin estado)."
+    )
+    check.add_argument("--input", default="train.csv", help="CSV/Parquet crudo inicial (por defecto: train.csv).")
+    check.add_argument("--batch", default="test.csv", help="Lote a añadir (por defecto: test.csv, sin Transported).")
+
+    for sp in (init, app):
+        sp.add_argument("--state-dir", default=DEFAULT_STATE_DIR, help="Directorio del estado persistente.")
+        sp.add_argument("--output", default=None, help="Opcional: escribe las features completas (CSV o Parquet).")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+    df_raw = read_dataset(input_path)
+
+    if args.command == "check":
+        batch = read_dataset(args.batch)
+        diff = verify_append(df_raw, batch)
+        if len(diff):
+            print(diff.head(10).to_string(index=False))
+            raise SystemExit(f"✗ append difiere de run_pipeline en {len(diff)} filas")
+        print("✓ append coincide con run_pipeline sobre la concatenación")
+        print(f"  - input: {input_path} ({len(df_raw)} filas) + {args.batch} ({len(batch)} filas)")
+        return
+
+    if args.command == "init":
+        store = IncrementalFeatureStore.from_raw(df_raw)
+        store.save(args.state_dir)
+        print("✓ Estado incremental creado")
+        print(f"  - input:  {input_path} ({len(df_raw)} filas)")
+        print(f"  - estado: {args.state_dir} ({len(store.group_counts)} grupos, {len(store.reference)} con gastos)")
+    else:
+        store = IncrementalFeatureStore.load(args.state_dir)
+        result = store.append(df_raw)
+        store.save(args.state_dir)
+        print("✓ Lote añadido")
+        print(f"  - input:   {input_path} ({len(result.new_rows)} filas nuevas, total {len(store.frame)})")
+        print(f"  - GroupSize cambiado en {len(result.changed_rows('GroupSize'))} filas existentes")
+        print(f"  - SpendingPercentil cambiado en {len(result.changed_rows('SpendingPercentil'))} filas existentes")
+        if args.changes:
+            result.changes.to_csv(args.changes, index=False)
+            print(f"  - cambios: {args.changes} ({len(result.changes)} valores)")
+
+    if args.output:
+        write_dataset(store.frame, args.output)
+        print(f"  - output:  {args.output}")
+
+
+if __name__ == "__main__":
+    main()
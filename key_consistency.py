@@ -0,0 +1,171 @@
+"""
+Consistencia de Transported por clave (Group, Surname, Surname_Group, Cabin, ...)
+
+Los scripts analyze_*_transported.py responden la misma pregunta con distinta
+clave: ¿todos los pasajeros que comparten clave tienen el mismo Transported?
+Este motor lo calcula para cualquier clave (una columna o varias, p.ej.
+"Deck+Side" o la cabina "Deck+Num+Side") sin lambdas por grupo:
+
+1. group_index.GroupIndex agrupa las filas por clave (códigos combinados y un
+   argsort estable, o ninguno si ya están ordenadas): cada clave es un segmento
+   contiguo y todas las reducciones son np.add/np.minimum.reduceat.
+2. nunique (de Transported o de otra columna) cuenta pares (clave, valor)
+   distintos tras un lexsort.
+
+Columnas por clave: Size (filas), Count (Transported no nulo), TransportedTrue,
+TransportedFalse, UniqueTransported, AllSame, Unique<col> y <col> ("first",
+primer valor no nulo en el orden de las filas).
+
+Uso:
+    python key_consistency.py --input train9.csv --keys Group Surname Deck+Num+Side Deck+Side
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+from group_index import GroupIndex
+from target_rates import target_codes
+
+
+def key_columns(key: str | Sequence[str]) -> List[str]:
+    """
+    "Deck+Side" o ["Deck", "Side"] → ["Deck", "Side"].
+    """
+    return key.split("+") if isinstance(key, str) else list(key)
+
+
+def _nunique(index: GroupIndex, values: pd.Series) -> np.ndarray:
+    """
+    Valores distintos no nulos por grupo: pares (grupo, valor) distintos.
+    """
+    codes, _ = pd.factorize(index.gather(values))
+    keep = codes >= 0
+    seg, val = index.segment_ids()[keep], codes[keep]
+    if not len(seg):
+        return np.zeros(len(index), dtype=np.int64)
+    order = np.lexsort((val, seg))
+    seg, val = seg[order], val[order]
+    new_pair = np.r_[True, (seg[1:] != seg[:-1]) | (val[1:] != val[:-1])]
+    return np.bincount(seg[new_pair], minlength=len(index))
+
+
+def _first(index: GroupIndex, values: pd.Series) -> pd.Series:
+    """
+    Primer valor no nulo por grupo (como groupby().first()).
+    """
+    n = len(values)
+    first = index.reduceat(np.where(values.notna().to_numpy(), np.arange(n), n), np.minimum)
+    found = first < n
+    out = values.take(first[found]).reset_index(drop=True)
+    if found.all():
+        return out
+    return out.set_axis(np.flatnonzero(found)).reindex(range(len(index)))
+
+
+def key_consistency(
+    df: pd.DataFrame,
+    key: str | Sequence[str],
+    target: str = "Transported",
+    nunique: Sequence[str] = (),
+    first: Sequence[str] = (),
+    index: GroupIndex | None = None,
+    _target_codes: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Tabla por valor de la clave (ordenada como groupby(key)) con los conteos de
+    consistencia del objetivo; nunique/first añaden Unique<col> y <col>. index
+    reutiliza un GroupIndex ya construido para esa clave.
+    """
+    index = GroupIndex.from_frame(df, key_columns(key)) if index is None else index
+    t = target_codes(df[target]) if _target_codes is None else _target_codes
+
+    table = index.keys.copy()
+    table["Size"] = index.sizes
+    table["Count"] = index.sizes - index.reduceat((t == 2).astype(np.int64))
+    table[f"{target}True"] = index.reduceat((t == 1).astype(np.int64))
+    table[f"{target}False"] = index.reduceat((t == 0).astype(np.int64))
+    table[f"Unique{target}"] = _nunique(index, df[target])
+    table["AllSame"] = table[f"Unique{target}"] == 1
+    for column in nunique:
+        table[f"Unique{column}"] = _nunique(index, df[column])
+    for column in first:
+        table[column] = _first(index, df[column])
+    return table
+
+
+def key_consistency_many(
+    df: pd.DataFrame, keys: Sequence[str | Sequence[str]], target: str = "Transported"
+) -> Dict[str, pd.DataFrame]:
+    """
+    key_consistency para varias claves con el objetivo codificado una sola vez.
+    """
+    t = target_codes(df[target])
+    return {"+".join(key_columns(k)): key_consistency(df, k, target=target, _target_codes=t) for k in keys}
+
+
+def consistency_by_size(table: pd.DataFrame, size_column: str = "Size", all_same: str = "AllSame") -> pd.DataFrame:
+    """
+    Claves por tamaño: Total, AllSame y Mixed (ordenado por tamaño).
+    """
+    sizes, inverse = np.unique(table[size_column].to_numpy(), return_inverse=True)
+    total = np.bincount(inverse, minlength=len(sizes))
+    same = np.bincount(inverse, weights=table[all_same].to_numpy(dtype=float), minlength=len(sizes)).astype(np.int64)
+    return pd.DataFrame({size_column: sizes, "Total": total, "AllSame": same, "Mixed": total - same})
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Consistencia de Transported por clave (varias claves en una ejecución).")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet de entrada (por defecto: train9.csv).")
+    p.add_argument(
+        "--keys",
+        nargs="+",
+        default=["Group", "Surname", "Deck+Num+Side"],
+        help="Claves a analizar; varias columnas con '+' (p.ej. Deck+Side).",
+    )
+    p.add_argument("--output", default=None, help="Opcional: CSV con el resumen por clave.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+    df = read_dataset(input_path)
+    missing = sorted({c for k in args.keys for c in key_columns(k)} - set(df.columns))
+    if missing:
+        raise ValueError(f"Columnas inexistentes en el dataset: {', '.join(missing)}")
+
+    tables = key_consistency_many(df, args.keys)
+    rows = []
+    for key, table in tables.items():
+        multi = table[table["Size"] > 1]
+        rows.append(
+            {
+                "Key": key,
+                "Keys": len(table),
+                "Keys2Plus": len(multi),
+                "AllSame2Plus": int(multi["AllSame"].sum()),
+                "AllSamePct2Plus": multi["AllSame"].mean() * 100 if len(multi) else float("nan"),
+            }
+        )
+    summary = pd.DataFrame(rows)
+
+    print("✓ Consistencia de Transported por clave")
+    print(f"  - input: {input_path} ({len(df)} filas)")
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    if args.output:
+        summary.to_csv(args.output, index=False)
+        print(f"  - output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
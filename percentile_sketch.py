@@ -0,0 +1,224 @@
+"""
+Sketch de percentiles mergeable (KLL) para SpendingPercentil - Spaceship Titanic
+
+El percentil exacto (create_spending_percentil.py) necesita todos los TotalExpenses
+de quienes gastan ordenados en memoria. Para los modos por bloques/shards
+(streaming.py, sharded.py) existe la opción --percentile sketch:
+
+- Cada bloque o shard construye un KLLSketch (niveles de compactadores: los
+  elementos del nivel h pesan 2^h; cuando un nivel se llena se ordena y se
+  promueve uno de cada dos al nivel siguiente).
+- Los sketches se fusionan nivel a nivel (merge) y se serializan como arrays
+  (.npz, sin pickle).
+- La consulta por fila estima cuántos valores son < x y <= x y aplica la misma
+  fórmula que el exacto: (left + right + 1) / 2 / n, limitada a [0, 1].
+
+Precisión: error de rango normalizado ~ 2.296 / k^0.9723 (aprox. de KLL, 99% de
+confianza): k=200 → ~1.3%. Con k_for_error(eps) se elige k a partir del error
+deseado. Memoria: O(k) elementos, independiente de n. Mientras n no supera la
+capacidad del primer nivel el sketch es exacto.
+
+Benchmark (error y tiempo frente al rango exacto):
+    python percentile_sketch.py --input train.csv --k 50 100 200 400 --scale 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_K = 200
+MIN_LEVEL_WIDTH = 8
+CAPACITY_DECAY = 2 / 3
+
+
+def normalized_rank_error(k: int) -> float:
+    """
+    Error de rango normalizado aproximado de un KLL de parámetro k (99% de confianza).
+    """
+    return 2.296 / k**0.9723
+
+
+def k_for_error(epsilon: float) -> int:
+    """
+    Menor k cuyo error de rango normalizado aproximado es <= epsilon.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon debe estar entre 0 y 1")
+    return max(MIN_LEVEL_WIDTH, math.ceil((2.296 / epsilon) ** (1 / 0.9723)))
+
+
+class KLLSketch:
+    """
+    Sketch KLL de cuantiles sobre valores float; mergeable y serializable.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, random_state: Optional[int] = None) -> None:
+        if k < MIN_LEVEL_WIDTH:
+            raise ValueError(f"k debe ser >= {MIN_LEVEL_WIDTH}")
+        self.k = int(k)
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=float)]
+        self._rng = np.random.default_rng(random_state)
+        self._sorted: Optional[np.ndarray] = None
+        self._cum_weights: Optional[np.ndarray] = None
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(MIN_LEVEL_WIDTH, int(math.ceil(self.k * CAPACITY_DECAY**depth)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=float))
+                items = np.sort(self.levels[h])
+                # Con longitud impar un elemento se queda en el nivel actual
+                keep = items[: len(items) % 2]
+                pairs = items[len(keep):]
+                promoted = pairs[int(self._rng.integers(2)) :: 2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+        self._sorted = None
+
+    def update(self, values: Sequence[float] | np.ndarray) -> "KLLSketch":
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.n += len(values)
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Fusiona other en este sketch (nivel a nivel) y devuelve self.
+        """
+        if other.k != self.k:
+            raise ValueError(f"No se pueden fusionar sketches con k distinto ({self.k} vs {other.k})")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=float))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    @property
+    def retained(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+    def _prepare(self) -> None:
+        if self._sorted is not None:
+            return
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2**h, dtype=np.int64) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        self._sorted = items[order]
+        self._cum_weights = np.concatenate([[0], np.cumsum(weights[order])])
+
+    def percentil(self, values: Sequence[float] | np.ndarray) -> np.ndarray:
+        """
+        Percentil estimado de cada valor; misma fórmula y rango [0, 1] que spending_percentil.
+        """
+        if self.n == 0:
+            raise ValueError("El sketch está vacío")
+        self._prepare()
+        values = np.asarray(values, dtype=float)
+        left = self._cum_weights[np.searchsorted(self._sorted, values, side="left")]
+        right = self._cum_weights[np.searchsorted(self._sorted, values, side="right")]
+        # Los pesos retenidos no suman exactamente n tras compactar: se normaliza a n
+        scale = self.n / self._cum_weights[-1]
+        return np.minimum((left * scale + right * scale + 1) / 2 / self.n, 1.0)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        return {
+            "k": np.array(self.k),
+            "n": np.array(self.n),
+            "items": np.concatenate(self.levels),
+            "level_sizes": np.array([len(lv) for lv in self.levels], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "KLLSketch":
+        obj = cls(k=int(state["k"]))
+        obj.n = int(state["n"])
+        bounds = np.concatenate([[0], np.cumsum(state["level_sizes"])])
+        items = np.asarray(state["items"], dtype=float)
+        obj.levels = [items[bounds[h] : bounds[h + 1]] for h in range(len(bounds) - 1)]
+        return obj
+
+    def save(self, path: Path | str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, **self.get_state())
+
+    @classmethod
+    def load(cls, path: Path | str) -> "KLLSketch":
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_state({key: data[key] for key in data.files})
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark del sketch KLL frente al percentil exacto.")
+    p.add_argument("--input", default="train.csv", help="CSV/Parquet crudo (por defecto: train.csv).")
+    p.add_argument("--k", type=int, nargs="+", default=[50, 100, 200, 400], help="Valores de k a comparar.")
+    p.add_argument(
+        "--scale",
+        type=int,
+        default=100,
+        help="Multiplica el número de valores remuestreando los gastos reales (simula datasets grandes).",
+    )
+    p.add_argument("--shards", type=int, default=16, help="Shards en los que se construye y fusiona el sketch.")
+    p.add_argument("--random-state", type=int, default=42, help="Semilla del remuestreo y de los sketches.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    from create_expenses_features import transform as create_expenses
+    from dataset_io import read_dataset
+
+    df = create_expenses(read_dataset(args.input))
+    base = df.loc[df["HasExpenses"] == 1, "TotalExpenses"].to_numpy(dtype=float)
+    rng = np.random.default_rng(args.random_state)
+    values = rng.choice(base, size=len(base) * args.scale) if args.scale > 1 else base
+
+    t0 = time.perf_counter()
+    exact = pd.Series(values).rank(pct=True, method="average").to_numpy()
+    t_exact = time.perf_counter() - t0
+
+    print(f"Valores: {len(values):,} ({args.input}, scale={args.scale}); rank exacto: {t_exact * 1e3:.1f} ms")
+    print(
+        f"{'k':>6} {'retenidos':>10} {'build+merge':>12} {'consulta':>10} "
+        f"{'err medio':>10} {'err máx':>9} {'cota':>7}"
+    )
+    for k in args.k:
+        t0 = time.perf_counter()
+        sketch = KLLSketch(k=k, random_state=args.random_state)
+        for i, part in enumerate(np.array_split(values, args.shards)):
+            sketch.merge(KLLSketch(k=k, random_state=args.random_state + i + 1).update(part))
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        approx = sketch.percentil(values)
+        t_query = time.perf_counter() - t0
+
+        err = np.abs(approx - exact)
+        print(
+            f"{k:>6} {sketch.retained:>10,} {t_build * 1e3:>9.1f} ms {t_query * 1e3:>7.1f} ms "
+            f"{err.mean():>10.4f} {err.max():>9.4f} {normalized_rank_error(k):>7.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
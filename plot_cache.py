@@ -0,0 +1,197 @@
+"""
+Renderizado de gráficas en paralelo con caché por huella - Spaceship Titanic
+
+eda_analysis.py, cluster_age_groups.py, plot_age_vs_expenses.py y
+age_transported_rate_by_value.py describen cada figura como un PlotJob:
+- output: ruta del PNG
+- render: función de figures.py (importable, así los workers la encuentran
+  también cuando el script corre con runpy desde run_all.py) que recibe data y
+  params y devuelve la Figure
+- data: solo las columnas que usa la figura, o un dict de tablas ya agregadas
+  (density_grid.py) cuando el dibujo no debe depender del número de filas
+- params, dpi, style y palette
+
+Clave de cada figura: sha256 de la huella de data (stage_cache.hash_frame),
+params, dpi, estilo, paleta, nombre de la función de render, código fuente de su
+módulo (incluye los helpers de dibujo compartidos) y versión de matplotlib.
+Si coincide con la del último render y el PNG sigue en disco sin tocar (mismo
+tamaño y mtime), la figura se salta. Cambiar una columna solo invalida las
+figuras que la usan.
+
+Las figuras pendientes se renderizan en un pool de procesos con el backend Agg
+(una sola figura o workers=1: en el propio proceso). Cada render parte de
+rcdefaults() + estilo/paleta del job dentro de un rc_context, así que no hereda
+ni deja estado global de matplotlib. El PNG se escribe en un temporal y se
+renombra (nunca queda un PNG a medias con la clave nueva).
+
+Estructura en disco:
+    <cache_dir>/<sha256 de la ruta del PNG>.json  clave, tamaño y mtime del PNG
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from stage_cache import hash_frame
+
+
+DEFAULT_CACHE_DIR = ".plot_cache"
+
+
+@dataclass(frozen=True)
+class PlotJob:
+    output: str
+    render: Callable[..., Any]
+    data: pd.DataFrame | Dict[str, pd.DataFrame]
+    params: Dict[str, Any] = field(default_factory=dict)
+    dpi: int = 300
+    style: Optional[str] = None
+    palette: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PlotResult:
+    output: str
+    rendered: bool  # False: saltada por caché
+    seconds: float
+
+
+def _hash_data(data: pd.DataFrame | Dict[str, pd.DataFrame]) -> str | Dict[str, str]:
+    if isinstance(data, dict):
+        return {name: hash_frame(frame) for name, frame in data.items()}
+    return hash_frame(data)
+
+
+def plot_key(job: PlotJob) -> str:
+    """
+    Clave de la figura: datos, parámetros, estilo y código del módulo de render.
+    """
+    import matplotlib
+
+    payload = {
+        "output": str(job.output),
+        "render": f"{job.render.__module__}.{job.render.__qualname__}",
+        "source": hashlib.sha256(inspect.getsource(inspect.getmodule(job.render)).encode()).hexdigest(),
+        "data": _hash_data(job.data),
+        "params": job.params,
+        "dpi": job.dpi,
+        "style": job.style,
+        "palette": job.palette,
+        "matplotlib": matplotlib.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PlotCache:
+    """
+    Una entrada JSON por PNG con la clave de su último render.
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def _entry(self, output: str) -> Path:
+        name = hashlib.sha256(str(Path(output)).encode()).hexdigest()
+        return self.cache_dir / f"{name}.json"
+
+    def is_fresh(self, output: str, key: str) -> bool:
+        path = self._entry(output)
+        out = Path(output)
+        if not path.exists() or not out.exists():
+            return False
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return False
+        stat = out.stat()
+        return entry.get("key") == key and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+    def put(self, output: str, key: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        stat = Path(output).stat()
+        entry = {"output": str(output), "key": key, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        path = self._entry(output)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def _init_worker() -> None:
+    """
+    Backend no interactivo e importaciones pesadas una vez por worker.
+    """
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import seaborn  # noqa: F401
+
+
+def _render(job: PlotJob) -> float:
+    """
+    Renderiza y guarda una figura; devuelve los segundos empleados.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    t0 = time.perf_counter()
+    out = Path(job.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with matplotlib.rc_context():
+        matplotlib.rcdefaults()
+        if job.style:
+            plt.style.use(job.style)
+        if job.palette:
+            import seaborn as sns
+
+            sns.set_palette(job.palette)
+        fig = job.render(job.data, **job.params)
+        tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+        try:
+            fig.savefig(tmp, dpi=job.dpi, bbox_inches="tight", format=out.suffix.lstrip(".") or "png")
+            os.replace(tmp, out)
+        finally:
+            plt.close(fig)
+            if tmp.exists():
+                tmp.unlink()
+    return time.perf_counter() - t0
+
+
+def render_plots(
+    jobs: Sequence[PlotJob],
+    workers: Optional[int] = None,
+    cache_dir: str | Path | None = DEFAULT_CACHE_DIR,
+) -> List[PlotResult]:
+    """
+    Renderiza las figuras cuya clave cambió (todas si cache_dir es None) y
+    devuelve un PlotResult por job, en el orden de jobs.
+    """
+    cache = PlotCache(cache_dir) if cache_dir is not None else None
+    keys = [plot_key(job) for job in jobs]
+    pending = [i for i, job in enumerate(jobs) if cache is None or not cache.is_fresh(job.output, keys[i])]
+    seconds: Dict[int, float] = {}
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_worker) as pool:
+            for i, s in zip(pending, pool.map(_render, [jobs[i] for i in pending])):
+                seconds[i] = s
+    else:
+        for i in pending:
+            seconds[i] = _render(jobs[i])
+
+    if cache is not None:
+        for i in pending:
+            cache.put(jobs[i].output, keys[i])
+    return [PlotResult(job.output, i in seconds, seconds.get(i, 0.0)) for i, job in enumerate(jobs)]
@@ -0,0 +1,177 @@
+"""
+Resolución de hogares (HouseholdId) por componentes conexas - Spaceship Titanic
+
+Surname_Group (train9) solo une a quien comparte apellido y grupo de viaje. Aquí
+un hogar es una componente conexa del grafo de pasajeros con estas aristas:
+- familia nuclear: mismo apellido y mismo Group (Surname_Group)
+- misma cabina: mismo Deck/Num/Side
+- mismo apellido en grupos cercanos: |ΔGroup| <= --max-group-gap (reservas
+  consecutivas de la misma familia; 0 lo desactiva)
+
+Cada relación "misma clave" se expresa en estrella con group_index.GroupIndex:
+cada miembro se une al primero de su clave (como mucho n aristas por relación).
+
+Union-find vectorizado: en cada ronda la raíz mayor de cada arista cuelga de la
+menor (np.minimum.at) y los caminos se comprimen saltando punteros
+(parent = parent[parent]) hasta estabilizarse; las aristas ya unidas se
+descartan. Cada ronda es O(n + aristas) y hacen falta muy pocas, así que el
+coste total crece casi linealmente (decenas de millones de pasajeros).
+La raíz de cada componente es su fila más baja: HouseholdId numera los hogares
+1..H por orden de primera aparición.
+
+Entradas:
+- train9.csv (Surname = Apellido_Grupo) o train8.csv (Surname = apellido)
+
+Salidas:
+- train9_with_households.csv (columnas HouseholdId y HouseholdSize añadidas)
+
+Uso:
+    python resolve_households.py --input train9.csv --output train9_with_households.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+from group_index import GroupIndex
+from key_consistency import key_consistency
+
+
+CABIN_KEY = ["Deck", "Num", "Side"]
+
+
+def surname_codes(surname: pd.Series) -> np.ndarray:
+    """
+    Código del apellido original por fila (-1 = nulo). Acepta Surname (train8) o
+    Surname_Group (train9): el sufijo _<grupo> se quita sobre el vocabulario.
+    """
+    codes, uniques = pd.factorize(surname)
+    base_codes, _ = pd.factorize(pd.Index(uniques).astype(str).str.replace(r"_\d+$", "", regex=True))
+    return np.where(codes >= 0, base_codes[codes], -1)
+
+
+def _star_edges(index: GroupIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cada fila del índice unida a la primera fila de su grupo (sin lazos).
+    """
+    rows = index.positions
+    first = np.repeat(rows[index.starts], index.sizes)
+    keep = rows != first
+    return rows[keep], first[keep]
+
+
+def household_edges(
+    df: pd.DataFrame, max_group_gap: int = 1, cabin: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aristas (u, v) entre filas (posicionales) de un mismo hogar.
+    """
+    codes = surname_codes(df["Surname"])
+    keys = pd.DataFrame(
+        {"SurnameCode": pd.arrays.IntegerArray(codes, codes < 0), "Group": df["Group"].to_numpy()}
+    )
+    family = GroupIndex.from_frame(keys, ["SurnameCode", "Group"])
+    edges: List[Tuple[np.ndarray, np.ndarray]] = [_star_edges(family)]
+
+    if max_group_gap > 0 and len(family) > 1:
+        # Segmentos (apellido, grupo) consecutivos del mismo apellido y grupos cercanos
+        first = family.positions[family.starts]
+        s = family.keys["SurnameCode"].to_numpy(dtype=np.int64)
+        g = family.keys["Group"].to_numpy(dtype=np.int64)
+        near = (s[1:] == s[:-1]) & (g[1:] - g[:-1] <= max_group_gap)
+        edges.append((first[1:][near], first[:-1][near]))
+
+    if cabin:
+        edges.append(_star_edges(GroupIndex.from_frame(df, CABIN_KEY)))
+
+    u = np.concatenate([e[0] for e in edges])
+    v = np.concatenate([e[1] for e in edges])
+    return u, v
+
+
+def connected_components(n: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Raíz de la componente de cada nodo 0..n-1 (su nodo más bajo).
+    """
+    parent = np.arange(n)
+    while len(u):
+        ru, rv = parent[u], parent[v]
+        live = ru != rv
+        if not live.any():
+            break
+        u, v, ru, rv = u[live], v[live], ru[live], rv[live]
+        np.minimum.at(parent, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return parent
+
+
+def transform(df: pd.DataFrame, max_group_gap: int = 1, cabin: bool = True) -> pd.DataFrame:
+    """
+    Añade HouseholdId (1..H, orden de primera aparición) y HouseholdSize.
+    """
+    df = df.copy()
+    n = len(df)
+    root = connected_components(n, *household_edges(df, max_group_gap=max_group_gap, cabin=cabin))
+    household = np.cumsum(root == np.arange(n))[root]
+    df["HouseholdId"] = household
+    df["HouseholdSize"] = np.bincount(household)[household]
+    return df
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Hogares por componentes conexas (apellido, grupo y cabina).")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet de entrada (por defecto: train9.csv).")
+    p.add_argument("--output", default="train9_with_households.csv", help="CSV de salida con HouseholdId.")
+    p.add_argument(
+        "--max-group-gap",
+        type=int,
+        default=1,
+        help="Une el mismo apellido en grupos a esta distancia como máximo (0 = no).",
+    )
+    p.add_argument("--no-cabin", action="store_true", help="No unir a quienes comparten cabina.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+    df = read_dataset(input_path)
+    missing = sorted({"Group", "Surname", *([] if args.no_cabin else CABIN_KEY)} - set(df.columns))
+    if missing:
+        raise ValueError(f"Columnas inexistentes en el dataset: {', '.join(missing)}")
+
+    t0 = time.perf_counter()
+    df_out = transform(df, max_group_gap=args.max_group_gap, cabin=not args.no_cabin)
+    elapsed = time.perf_counter() - t0
+    df_out.to_csv(args.output, index=False)
+
+    households = key_consistency(df_out, "HouseholdId")
+    sizes = households["Size"]
+    multi = households[sizes > 1]
+
+    print("✓ Hogares resueltos")
+    print(f"  - input:   {input_path} ({len(df)} filas, {elapsed * 1e3:.1f} ms)")
+    print(f"  - hogares: {len(households)} ({len(multi)} de 2+ personas, máximo {sizes.max()} personas)")
+    if "Transported" in df_out.columns and len(multi):
+        print(f"  - mismo Transported (2+ personas): {multi['AllSame'].mean() * 100:.2f}%")
+    print(f"  - output:  {args.output}")
+    print("\nHogares por tamaño:")
+    print(sizes.value_counts().sort_index().head(15).to_string())
+
+
+if __name__ == "__main__":
+    main()
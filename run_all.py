@@ -0,0 +1,212 @@
+"""
+Planificador: pipeline de features + scripts de análisis en paralelo.
+
+Objetivo:
+- Ejecutar las etapas de features en el proceso principal (en memoria, como
+  run_pipeline.py) escribiendo solo los trainN que necesitan los análisis.
+- Lanzar cada script de análisis en un pool de procesos en cuanto su entrada
+  está lista, solapándose con las etapas restantes:
+    --input   → eda_analysis.py
+    train7    → analyze_group_transported.py
+    train8    → analyze_surname_transported.py
+    train9    → analyze_family_group_transported.py, cluster_age_groups.py
+                (k automático y k=5), age_transported_rate_by_value.py,
+                target_rates.py, transported_cube.py, resolve_households.py,
+                cabin_neighbours.py, target_encoding.py, plot_age_vs_expenses.py
+- Cada script recibe por argumento las rutas de esta ejecución: --input (y no
+  train.csv fijo) y los trainN en el formato de --format.
+- Los workers importan pandas/matplotlib (Agg)/sklearn una sola vez y reutilizan
+  esas importaciones entre scripts; el estado global de matplotlib y de las
+  opciones de pandas se restablece antes de cada script.
+
+El tiempo total tiende al de la rama más larga en vez de a la suma de todas.
+La salida de cada script se guarda en <logs-dir>/<tarea>.log.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import runpy
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dataset_io import FORMATS, read_dataset, with_format, write_dataset
+from run_pipeline import STAGES, stage_transform
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class AnalysisTask:
+    name: str
+    script: str
+    needs: str  # archivo de etapa ("train.csv", "train7.csv", ...)
+    # {train}, {train7}, ... se sustituyen por las rutas de etapa de esta ejecución
+    argv: Tuple[str, ...] = field(default_factory=tuple)
+
+
+ANALYSIS_TASKS: List[AnalysisTask] = [
+    AnalysisTask("eda_analysis", "eda_analysis.py", "train.csv", ("--input", "{train}")),
+    AnalysisTask("analyze_group", "analyze_group_transported.py", "train7.csv", ("--input", "{train7}")),
+    AnalysisTask("analyze_surname", "analyze_surname_transported.py", "train8.csv", ("--input", "{train8}")),
+    AnalysisTask("analyze_family_group", "analyze_family_group_transported.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("cluster_age_groups", "cluster_age_groups.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask(
+        "cluster_age_groups_k5",
+        "cluster_age_groups.py",
+        "train9.csv",
+        (
+            "--input", "{train9}",
+            "--k", "5",
+            "--output", "train9_with_age_clusters_k5.csv",
+            "--summary", "age_cluster_summary_k5.csv",
+            "--model", "age_cluster_model_k5.npz",
+            # Gráficas propias: corre a la vez que cluster_age_groups y ambas
+            # escribirían (y se invalidarían en .plot_cache) los mismos PNG
+            "--plots-dir", "plots/k5",
+        ),
+    ),
+    AnalysisTask("age_transported_rate", "age_transported_rate_by_value.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("target_rates", "target_rates.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("transported_cube", "transported_cube.py", "train9.csv", ("build", "--input", "{train9}")),
+    AnalysisTask("resolve_households", "resolve_households.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("cabin_neighbours", "cabin_neighbours.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("target_encoding", "target_encoding.py", "train9.csv", ("--input", "{train9}")),
+    AnalysisTask("plot_age_vs_expenses", "plot_age_vs_expenses.py", "train9.csv", ("--input", "{train9}")),
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Pipeline de features + análisis en paralelo.")
+    p.add_argument("--input", default="train.csv", help="CSV de entrada del pipeline (por defecto: train.csv).")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=min(len(ANALYSIS_TASKS), os.cpu_count() or 1),
+        help="Procesos del pool de análisis.",
+    )
+    p.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        default="csv",
+        help="Formato de los trainN escritos para los análisis.",
+    )
+    p.add_argument(
+        "--skip-pipeline",
+        action="store_true",
+        help="No ejecutar las etapas: usar los trainN existentes y lanzar todos los análisis.",
+    )
+    p.add_argument("--only", nargs="+", default=None, metavar="TAREA", help="Ejecutar solo estas tareas de análisis.")
+    p.add_argument("--logs-dir", default="logs", help="Directorio para la salida de cada script.")
+    return p.parse_args()
+
+
+def _init_worker() -> None:
+    """
+    Importaciones pesadas una vez por worker (backend no interactivo).
+    """
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import pandas  # noqa: F401
+    import seaborn  # noqa: F401
+    import sklearn.cluster  # noqa: F401
+    import sklearn.metrics  # noqa: F401
+
+
+def _run_script(name: str, script: str, argv: Tuple[str, ...], log_path: str) -> Tuple[str, float]:
+    """
+    Ejecuta un script como __main__ dentro del worker y devuelve (tarea, segundos).
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    # Restablecer estado global que otros scripts pudieron modificar (estilos, opciones de display)
+    matplotlib.rcdefaults()
+    pd.reset_option("^display")
+
+    t0 = time.perf_counter()
+    old_argv = sys.argv
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        sys.argv = [script, *argv]
+        try:
+            runpy.run_path(str(SCRIPTS_DIR / script), run_name="__main__")
+        finally:
+            sys.argv = old_argv
+            plt.close("all")
+    return name, time.perf_counter() - t0
+
+
+def main() -> None:
+    args = _parse_args()
+    t_start = time.perf_counter()
+
+    tasks = ANALYSIS_TASKS
+    if args.only:
+        unknown = set(args.only) - {t.name for t in ANALYSIS_TASKS}
+        if unknown:
+            raise ValueError(f"Tareas desconocidas: {', '.join(sorted(unknown))}")
+        tasks = [t for t in ANALYSIS_TASKS if t.name in args.only]
+
+    needed = {t.needs for t in tasks}
+    stage_files = {out: with_format(out, args.format) for _, out in STAGES}
+    stage_files["train.csv"] = args.input
+    # Rutas de esta ejecución para los {train}, {train7}, ... de AnalysisTask.argv
+    stage_paths = {Path(name).stem: str(path) for name, path in stage_files.items()}
+    logs_dir = Path(args.logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    pending: List[AnalysisTask] = list(tasks)
+    futures: Dict[Future, AnalysisTask] = {}
+    ready = {"train.csv"}
+
+    def _submit_ready(pool: ProcessPoolExecutor) -> None:
+        for task in [t for t in pending if t.needs in ready]:
+            argv = tuple(a.format(**stage_paths) for a in task.argv)
+            log_path = str(logs_dir / f"{task.name}.log")
+            futures[pool.submit(_run_script, task.name, task.script, argv, log_path)] = task
+            pending.remove(task)
+            print(f"  → {task.name} lanzado ({task.needs} listo, {time.perf_counter() - t_start:.1f}s)")
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=_init_worker) as pool:
+        if args.skip_pipeline:
+            ready.update(stage_files)
+            _submit_ready(pool)
+        else:
+            _submit_ready(pool)
+            df = read_dataset(args.input)
+            for stage, output_file in STAGES:
+                df = stage_transform(stage)(df)
+                if output_file in needed or output_file == STAGES[-1][1]:
+                    write_dataset(df, stage_files[output_file])
+                    print(f"  ✓ {stage} → {stage_files[output_file]} ({time.perf_counter() - t_start:.1f}s)")
+                ready.add(output_file)
+                _submit_ready(pool)
+
+        failures = []
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                name, seconds = future.result()
+                print(f"  ✓ {name}: {seconds:.1f}s (log: {logs_dir / (name + '.log')})")
+            except Exception as exc:  # noqa: BLE001 - se informa y se sigue con el resto
+                failures.append(task.name)
+                print(f"  ✗ {task.name}: {type(exc).__name__}: {exc} (log: {logs_dir / (task.name + '.log')})")
+
+    print(f"\n✓ Completado en {time.perf_counter() - t_start:.1f}s ({len(futures)} análisis, {args.workers} workers)")
+    if failures:
+        raise SystemExit(f"Fallaron {len(failures)} análisis: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Runner en memoria del pipeline de features - Spaceship Titanic
+
+Objetivo:
+- Ejecutar la cadena completa train.csv → train10.csv pasando un único DataFrame
+  por todas las etapas, sin leer/escribir los CSV intermedios.
+- Cada etapa reutiliza la función transform(df) de su script:
+    create_expenses_features → split_cabin_column → move_transported_to_end →
+    convert_num_to_int → convert_age_to_int → split_passenger_id →
+    add_group_size → extract_surname → add_group_to_surname →
+    create_spending_percentil
+
+Entradas:
+- train.csv (por defecto)
+
+Salidas:
+- train10.csv (por defecto; train10.parquet con --format parquet)
+- trainN.csv / trainN.parquet intermedios solo si se piden con --dump / --dump-all (depuración)
+- .stage_cache/ con las salidas por etapa si se usa --cache (ver stage_cache.py):
+  una etapa solo se re-ejecuta si cambian sus datos de entrada, sus parámetros o
+  el código de su script, de los módulos locales que importa o de dataset_io.py
+- con --chunksize N se procesa por bloques de grupos completos y memoria acotada
+  (ver streaming.py); solo salida CSV
+
+Notas:
+- Los valores son los mismos que los de la cadena de scripts, pero los tipos se
+  conservan entre etapas (p.ej. Num/Age siguen siendo Int64 en vez de volver a
+  float al releer el CSV).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from dataset_io import FORMATS, read_dataset, with_format, write_dataset
+from percentile_sketch import DEFAULT_K
+from stage_cache import DEFAULT_CACHE_DIR, StageCache, hash_file, stage_key
+
+
+# (script de la etapa, CSV intermedio que genera en la cadena original)
+STAGES: List[Tuple[str, str]] = [
+    ("create_expenses_features", "train1.csv"),
+    ("split_cabin_column", "train2.csv"),
+    ("move_transported_to_end", "train3.csv"),
+    ("convert_num_to_int", "train4.csv"),
+    ("convert_age_to_int", "train5.csv"),
+    ("split_passenger_id", "train6.csv"),
+    ("add_group_size", "train7.csv"),
+    ("extract_surname", "train8.csv"),
+    ("add_group_to_surname", "train9.csv"),
+    ("create_spending_percentil", "train10.csv"),
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Ejecuta el pipeline de features en memoria (train.csv → train10.csv).")
+    p.add_argument("--input", default="train.csv", help="CSV/Parquet de entrada (por defecto: train.csv).")
+    p.add_argument(
+        "--output",
+        default=None,
+        help="Archivo de salida final (por defecto: train10.csv o train10.parquet según --format).",
+    )
+    p.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        default="csv",
+        help="Formato de la salida y los intermedios: csv o parquet (columnar, conserva tipos).",
+    )
+    p.add_argument(
+        "--dump",
+        nargs="+",
+        default=[],
+        metavar="TRAIN_N",
+        help="Intermedios a volcar para depuración (p.ej. train3.csv train6 o 6).",
+    )
+    p.add_argument("--dump-all", action="store_true", help="Vuelca todos los intermedios train1..train9.")
+    p.add_argument("--dump-dir", default=".", help="Directorio donde volcar los intermedios.")
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reutiliza las salidas de etapas cuyo input, parámetros y código no han cambiado.",
+    )
+    p.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directorio de la caché de etapas.")
+    p.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Modo streaming: filas por bloque (los bloques nunca parten un Group).",
+    )
+    p.add_argument(
+        "--percentile",
+        choices=["exact", "sketch"],
+        default="exact",
+        help="Modo streaming: SpendingPercentil exacto o estimado con un sketch KLL (memoria acotada).",
+    )
+    p.add_argument("--sketch-k", type=int, default=DEFAULT_K, help="Parámetro k del sketch KLL (más k = menos error).")
+    return p.parse_args()
+
+
+def stage_transform(stage: str) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """
+    Devuelve la función transform(df) del script de la etapa.
+    """
+    return importlib.import_module(stage).transform
+
+
+def normalize_dump_names(names: Iterable[str]) -> set:
+    """
+    Acepta "train6.csv", "train6" o "6" y devuelve el nombre de archivo canónico.
+    """
+    valid = {out for _, out in STAGES}
+    out = set()
+    for name in names:
+        name = str(name)
+        if name.isdigit():
+            name = f"train{name}"
+        if not name.endswith(".csv"):
+            name = f"{name}.csv"
+        if name not in valid:
+            raise ValueError(f"Intermedio desconocido: {name} (válidos: {', '.join(sorted(valid))})")
+        out.add(name)
+    return out
+
+
+def _dump(df: pd.DataFrame, output_file: str, dump_dir: Path, fmt: str) -> None:
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    path = write_dataset(df, dump_dir / with_format(output_file, fmt))
+    print(f"  - dump: {path}")
+
+
+def run_pipeline(
+    df: pd.DataFrame,
+    dump: Iterable[str] = (),
+    dump_dir: Path = Path("."),
+    fmt: str = "csv",
+) -> pd.DataFrame:
+    """
+    Pasa df por todas las etapas en orden y devuelve el resultado final (train10).
+    Los intermedios indicados en dump se escriben en dump_dir con el formato fmt.
+    """
+    dump = normalize_dump_names(dump)
+    for stage, output_file in STAGES:
+        df = stage_transform(stage)(df)
+        if output_file in dump:
+            _dump(df, output_file, dump_dir, fmt)
+    return df
+
+
+def run_pipeline_cached(
+    input_path: Path,
+    cache: StageCache,
+    dump: Iterable[str] = (),
+    dump_dir: Path = Path("."),
+    fmt: str = "csv",
+    params: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> pd.DataFrame:
+    """
+    Igual que run_pipeline, pero saltando las etapas cuya clave ya está en la caché.
+
+    Los DataFrames se cargan de forma perezosa: una racha de aciertos solo encadena
+    hashes, y se lee del disco únicamente la salida necesaria para la primera etapa
+    que falle (o para la salida final / los intermedios pedidos).
+    """
+    dump = normalize_dump_names(dump)
+    params = params or {}
+
+    input_hash = hash_file(input_path)
+    df: Optional[pd.DataFrame] = None
+    # Etapa/clave cuya salida representa el estado actual (None = el CSV de entrada)
+    current: Optional[Tuple[str, str]] = None
+
+    def _materialize() -> pd.DataFrame:
+        if current is None:
+            return read_dataset(input_path)
+        return cache.load(*current)
+
+    for stage, output_file in STAGES:
+        key = stage_key(stage, input_hash, params.get(stage))
+        entry = cache.lookup(stage, key)
+        if entry is not None:
+            print(f"  - {stage}: caché")
+            input_hash = entry["output_hash"]
+            df = None
+        else:
+            print(f"  - {stage}: ejecutando")
+            if df is None:
+                df = _materialize()
+            df = stage_transform(stage)(df)
+            input_hash = cache.store(stage, key, df)
+        current = (stage, key)
+
+        if output_file in dump:
+            if df is None:
+                df = _materialize()
+            _dump(df, output_file, dump_dir, fmt)
+
+    return df if df is not None else _materialize()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+    dump = [out for _, out in STAGES[:-1]] if args.dump_all else args.dump
+    output = args.output or with_format(STAGES[-1][1], args.format)
+    dump_dir = Path(args.dump_dir)
+
+    if args.chunksize is not None:
+        # Importación diferida: streaming.py depende de este módulo
+        from streaming import run_pipeline_streaming
+
+        if args.cache or args.format != "csv" or Path(output).suffix != ".csv":
+            raise ValueError("El modo streaming (--chunksize) solo admite salida CSV y no usa --cache")
+        n_rows = run_pipeline_streaming(
+            input_path,
+            output,
+            chunksize=args.chunksize,
+            dump=dump,
+            dump_dir=dump_dir,
+            percentile=args.percentile,
+            sketch_k=args.sketch_k,
+        )
+        print("✓ Pipeline completado (streaming)")
+        print(f"  - input:     {input_path}")
+        print(f"  - chunksize: {args.chunksize}")
+        print(f"  - percentil: {args.percentile}" + (f" (k={args.sketch_k})" if args.percentile == "sketch" else ""))
+        print(f"  - output:    {output} ({n_rows} filas)")
+        return
+
+    if args.percentile != "exact":
+        raise ValueError("--percentile sketch solo se aplica en modo streaming (--chunksize)")
+
+    if args.cache:
+        df_out = run_pipeline_cached(input_path, StageCache(args.cache_dir), dump=dump, dump_dir=dump_dir, fmt=args.format)
+    else:
+        df = read_dataset(input_path)
+        df_out = run_pipeline(df, dump=dump, dump_dir=dump_dir, fmt=args.format)
+    write_dataset(df_out, output)
+
+    print("✓ Pipeline completado")
+    print(f"  - input:  {input_path}")
+    print(f"  - etapas: {len(STAGES)}")
+    print(f"  - output: {output} ({df_out.shape[0]} filas × {df_out.shape[1]} columnas)")
+
+
+if __name__ == "__main__":
+    main()
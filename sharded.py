@@ -0,0 +1,220 @@
+"""
+Procesamiento por shards (varios CSV) con fusión en dos fases - Spaceship Titanic
+
+Problema: un mismo Group puede quedar repartido entre shards, así que GroupSize
+(add_group_size.py), los conteos por apellido (analyze_surname_transported.py)
+y SpendingPercentil (rango global) salen mal si cada shard se procesa solo.
+
+Fases:
+1. Local (en paralelo, un proceso por shard): etapas sin estado train.csv → train9
+   y agregados parciales:
+     - conteo por Group
+     - por Surname (apellido original, train8): pasajeros, Transported True/False
+     - pares distintos (Surname, Group)
+     - TotalExpenses de quienes gastan (o un sketch KLL con --percentile sketch)
+2. Fusión (proceso principal): suma de conteos por Group, agregados por Surname
+   reconciliados (tabla de surname_transported_analysis.csv) y array de gasto
+   global ordenado (o sketches fusionados).
+3. Difusión (en paralelo): cada shard recibe GroupSize global y SpendingPercentil
+   global; la salida final concatena los shards en el orden dado.
+
+El resultado es idéntico al pipeline en memoria sobre la concatenación de shards
+(salvo SpendingPercentil con --percentile sketch, que es aproximado).
+
+Uso:
+    python sharded.py --shards manifest_00.csv manifest_01.csv ... --output train10.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from create_spending_percentil import spending_percentil
+from dataset_io import read_dataset, write_dataset
+from percentile_sketch import DEFAULT_K, KLLSketch
+from run_pipeline import STAGES, stage_transform
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Pipeline por shards con fusión exacta de Group/Surname.")
+    p.add_argument("--shards", nargs="+", required=True, help="CSV/Parquet crudos (formato train.csv), en orden.")
+    p.add_argument("--output", default="train10.csv", help="Salida concatenada (por defecto: train10.csv).")
+    p.add_argument(
+        "--surname-output",
+        default=None,
+        help="Opcional: tabla global por apellido (formato surname_transported_analysis.csv).",
+    )
+    p.add_argument(
+        "--percentile",
+        choices=["exact", "sketch"],
+        default="exact",
+        help="SpendingPercentil exacto (todos los gastos) o con sketches KLL por shard fusionados.",
+    )
+    p.add_argument("--sketch-k", type=int, default=DEFAULT_K, help="Parámetro k del sketch KLL.")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos para las fases local y de difusión.",
+    )
+    return p.parse_args()
+
+
+def surname_partials(df8: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Agregados parciales por Surname (apellido original) de un shard en formato train8:
+    - counts: Surname, TotalPeople, TransportedCount (solo si existe Transported)
+    - pairs: pares distintos (Surname, Group)
+    """
+    d = df8.loc[df8["Surname"].notna()]
+    if "Transported" in d.columns:
+        t = d["Transported"]
+        counts = (
+            d.assign(_count=t.notna().astype(int), _true=(t == True).astype(int))  # noqa: E712
+            .groupby("Surname")[["_count", "_true"]]
+            .sum()
+            .rename(columns={"_count": "TotalPeople", "_true": "TransportedCount"})
+        )
+    else:
+        counts = d.groupby("Surname").size().to_frame("TotalPeople").assign(TransportedCount=0)
+    pairs = d[["Surname", "Group"]].drop_duplicates()
+    return counts, pairs
+
+
+def merge_surname_partials(parts: Sequence[Tuple[pd.DataFrame, pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Reconcilia los parciales por Surname en la tabla de analyze_surname_transported.py:
+    Surname, UniqueTransported, TransportedCount, TotalPeople, UniqueGroups,
+    AllSameTransported, NotTransportedCount.
+    """
+    counts = pd.concat([c for c, _ in parts]).groupby(level=0).sum()
+    pairs = pd.concat([p for _, p in parts]).drop_duplicates()
+    unique_groups = pairs.groupby("Surname")["Group"].nunique()
+
+    details = counts.join(unique_groups.rename("UniqueGroups")).reset_index()
+    not_transported = details["TotalPeople"] - details["TransportedCount"]
+    details["UniqueTransported"] = (details["TransportedCount"] > 0).astype(int) + (not_transported > 0).astype(int)
+    details = details[["Surname", "UniqueTransported", "TransportedCount", "TotalPeople", "UniqueGroups"]]
+    details["AllSameTransported"] = details["UniqueTransported"] == 1
+    details["NotTransportedCount"] = details["TotalPeople"] - details["TransportedCount"]
+    return details.sort_values("Surname").reset_index(drop=True)
+
+
+def _local_phase(shard: str, spool: str, sketch_k: Optional[int] = None) -> Dict[str, object]:
+    """
+    Fase 1 (worker): etapas sin estado + parciales. El train9 local se guarda en spool.
+    Con sketch_k el gasto se resume en el estado de un KLLSketch en vez de un array.
+    """
+    df = read_dataset(shard)
+    partials: Dict[str, object] = {}
+    for stage, output_file in STAGES[:-1]:
+        df = stage_transform(stage)(df)
+        if output_file == "train8.csv":
+            partials["surname"] = surname_partials(df)
+    partials["group_counts"] = df.groupby("Group").size()
+    spenders = df["HasExpenses"] == 1
+    spend = df.loc[spenders, "TotalExpenses"].to_numpy(dtype=float)
+    if sketch_k is not None:
+        partials["sketch"] = KLLSketch(k=sketch_k, random_state=0).update(spend).get_state()
+    else:
+        partials["spend"] = spend
+    df.to_pickle(spool)
+    return partials
+
+
+def _broadcast_phase(spool: str, group_counts: pd.Series, reference: np.ndarray | KLLSketch, out: str) -> int:
+    """
+    Fase 3 (worker): GroupSize y SpendingPercentil globales sobre el shard local.
+    reference es el array global ordenado de gastos o el sketch fusionado.
+    """
+    df = pd.read_pickle(spool)
+    df["GroupSize"] = group_counts.reindex(df["Group"]).to_numpy()
+    df["SpendingPercentil"] = 0.0
+    spenders = (df["HasExpenses"] == 1).to_numpy()
+    if spenders.any():
+        values = df.loc[spenders, "TotalExpenses"].to_numpy(dtype=float)
+        df.loc[spenders, "SpendingPercentil"] = (
+            reference.percentil(values) if isinstance(reference, KLLSketch) else spending_percentil(values, reference)
+        )
+    df.to_pickle(out)
+    return len(df)
+
+
+def run_sharded(
+    shards: Sequence[str],
+    output: Path | str,
+    workers: int = 1,
+    percentile: str = "exact",
+    sketch_k: int = DEFAULT_K,
+) -> Tuple[int, pd.Series, pd.DataFrame]:
+    """
+    Ejecuta las tres fases y escribe la salida concatenada. Devuelve
+    (filas, conteos globales por Group, tabla global por Surname).
+    Con percentile="sketch" cada shard envía un sketch KLL en vez de sus gastos.
+    """
+    with tempfile.TemporaryDirectory(prefix="spaceship_shards_") as tmp, ProcessPoolExecutor(
+        max_workers=max(1, workers)
+    ) as pool:
+        local_spools = [str(Path(tmp) / f"local_{i:05d}.pkl") for i in range(len(shards))]
+        final_spools = [str(Path(tmp) / f"final_{i:05d}.pkl") for i in range(len(shards))]
+
+        # Fase 1: local
+        k = sketch_k if percentile == "sketch" else None
+        partials = list(pool.map(_local_phase, shards, local_spools, [k] * len(shards)))
+
+        # Fase 2: fusión
+        group_counts = pd.concat([p["group_counts"] for p in partials]).groupby(level=0).sum()
+        surname_details = merge_surname_partials([p["surname"] for p in partials])
+        if percentile == "sketch":
+            reference = KLLSketch(k=sketch_k, random_state=0)
+            for p in partials:
+                reference.merge(KLLSketch.from_state(p["sketch"]))
+        else:
+            spend = [p["spend"] for p in partials]
+            reference = np.sort(np.concatenate(spend)) if spend else np.array([], dtype=float)
+
+        # Fase 3: difusión
+        n = len(shards)
+        n_rows = sum(pool.map(_broadcast_phase, local_spools, [group_counts] * n, [reference] * n, final_spools))
+
+        output = Path(output)
+        if output.suffix == ".csv":
+            for i, spool in enumerate(final_spools):
+                pd.read_pickle(spool).to_csv(output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        else:
+            write_dataset(pd.concat([pd.read_pickle(s) for s in final_spools], ignore_index=True), output)
+
+    return n_rows, group_counts, surname_details
+
+
+def main() -> None:
+    args = _parse_args()
+    missing = [s for s in args.shards if not Path(s).exists()]
+    if missing:
+        raise FileNotFoundError(f"No existen los shards: {', '.join(missing)}")
+
+    n_rows, group_counts, surname_details = run_sharded(
+        args.shards, args.output, workers=args.workers, percentile=args.percentile, sketch_k=args.sketch_k
+    )
+    if args.surname_output:
+        surname_details.to_csv(args.surname_output, index=False)
+
+    print("✓ Pipeline por shards completado")
+    print(f"  - shards:  {len(args.shards)} ({args.workers} workers)")
+    print(f"  - grupos:  {len(group_counts)}")
+    print(f"  - percentil: {args.percentile}" + (f" (k={args.sketch_k})" if args.percentile == "sketch" else ""))
+    print(f"  - output:  {args.output} ({n_rows} filas)")
+    if args.surname_output:
+        print(f"  - surname: {args.surname_output} ({len(surname_details)} apellidos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Caché por contenido para las etapas del pipeline (build graph).
+
+Cada etapa se identifica por una clave sha256 de:
+- hash de los datos de entrada (bytes del CSV para la primera etapa, hash del
+  DataFrame producido por la etapa anterior para las siguientes)
+- parámetros de la etapa
+- código fuente del script de la etapa, de los módulos locales que importa
+  (directa o indirectamente, p.ej. create_spending_percentil desde otro script) y
+  de dataset_io.py, cuyo esquema COMPACT_DTYPES fija los tipos con que se leen
+  los datos
+
+Si la clave ya existe en el directorio de caché, se reutiliza la salida guardada
+(pickle, conserva los tipos) en vez de recalcular. El hash de la salida se guarda
+junto a ella, así que una cadena de aciertos no necesita cargar ningún DataFrame:
+solo se carga la salida de la última etapa cacheada antes del primer fallo.
+
+Estructura en disco:
+    <cache_dir>/<etapa>/<clave>.pkl   salida de la etapa
+    <cache_dir>/<etapa>/<clave>.json  metadatos (hash de salida, filas, columnas)
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = ".stage_cache"
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    sha256 de los bytes de un archivo (sin parsearlo).
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    sha256 del contenido de un DataFrame: columnas, tipos y valores fila a fila.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy(dtype=np.uint64)
+    h.update(row_hashes.tobytes())
+    return h.hexdigest()
+
+
+def _local_imports(path: Path) -> List[Path]:
+    """
+    Módulos importados por path que son scripts del mismo directorio (import x /
+    from x import y); los de la biblioteca estándar y de terceros se ignoran.
+    """
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    return [path.parent / f"{name}.py" for name in sorted(names) if (path.parent / f"{name}.py").exists()]
+
+
+def source_files(stage: str) -> List[Path]:
+    """
+    Script de la etapa, los módulos locales que importa (cierre transitivo) y
+    dataset_io.py (esquema con que se leen los datos), ordenados por nombre.
+    """
+    root = Path(inspect.getsourcefile(importlib.import_module(stage)))
+    pending = [root, root.parent / "dataset_io.py"]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        pending.extend(_local_imports(path))
+    return sorted(seen, key=lambda p: p.name)
+
+
+def hash_source(stage: str) -> str:
+    """
+    sha256 del código fuente de la etapa y de sus dependencias locales (source_files).
+    """
+    h = hashlib.sha256()
+    for path in source_files(stage):
+        h.update(f"{path.name}:{hash_file(path)}\n".encode())
+    return h.hexdigest()
+
+
+def stage_key(stage: str, input_hash: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Clave de la etapa: combina hash de entrada, parámetros y código fuente.
+    """
+    payload = {
+        "stage": stage,
+        "input": input_hash,
+        "params": params or {},
+        "source": hash_source(stage),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Almacén de salidas de etapas direccionado por clave.
+    """
+
+    def __init__(self, cache_dir: Path | str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, stage: str, key: str) -> tuple[Path, Path]:
+        base = self.cache_dir / stage
+        return base / f"{key}.pkl", base / f"{key}.json"
+
+    def lookup(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve los metadatos de la entrada si existe (sin cargar los datos), o None.
+        """
+        data_path, meta_path = self._paths(stage, key)
+        if not (data_path.exists() and meta_path.exists()):
+            return None
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def load(self, stage: str, key: str) -> pd.DataFrame:
+        data_path, _ = self._paths(stage, key)
+        return pd.read_pickle(data_path)
+
+    def store(self, stage: str, key: str, df: pd.DataFrame) -> str:
+        """
+        Guarda la salida de la etapa y devuelve su hash de contenido.
+        """
+        data_path, meta_path = self._paths(stage, key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        output_hash = hash_frame(df)
+        df.to_pickle(data_path)
+        meta = {
+            "stage": stage,
+            "output_hash": output_hash,
+            "rows": int(df.shape[0]),
+            "columns": [str(c) for c in df.columns],
+        }
+        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return output_hash
@@ -0,0 +1,168 @@
+"""
+Modo streaming del pipeline: procesa manifiestos que no caben en memoria.
+
+- El CSV se lee por bloques (pd.read_csv(chunksize=...)) y un bloque nunca corta
+  un Group por la mitad: las filas del último Group de cada bloque se retienen y
+  se anteponen al siguiente. Requiere que PassengerId/Group esté ordenado por
+  grupo (como en train.csv/test.csv); si no lo está se lanza un error.
+- Con grupos completos en cada bloque, las etapas 1..9 (incluidas las que
+  dependen del grupo: add_group_size y add_group_to_surname) dan exactamente el
+  mismo resultado por bloque que sobre el dataset completo.
+- SpendingPercentil es un rango global: en la primera pasada se guardan los
+  bloques de train9 en un directorio temporal (pickle, conserva tipos) y los
+  TotalExpenses de quienes gastan; en la segunda pasada se asigna el percentil con
+  searchsorted sobre esos valores ordenados (create_spending_percentil.spending_percentil).
+
+Con percentile="sketch" (percentile_sketch.KLLSketch) no se guardan los gastos:
+memoria O(k) para el percentil, con error de rango acotado (ver ese módulo).
+
+Cada bloque se convierte al esquema compacto de dataset_io (COMPACT_DTYPES).
+
+Memoria: un bloque (más el grupo retenido) y el array de gastos (8 bytes por
+pasajero con gastos). La salida es idéntica a la del runner en memoria.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from create_spending_percentil import spending_percentil
+from dataset_io import compact_dtypes
+from percentile_sketch import DEFAULT_K, KLLSketch
+from run_pipeline import STAGES, normalize_dump_names, stage_transform
+
+
+DEFAULT_CHUNKSIZE = 100_000
+PERCENTILE_MODES = ("exact", "sketch")
+
+# Tipos fijos del CSV crudo: evita que la inferencia cambie entre bloques
+# (p.ej. una columna de texto sin valores en un bloque se leería como float).
+RAW_DTYPES: Dict[str, object] = {
+    "PassengerId": str,
+    "HomePlanet": str,
+    "Cabin": str,
+    "Destination": str,
+    "Name": str,
+    "Age": float,
+    "RoomService": float,
+    "FoodCourt": float,
+    "ShoppingMall": float,
+    "Spa": float,
+    "VRDeck": float,
+}
+
+
+def group_ids(df: pd.DataFrame) -> np.ndarray:
+    """
+    Group de cada fila: columna Group si existe, si no el prefijo de PassengerId.
+    """
+    if "Group" in df.columns:
+        return df["Group"].to_numpy(dtype=np.int64)
+    return df["PassengerId"].str.split("_", n=1).str[0].astype(int).to_numpy(dtype=np.int64)
+
+
+def iter_group_chunks(
+    path: Path | str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dtype: Optional[Dict[str, object]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Itera bloques de ~chunksize filas sin partir ningún Group entre dos bloques.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize debe ser >= 1")
+
+    carry: Optional[pd.DataFrame] = None
+    last_emitted: Optional[int] = None
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=dtype):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+        groups = group_ids(chunk)
+        if (np.diff(groups) < 0).any() or (last_emitted is not None and groups[0] <= last_emitted):
+            raise ValueError(f"{path} no está ordenado por Group: el modo streaming requiere grupos contiguos")
+
+        # Retener el último grupo (puede continuar en el siguiente bloque)
+        cut = int(np.searchsorted(groups, groups[-1], side="left"))
+        carry = chunk.iloc[cut:]
+        if cut > 0:
+            last_emitted = int(groups[cut - 1])
+            yield chunk.iloc[:cut]
+
+    if carry is not None and len(carry) > 0:
+        yield carry
+
+
+def _append_csv(df: pd.DataFrame, path: Path, first: bool) -> None:
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+
+def run_pipeline_streaming(
+    input_path: Path | str,
+    output_path: Path | str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dump: Iterable[str] = (),
+    dump_dir: Path = Path("."),
+    percentile: str = "exact",
+    sketch_k: int = DEFAULT_K,
+) -> int:
+    """
+    Ejecuta train.csv → train10.csv por bloques de grupos completos y devuelve el
+    número de filas escritas. Los intermedios pedidos en dump se escriben en CSV.
+    Con percentile="sketch" SpendingPercentil se estima con un KLLSketch de
+    parámetro sketch_k en vez de guardar todos los gastos.
+    """
+    if percentile not in PERCENTILE_MODES:
+        raise ValueError(f"Modo de percentil desconocido: {percentile} (válidos: {', '.join(PERCENTILE_MODES)})")
+    dump = normalize_dump_names(dump)
+    local_stages = STAGES[:-1]
+    final_stage, _ = STAGES[-1]
+    if final_stage != "create_spending_percentil":
+        raise RuntimeError(f"Etapa final inesperada para el modo streaming: {final_stage}")
+    if dump:
+        dump_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="spaceship_stream_") as tmp:
+        spool = Path(tmp)
+        n_chunks = 0
+        spend_parts = []
+        sketch = KLLSketch(k=sketch_k, random_state=0) if percentile == "sketch" else None
+
+        # Pasada 1: etapas locales por bloque + valores de gasto para el percentil
+        for i, chunk in enumerate(iter_group_chunks(input_path, chunksize=chunksize, dtype=RAW_DTYPES)):
+            df = compact_dtypes(chunk)
+            for stage, output_file in local_stages:
+                df = stage_transform(stage)(df)
+                if output_file in dump:
+                    _append_csv(df, dump_dir / output_file, first=i == 0)
+            spenders = df["HasExpenses"] == 1
+            spend = df.loc[spenders, "TotalExpenses"].to_numpy(dtype=float)
+            if sketch is not None:
+                sketch.update(spend)
+            else:
+                spend_parts.append(spend)
+            df.to_pickle(spool / f"{i:06d}.pkl")
+            n_chunks += 1
+
+        reference = np.sort(np.concatenate(spend_parts)) if spend_parts else np.array([], dtype=float)
+        del spend_parts
+
+        # Pasada 2: SpendingPercentil global y escritura de la salida
+        n_rows = 0
+        for i in range(n_chunks):
+            df = pd.read_pickle(spool / f"{i:06d}.pkl")
+            df["SpendingPercentil"] = 0.0
+            spenders = (df["HasExpenses"] == 1).to_numpy()
+            if spenders.any():
+                values = df.loc[spenders, "TotalExpenses"].to_numpy(dtype=float)
+                df.loc[spenders, "SpendingPercentil"] = (
+                    sketch.percentil(values) if sketch is not None else spending_percentil(values, reference)
+                )
+            _append_csv(df, Path(output_path), first=i == 0)
+            n_rows += len(df)
+
+    return n_rows
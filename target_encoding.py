@@ -0,0 +1,316 @@
+"""
+Target encoding out-of-fold de claves de alta cardinalidad - Spaceship Titanic
+
+group_transported_analysis.csv y family_nuclear_transported_analysis.csv muestran
+que compartir Group / Surname_Group / cabina predice Transported. Para usarlo
+como feature sin fuga, cada fila de entrenamiento recibe la media del objetivo
+de su clave calculada SOLO con las filas de los otros folds:
+
+    TE = (suma_oof + m · prior_oof) / (n_oof + m)
+
+(m = --smoothing; prior_oof = tasa global fuera del fold; clave nula o sin
+filas fuera del fold → prior_oof). Los pasajeros nuevos (test) reciben la
+codificación con todos los datos de entrenamiento (claves no vistas → prior).
+
+Todas las claves a la vez, sin bucle folds × claves:
+- cada clave (una columna o varias con '+', p.ej. Deck+Num+Side) se codifica a
+  enteros 0..g-1 y las claves se desplazan a bloques de un único índice
+  (offset + código·K + fold);
+- un np.bincount de conteos y otro ponderado por el objetivo dan la tabla
+  clave × fold de todas las claves; el total fuera del fold es total − fold.
+
+Folds: permutación con semilla (por fila, o por grupo con --fold-by Group para
+que un grupo completo caiga en el mismo fold). La asignación se guarda en
+.fold_cache/ (clave sha256 de n, K, semilla y la columna de --fold-by) y se
+reutiliza entre ejecuciones y claves.
+
+Entradas:
+- train9.csv / train10.csv (procesado, con Transported)
+- opcional --test: lote procesado igual (p.ej. salida de feature_pipeline.py transform)
+
+Salidas:
+- train9_target_encoded.csv (columnas TE_<clave> añadidas)
+- target_encoder.npz (vocabulario, conteos y sumas por clave; sin pickle)
+- con --test: test_target_encoded.csv
+
+Uso:
+    python target_encoding.py --input train9.csv --keys Group Surname Deck+Num+Side --folds 5
+    python target_encoding.py --input train10.csv --test test_features.csv --fold-by Group
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+from target_rates import target_codes
+
+
+DEFAULT_KEYS = ["Group", "Surname", "Deck+Num+Side"]
+DEFAULT_SMOOTHING = 10.0
+DEFAULT_FOLDS = 5
+DEFAULT_FOLD_CACHE = ".fold_cache"
+
+
+def _columns(key: str) -> List[str]:
+    return key.split("+")
+
+
+def feature_name(key: str) -> str:
+    """
+    "Deck+Num+Side" → "TE_Deck_Num_Side".
+    """
+    return "TE_" + "_".join(_columns(key))
+
+
+def _key_codes(df: pd.DataFrame, key: str) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Códigos 0..g-1 por fila (-1 = alguna parte nula) y vocabulario (strings
+    "v1/v2/..."), que es el que se guarda y con el que se codifica test.
+    """
+    codes: List[np.ndarray] = []
+    uniques: List[pd.Index] = []
+    for column in _columns(key):
+        c, u = pd.factorize(df[column], sort=True)
+        codes.append(c)
+        uniques.append(pd.Index(u).astype(str))
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    dims = tuple(max(len(u), 1) for u in uniques)
+    combined = np.ravel_multi_index([np.where(valid, c, 0) for c in codes], dims)
+    present, inverse = np.unique(combined[valid], return_inverse=True)
+    out = np.full(len(df), -1, dtype=np.int64)
+    out[valid] = inverse
+    parts = np.unravel_index(present, dims)
+    vocabulary = uniques[0].take(parts[0])
+    for u, p in zip(uniques[1:], parts[1:]):
+        vocabulary = vocabulary + "/" + u.take(p)
+    return out, pd.Index(vocabulary)
+
+
+def fold_assignment(
+    n: int, n_folds: int = DEFAULT_FOLDS, seed: int = 42, groups: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fold 0..K-1 de cada fila; con groups, todas las filas de un grupo comparten fold.
+    """
+    rng = np.random.default_rng(seed)
+    if groups is None:
+        return (rng.permutation(n) % n_folds).astype(np.int8)
+    codes, uniques = pd.factorize(groups)
+    group_fold = rng.permutation(len(uniques)) % n_folds
+    return np.where(codes >= 0, group_fold[codes], rng.integers(0, n_folds, n)).astype(np.int8)
+
+
+def cached_folds(
+    df: pd.DataFrame,
+    n_folds: int = DEFAULT_FOLDS,
+    seed: int = 42,
+    fold_by: Optional[str] = None,
+    cache_dir: Optional[Path | str] = DEFAULT_FOLD_CACHE,
+) -> Tuple[np.ndarray, bool]:
+    """
+    (folds, reutilizado). Sin cache_dir no se lee ni escribe nada.
+    """
+    groups = df[fold_by].to_numpy() if fold_by else None
+    if cache_dir is None:
+        return fold_assignment(len(df), n_folds, seed, groups), False
+
+    payload = {"n": len(df), "folds": n_folds, "seed": seed, "fold_by": fold_by}
+    if groups is not None:
+        payload["groups"] = hashlib.sha256(pd.factorize(groups)[0].astype(np.int64).tobytes()).hexdigest()
+    key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    path = Path(cache_dir) / f"{key}.npy"
+    if path.exists():
+        return np.load(path, allow_pickle=False), True
+
+    folds = fold_assignment(len(df), n_folds, seed, groups)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp, folds)
+    os.replace(tmp, path)
+    return folds, False
+
+
+class TargetEncoder:
+    """
+    Target encoding suavizado de varias claves: fit_transform da la codificación
+    out-of-fold de entrenamiento y guarda los totales para transform (test).
+    """
+
+    def __init__(self, keys: Sequence[str] = DEFAULT_KEYS, smoothing: float = DEFAULT_SMOOTHING) -> None:
+        self.keys = list(keys)
+        self.smoothing = float(smoothing)
+        self.prior_: Optional[float] = None
+        self.vocabulary_: Dict[str, pd.Index] = {}
+        self.count_: Dict[str, np.ndarray] = {}
+        self.sum_: Dict[str, np.ndarray] = {}
+
+    def fit_transform(self, df: pd.DataFrame, folds: np.ndarray, target: str = "Transported") -> pd.DataFrame:
+        """
+        Codificación out-of-fold (una columna TE_<clave> por clave) y ajuste de
+        los totales por clave para transform.
+        """
+        t = target_codes(df[target])
+        known = t <= 1
+        y = (t == 1).astype(float)
+        folds = np.asarray(folds, dtype=np.int64)
+        n_folds = int(folds.max()) + 1 if len(folds) else 1
+
+        # Un solo índice para todas las claves: offset + código·K + fold
+        codes: List[np.ndarray] = []
+        offsets: List[int] = []
+        offset = 0
+        for key in self.keys:
+            c, vocabulary = _key_codes(df, key)
+            codes.append(c)
+            offsets.append(offset)
+            self.vocabulary_[key] = vocabulary
+            offset += len(vocabulary) * n_folds
+        index = np.concatenate(
+            [np.where((c >= 0) & known, o + c * n_folds + folds, offset) for c, o in zip(codes, offsets)]
+        )
+        weights = np.tile(y, len(self.keys))
+        counts = np.bincount(index, minlength=offset + 1)[:offset]
+        sums = np.bincount(index, weights=weights, minlength=offset + 1)[:offset]
+
+        fold_n = np.bincount(folds[known], minlength=n_folds)
+        fold_y = np.bincount(folds[known], weights=y[known], minlength=n_folds)
+        self.prior_ = float(fold_y.sum() / max(fold_n.sum(), 1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            prior_oof = (fold_y.sum() - fold_y) / (fold_n.sum() - fold_n)
+        prior_oof = np.where(np.isfinite(prior_oof), prior_oof, self.prior_)[folds]
+
+        m = self.smoothing
+        out: Dict[str, np.ndarray] = {}
+        for key, c, o in zip(self.keys, codes, offsets):
+            g = len(self.vocabulary_[key])
+            key_counts = counts[o : o + g * n_folds].reshape(g, n_folds)
+            key_sums = sums[o : o + g * n_folds].reshape(g, n_folds)
+            self.count_[key] = key_counts.sum(axis=1)
+            self.sum_[key] = key_sums.sum(axis=1)
+
+            cc = np.where(c >= 0, c, 0)
+            n_oof = np.where(c >= 0, self.count_[key][cc] - key_counts[cc, folds], 0)
+            s_oof = np.where(c >= 0, self.sum_[key][cc] - key_sums[cc, folds], 0.0)
+            out[feature_name(key)] = (s_oof + m * prior_oof) / (n_oof + m)
+        return pd.DataFrame(out, index=df.index)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Codificación con todos los datos de entrenamiento (claves no vistas → prior).
+        """
+        if self.prior_ is None:
+            raise RuntimeError("TargetEncoder no está ajustado (llame a fit_transform o load).")
+        m = self.smoothing
+        out: Dict[str, np.ndarray] = {}
+        for key in self.keys:
+            c, vocabulary = _key_codes(df, key)
+            # Vocabulario del lote → posición en el de entrenamiento (-1 = no visto)
+            position = self.vocabulary_[key].get_indexer(vocabulary)
+            p = np.where(c >= 0, position[np.where(c >= 0, c, 0)], -1)
+            seen = p >= 0
+            pp = np.where(seen, p, 0)
+            n = np.where(seen, self.count_[key][pp], 0)
+            s = np.where(seen, self.sum_[key][pp], 0.0)
+            out[feature_name(key)] = (s + m * self.prior_) / (n + m)
+        return pd.DataFrame(out, index=df.index)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        state = {
+            "keys": np.array(self.keys),
+            "smoothing": np.array(self.smoothing),
+            "prior": np.array(self.prior_),
+        }
+        for i, key in enumerate(self.keys):
+            state[f"vocabulary__{i}"] = self.vocabulary_[key].to_numpy(dtype=str)
+            state[f"count__{i}"] = self.count_[key]
+            state[f"sum__{i}"] = self.sum_[key]
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "TargetEncoder":
+        encoder = cls(state["keys"].astype(str).tolist(), float(state["smoothing"]))
+        encoder.prior_ = float(state["prior"])
+        for i, key in enumerate(encoder.keys):
+            encoder.vocabulary_[key] = pd.Index(state[f"vocabulary__{i}"].astype(str))
+            encoder.count_[key] = state[f"count__{i}"]
+            encoder.sum_[key] = state[f"sum__{i}"]
+        return encoder
+
+    def save(self, path: Path | str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, **self.get_state())
+
+    @classmethod
+    def load(cls, path: Path | str) -> "TargetEncoder":
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_state({k: data[k] for k in data.files})
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Target encoding out-of-fold de claves (Group, Surname_Group, cabina...).")
+    p.add_argument("--input", default="train9.csv", help="Entrenamiento procesado (por defecto: train9.csv).")
+    p.add_argument("--output", default="train9_target_encoded.csv", help="CSV de entrenamiento con TE_<clave>.")
+    p.add_argument("--keys", nargs="+", default=DEFAULT_KEYS, help="Claves; varias columnas con '+'.")
+    p.add_argument("--folds", type=int, default=DEFAULT_FOLDS, help="Número de folds (K).")
+    p.add_argument("--smoothing", type=float, default=DEFAULT_SMOOTHING, help="Peso m del prior.")
+    p.add_argument("--seed", type=int, default=42, help="Semilla de la asignación de folds.")
+    p.add_argument("--fold-by", default=None, help="Columna cuyos valores comparten fold (p.ej. Group).")
+    p.add_argument("--fold-cache", default=DEFAULT_FOLD_CACHE, help="Directorio de la caché de folds.")
+    p.add_argument("--no-fold-cache", action="store_true", help="No leer ni guardar la asignación de folds.")
+    p.add_argument("--encoder", default="target_encoder.npz", help="Estado del encoder (.npz).")
+    p.add_argument("--test", default=None, help="Opcional: lote procesado a codificar con todo el entrenamiento.")
+    p.add_argument("--test-output", default="test_target_encoded.csv", help="CSV de salida para --test.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+    if args.folds < 2:
+        raise ValueError("--folds debe ser >= 2.")
+
+    df = read_dataset(input_path)
+    needed = {c for k in args.keys for c in _columns(k)} | {"Transported"} | ({args.fold_by} if args.fold_by else set())
+    missing = sorted(needed - set(df.columns))
+    if missing:
+        raise ValueError(f"Columnas inexistentes en el dataset: {', '.join(missing)}")
+
+    folds, reused = cached_folds(
+        df, args.folds, args.seed, args.fold_by, None if args.no_fold_cache else args.fold_cache
+    )
+    encoder = TargetEncoder(args.keys, args.smoothing)
+    encoded = encoder.fit_transform(df, folds)
+    pd.concat([df, encoded], axis=1).to_csv(args.output, index=False)
+    encoder.save(args.encoder)
+
+    print("✓ Target encoding out-of-fold")
+    print(f"  - input:   {input_path} ({len(df)} filas, {args.folds} folds{', por ' + args.fold_by if args.fold_by else ''})")
+    print(f"  - folds:   {'reutilizados de ' + args.fold_cache if reused else 'nuevos'}")
+    print(f"  - prior:   {encoder.prior_:.4f} (m = {encoder.smoothing:g})")
+    for key in args.keys:
+        print(f"  - {feature_name(key)}: {len(encoder.vocabulary_[key])} valores")
+    print(f"  - output:  {args.output}")
+    print(f"  - encoder: {args.encoder}")
+
+    if args.test:
+        test_path = Path(args.test)
+        if not test_path.exists():
+            raise FileNotFoundError(f"No existe el archivo de test: {test_path}")
+        test = read_dataset(test_path)
+        pd.concat([test, encoder.transform(test)], axis=1).to_csv(args.test_output, index=False)
+        print(f"  - test:    {args.test_output} ({len(test)} filas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Tasas de Transported por valor de cada feature en una sola pasada - Spaceship Titanic
+
+Generaliza age_transported_rate_by_value.py (groupby con tres lambdas en .agg) a
+todas las features categóricas y discretizadas:
+- Transported se codifica una vez: 0 = False, 1 = True, 2 = nulo, 3 = otro valor.
+- Cada feature se factoriza (categóricas: sus códigos; numéricas enteras: valor
+  exacto; con bins: intervalos de pd.cut).
+- Todas las features se desplazan a un bloque propio de un único índice
+  (offset + código·4 + objetivo) y un solo np.bincount da los conteos de todas.
+
+Tabla larga (una fila por feature y valor, sin valores nulos de la feature):
+    Feature, Value, Total, TransportedTrue, TransportedFalse, MissingTransported, TransportedRate
+con TransportedRate = TransportedTrue / Total (como age_transported_rate_by_age.csv).
+
+Consumidores:
+- age_transported_rate_by_value.py (--rates usa la fila Age de esta tabla)
+- cluster_age_groups.py (tasa por AgeCluster)
+- eda_analysis.py (Transported por HomePlanet, CryoSleep y grupo de edad)
+
+Uso:
+    python target_rates.py --input train9.csv --output target_rates.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+
+
+DEFAULT_FEATURES = [
+    "HomePlanet",
+    "CryoSleep",
+    "Destination",
+    "VIP",
+    "Deck",
+    "Side",
+    "GroupSize",
+    "Age",
+    "AgeCluster",
+]
+_TARGET_WIDTH = 4  # False, True, nulo, otro
+
+
+def target_codes(s: pd.Series) -> np.ndarray:
+    """
+    Transported → 0 (False), 1 (True), 2 (nulo), 3 (otro valor). Acepta bool,
+    boolean nullable, 0/1 numérico o strings "True"/"False".
+    """
+    if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+        values = s.map({"True": 1, "False": 0, True: 1, False: 0})
+    else:
+        values = pd.to_numeric(s, errors="coerce")
+    v = values.to_numpy(dtype=float, na_value=np.nan)
+    codes = np.full(len(s), 3, dtype=np.int64)
+    codes[v == 0] = 0
+    codes[v == 1] = 1
+    codes[s.isna().to_numpy()] = 2
+    return codes
+
+
+def _feature_codes(s: pd.Series, bins: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Códigos 0..m-1 por fila (-1 = nulo) y los m valores, en orden.
+    """
+    if bins is not None:
+        s = pd.cut(s.astype(float), bins=bins)
+        return s.cat.codes.to_numpy(dtype=np.int64), s.cat.categories.astype(str)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(dtype=np.int64), s.cat.categories
+    codes, uniques = pd.factorize(s, sort=True)
+    if pd.api.types.is_float_dtype(uniques.dtype) and np.all(np.mod(uniques, 1) == 0):
+        uniques = uniques.astype(np.int64)  # edades etc. leídas como float con .0
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def target_rate_table(
+    df: pd.DataFrame,
+    features: Optional[Sequence[str]] = None,
+    target: str = "Transported",
+    bins: Optional[Dict[str, Sequence[float]]] = None,
+) -> pd.DataFrame:
+    """
+    Conteos y tasa del objetivo por valor de cada feature, con un solo bincount.
+    Las features que no están en df se omiten.
+    """
+    if target not in df.columns:
+        raise ValueError(f"No existe la columna '{target}' en el dataset (necesaria para el cálculo).")
+    features = [f for f in (features or DEFAULT_FEATURES) if f in df.columns]
+    bins = bins or {}
+    t = target_codes(df[target])
+
+    n = len(df)
+    index = np.empty((len(features), n), dtype=np.int64)
+    values: List[pd.Index] = []
+    offset = 0
+    for i, feature in enumerate(features):
+        codes, uniques = _feature_codes(df[feature], bins.get(feature))
+        # Filas con la feature nula van a un bloque de descarte al final
+        index[i] = np.where(codes >= 0, offset + codes * _TARGET_WIDTH + t, -1)
+        values.append(uniques)
+        offset += len(uniques) * _TARGET_WIDTH
+    index[index < 0] = offset
+    counts = np.bincount(index.ravel(), minlength=offset + 1)[:offset].reshape(-1, _TARGET_WIDTH)
+
+    sizes = [len(v) for v in values]
+    table = pd.DataFrame(
+        {
+            "Feature": np.repeat(features, sizes),
+            "Value": [value for v in values for value in v.tolist()],
+            "Total": counts.sum(axis=1),
+            "TransportedTrue": counts[:, 1],
+            "TransportedFalse": counts[:, 0],
+            "MissingTransported": counts[:, 2],
+        }
+    )
+    # Categorías sin filas (p.ej. clústeres vacíos) no aparecen, como en groupby(observed=True)
+    table = table.loc[table["Total"] > 0].reset_index(drop=True)
+    table["TransportedRate"] = table["TransportedTrue"] / table["Total"]
+    return table
+
+
+def feature_rates(table: pd.DataFrame, feature: str) -> pd.DataFrame:
+    """
+    Filas de una feature con Value renombrada al nombre de la feature
+    (p.ej. Age, Total, TransportedTrue, ... como age_transported_rate_by_age.csv).
+    """
+    rates = table.loc[table["Feature"] == feature].drop(columns="Feature").rename(columns={"Value": feature})
+    if rates.empty:
+        raise ValueError(f"La tabla de tasas no tiene la feature '{feature}'.")
+    # Leída de CSV los valores son strings: recuperar números y booleanos
+    numeric = pd.to_numeric(rates[feature], errors="coerce")
+    if numeric.notna().all():
+        rates[feature] = numeric
+    elif rates[feature].isin(["True", "False"]).all():
+        rates[feature] = rates[feature].eq("True")
+    # La tasa se recalcula desde los conteos (read_csv no conserva el último dígito)
+    rates["TransportedRate"] = rates["TransportedTrue"] / rates["Total"]
+    return rates.reset_index(drop=True)
+
+
+def transported_crosstab(table: pd.DataFrame, feature: str) -> pd.DataFrame:
+    """
+    % de Transported False/True por valor entre las filas con objetivo conocido
+    (como pd.crosstab(feature, Transported, normalize="index") * 100).
+    """
+    rates = feature_rates(table, feature).set_index(feature)
+    known = rates["TransportedFalse"] + rates["TransportedTrue"]
+    pct = pd.DataFrame(
+        {False: rates["TransportedFalse"] / known * 100, True: rates["TransportedTrue"] / known * 100}
+    )
+    pct.columns.name = "Transported"
+    return pct
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Tasa de Transported por valor de cada feature (una pasada).")
+    p.add_argument("--input", default="train9.csv", help="CSV/Parquet de entrada (por defecto: train9.csv).")
+    p.add_argument("--output", default="target_rates.csv", help="Tabla larga de salida (CSV).")
+    p.add_argument("--features", nargs="+", default=DEFAULT_FEATURES, help="Features a tabular.")
+    p.add_argument(
+        "--age-model",
+        default=None,
+        help="Modelo de cluster_age_groups.py (.npz) para AgeCluster; si se omite se ajusta sobre el input (dp).",
+    )
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    input_path = Path(args.input)
+    if not input_path.exists():
+        raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+
+    df = read_dataset(input_path)
+    if "AgeCluster" in args.features and "AgeCluster" not in df.columns and "Age" in df.columns:
+        from age_clustering import AgeClusterModel
+
+        if args.age_model:
+            model = AgeClusterModel.load(args.age_model)
+        else:
+            from cluster_age_groups import _prepare_age, fit_age_model
+
+            model = fit_age_model(*_prepare_age(df))[0]
+        df["AgeCluster"] = model.predict(df["Age"].to_numpy(dtype=float, na_value=np.nan))
+
+    table = target_rate_table(df, args.features)
+    table.to_csv(args.output, index=False)
+
+    print("✓ Tasas de Transported calculadas")
+    print(f"  - input:  {input_path} ({len(df)} filas)")
+    print(f"  - output: {args.output} ({len(table)} filas)")
+    for feature, rows in table.groupby("Feature", sort=False).size().items():
+        print(f"  - {feature}: {rows} valores")
+
+
+if __name__ == "__main__":
+    main()
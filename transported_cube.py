@@ -0,0 +1,279 @@
+"""
+Cubo denso de conteos de Transported para consultas EDA - Spaceship Titanic
+
+Preguntas como "tasa de Transported para Europa, CryoSleep, deck B, edad 13-18"
+no necesitan otro groupby sobre las filas: el cubo guarda el número de pasajeros
+de cada combinación de
+
+    HomePlanet × CryoSleep × Destination × VIP × Deck × Side × AgeGroup × Transported
+
+(cada dimensión con un nivel extra "<NA>" para los nulos, así los totales cuadran).
+Se construye una vez con aritmética de índices (ravel_multi_index + bincount) y
+una consulta es un slice por dimensión filtrada y una suma (microsegundos).
+
+AgeGroup usa los tramos de plot_age_vs_expenses.py: 0-12, 13-18, 19-30, 31-45,
+46-60, 61+ (la edad 0 cuenta en 0-12).
+
+Persistencia: .npz (conteos + niveles de cada dimensión, sin pickle).
+
+Uso:
+    python transported_cube.py build --input train9.csv --cube transported_cube.npz
+    python transported_cube.py query HomePlanet=Europa CryoSleep=True Deck=B AgeGroup=13-18
+    python transported_cube.py query CryoSleep=True --by HomePlanet Deck
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import read_dataset
+from target_rates import target_codes
+
+
+DIMENSIONS = ["HomePlanet", "CryoSleep", "Destination", "VIP", "Deck", "Side", "AgeGroup"]
+TARGET = "Transported"
+MISSING = "<NA>"
+AGE_BINS = [0, 12, 18, 30, 45, 60, np.inf]
+AGE_LABELS = ["0-12", "13-18", "19-30", "31-45", "46-60", "61+"]
+DEFAULT_CUBE = "transported_cube.npz"
+
+
+@dataclass(frozen=True)
+class CellCounts:
+    total: int
+    transported_true: int
+    transported_false: int
+    missing_transported: int
+
+    @property
+    def rate(self) -> float:
+        """
+        TransportedTrue / Total (como target_rates.py); NaN si no hay pasajeros.
+        """
+        return self.transported_true / self.total if self.total else float("nan")
+
+
+def _dimension_codes(s: pd.Series) -> tuple[np.ndarray, List[str]]:
+    """
+    Códigos 0..m-1 y niveles (str) de una dimensión; los nulos van al nivel MISSING (m).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = s.cat.codes.to_numpy(dtype=np.int64), list(s.cat.categories)
+    else:
+        codes, uniques = pd.factorize(s, sort=True)
+        codes, uniques = codes.astype(np.int64), uniques.tolist()
+    codes[codes < 0] = len(uniques)
+    return codes, [str(u) for u in uniques] + [MISSING]
+
+
+def age_groups(age: pd.Series) -> pd.Series:
+    return pd.cut(pd.to_numeric(age, errors="coerce"), bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True)
+
+
+class TransportedCube:
+    """
+    Conteos densos por combinación de dimensiones. El primer eje es Transported
+    (False, True, <NA>): así cada roll-up suma bloques contiguos por fila en vez
+    de reducir un eje de tamaño 3 intercalado (~25x más rápido).
+    """
+
+    def __init__(self, counts: np.ndarray, dims: Sequence[str], levels: Sequence[Sequence[str]]) -> None:
+        self.counts = counts
+        self.dims = list(dims)
+        self.levels = [list(lv) for lv in levels]
+        self._axis = {d: i for i, d in enumerate(self.dims)}
+        self._level_index = [{lv: j for j, lv in enumerate(levels_)} for levels_ in self.levels]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dims: Sequence[str] = DIMENSIONS) -> "TransportedCube":
+        """
+        Construye el cubo desde el dataset procesado (train9/train10). AgeGroup se
+        deriva de Age si no existe; sin Transported todo cae en <NA>.
+        """
+        codes: List[np.ndarray] = []
+        levels: List[List[str]] = []
+        for dim in dims:
+            if dim == "AgeGroup" and dim not in df.columns:
+                s = age_groups(df["Age"])
+            elif dim in df.columns:
+                s = df[dim]
+            else:
+                raise ValueError(f"No existe la columna '{dim}' en el dataset.")
+            c, lv = _dimension_codes(s)
+            codes.append(c)
+            levels.append(lv)
+
+        target = (
+            np.minimum(target_codes(df[TARGET]), 2) if TARGET in df.columns else np.full(len(df), 2, dtype=np.int64)
+        )
+        codes.insert(0, target)
+        levels.insert(0, ["False", "True", MISSING])
+
+        shape = tuple(len(lv) for lv in levels)
+        flat = np.ravel_multi_index(codes, shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        return cls(counts, [TARGET, *dims], levels)
+
+    def _select(self, filters: Dict[str, object]) -> np.ndarray:
+        """
+        Sub-cubo con los ejes filtrados reducidos a los niveles pedidos (uno o varios).
+        Un solo nivel es un slice (vista, sin copia); varios niveles, un take.
+        """
+        index: List[object] = [slice(None)] * self.counts.ndim
+        multi: Dict[int, List[int]] = {}
+        for dim, wanted in filters.items():
+            if dim not in self._axis or dim == TARGET:
+                raise KeyError(f"Dimensión desconocida: {dim} (disponibles: {', '.join(self.dims[1:])})")
+            axis = self._axis[dim]
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            try:
+                idx = [self._level_index[axis][str(v)] for v in values]
+            except KeyError as exc:
+                raise KeyError(f"Nivel desconocido para {dim}: {exc.args[0]} (niveles: {self.levels[axis]})") from None
+            if len(idx) == 1:
+                index[axis] = slice(idx[0], idx[0] + 1)
+            else:
+                multi[axis] = idx
+        sub = self.counts[tuple(index)]
+        for axis, idx in multi.items():
+            sub = sub.take(idx, axis=axis)
+        return sub
+
+    def query(self, **filters: object) -> CellCounts:
+        """
+        Conteos de la porción filtrada, sumando las dimensiones no filtradas (roll-up).
+        """
+        by_target = self._select(filters).reshape(3, -1).sum(axis=1)
+        return CellCounts(
+            total=int(by_target.sum()),
+            transported_true=int(by_target[1]),
+            transported_false=int(by_target[0]),
+            missing_transported=int(by_target[2]),
+        )
+
+    def rollup(self, by: Sequence[str], observed: bool = True, **filters: object) -> pd.DataFrame:
+        """
+        Tabla por combinación de las dimensiones de by (tras filtrar), con las
+        columnas de target_rates.py. observed=True omite combinaciones vacías.
+        """
+        by = list(by)
+        unknown = [d for d in by if d not in self._axis or d == TARGET]
+        if unknown:
+            raise KeyError(f"Dimensiones desconocidas: {', '.join(unknown)}")
+        sub = self._select(filters)
+        keep = [self._axis[d] for d in by]
+        summed = sub.sum(axis=tuple(a for a in range(1, sub.ndim) if a not in keep))
+        # summed: Transported + ejes de by en el orden del cubo; se pasan al orden de by
+        order = sorted(keep)
+        summed = np.moveaxis(summed, [1 + order.index(a) for a in keep], list(range(1, len(keep) + 1)))
+
+        def _levels(dim: str) -> List[str]:
+            axis = self._axis[dim]
+            if dim not in filters:
+                return self.levels[axis]
+            values = filters[dim] if isinstance(filters[dim], (list, tuple, set)) else [filters[dim]]
+            return [str(v) for v in values]
+
+        index = pd.MultiIndex.from_product([_levels(d) for d in by], names=by)
+        flat = summed.reshape(3, -1)
+        table = pd.DataFrame(
+            {
+                "Total": flat.sum(axis=0),
+                "TransportedTrue": flat[1],
+                "TransportedFalse": flat[0],
+                "MissingTransported": flat[2],
+            },
+            index=index,
+        )
+        if observed:
+            table = table.loc[table["Total"] > 0]
+        table["TransportedRate"] = table["TransportedTrue"] / table["Total"]
+        return table.reset_index()
+
+    def save(self, path: Path | str) -> None:
+        arrays = {"counts": self.counts, "dims": np.array(self.dims)}
+        for dim, lv in zip(self.dims, self.levels):
+            arrays[f"levels__{dim}"] = np.array(lv)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "TransportedCube":
+        with np.load(path, allow_pickle=False) as data:
+            dims = data["dims"].astype(str).tolist()
+            levels = [data[f"levels__{d}"].astype(str).tolist() for d in dims]
+            return cls(data["counts"], dims, levels)
+
+
+def _parse_filters(items: Sequence[str]) -> Dict[str, object]:
+    filters: Dict[str, object] = {}
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"Filtro inválido '{item}' (formato Dimensión=valor o Dimensión=v1,v2)")
+        dim, value = item.split("=", 1)
+        values = value.split(",")
+        filters[dim] = values if len(values) > 1 else values[0]
+    return filters
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Cubo de conteos de Transported (construcción y consultas).")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Construye el cubo desde el dataset procesado y lo guarda.")
+    build.add_argument("--input", default="train9.csv", help="CSV/Parquet procesado (por defecto: train9.csv).")
+
+    query = sub.add_parser("query", help="Consulta el cubo guardado (filtros Dimensión=valor).")
+    query.add_argument("filters", nargs="*", help="Filtros, p.ej. HomePlanet=Europa CryoSleep=True AgeGroup=13-18.")
+    query.add_argument("--by", nargs="+", default=None, help="Opcional: dimensiones para desglosar (roll-up).")
+
+    for sp in (build, query):
+        sp.add_argument("--cube", default=DEFAULT_CUBE, help="Ruta del cubo (.npz).")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    if args.command == "build":
+        input_path = Path(args.input)
+        if not input_path.exists():
+            raise FileNotFoundError(f"No existe el archivo de entrada: {input_path}")
+        df = read_dataset(input_path)
+        t0 = time.perf_counter()
+        cube = TransportedCube.from_frame(df)
+        t_build = time.perf_counter() - t0
+        cube.save(args.cube)
+        print("✓ Cubo de Transported construido")
+        print(f"  - input: {input_path} ({len(df)} filas, {t_build * 1e3:.1f} ms)")
+        print(f"  - cubo:  {args.cube} ({' × '.join(str(len(lv)) for lv in cube.levels)} = {cube.counts.size:,} celdas)")
+        return
+
+    cube = TransportedCube.load(args.cube)
+    filters = _parse_filters(args.filters)
+    t0 = time.perf_counter()
+    if args.by:
+        table = cube.rollup(args.by, **filters)
+    else:
+        counts = cube.query(**filters)
+    elapsed = time.perf_counter() - t0
+
+    desc = ", ".join(f"{k}={v}" for k, v in filters.items()) or "todos"
+    print(f"Filtro: {desc} ({elapsed * 1e6:.0f} µs)")
+    if args.by:
+        print(table.to_string(index=False))
+    else:
+        print(f"  Total: {counts.total}")
+        print(f"  Transported: {counts.transported_true} | No: {counts.transported_false} | Nulo: {counts.missing_transported}")
+        print(f"  Tasa: {counts.rate:.2%}" if counts.total else "  Tasa: sin pasajeros")
+
+
+if __name__ == "__main__":
+    main()